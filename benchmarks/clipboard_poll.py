@@ -0,0 +1,49 @@
+import argparse
+import statistics
+import time
+
+from services.clipboard_backend import MemoryClipboardBackend, PyperclipBackend, TkClipboardBackend
+
+
+def measure_polls(backend, polls):
+    latencies = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        backend.paste()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def create_backends():
+    backends = [MemoryClipboardBackend("サンプル" * 1000), PyperclipBackend()]
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        backends.append(TkClipboardBackend(root))
+    except Exception as e:
+        print(f"tk: 利用できません ({e})")
+    return backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description="クリップボード取得1回あたりの所要時間を計測")
+    parser.add_argument("--polls", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'mean(ms)':>10} {'p50(ms)':>10} {'p95(ms)':>10}")
+    for backend in create_backends():
+        try:
+            backend.paste()
+            latencies = sorted(measure_polls(backend, args.polls))
+        except Exception as e:
+            print(f"{backend.name:<10} 計測できません ({e})")
+            continue
+
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{backend.name:<10} {statistics.mean(latencies):>10.3f} "
+              f"{statistics.median(latencies):>10.3f} {p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
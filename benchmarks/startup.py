@@ -0,0 +1,59 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 対象: (読み込むモジュール, 読み込み時間の上限ミリ秒)
+TARGETS = {
+    "cli": ("cli", 60),
+    "gui": ("main", 150),
+}
+
+
+def parse_importtime(stderr, module):
+    # -X importtime の出力から対象モジュールの累積読み込み時間（マイクロ秒）を取り出す
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1].strip())
+    raise ValueError(f"{module} の読み込み時間が見つかりません")
+
+
+def measure_import(module):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    process_ms = (time.perf_counter() - start) * 1000
+    return parse_importtime(result.stderr, module) / 1000, process_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="起動時のモジュール読み込み時間を計測し、上限と比較")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-cli", type=float, default=TARGETS["cli"][1])
+    parser.add_argument("--budget-gui", type=float, default=TARGETS["gui"][1])
+    args = parser.parse_args()
+
+    budgets = {"cli": args.budget_cli, "gui": args.budget_gui}
+    over_budget = False
+
+    print(f"{'target':<6} {'import(ms)':>11} {'process(ms)':>12} {'budget(ms)':>11}  result")
+    for name, (module, _) in TARGETS.items():
+        samples = [measure_import(module) for _ in range(args.runs)]
+        import_ms = statistics.median(sample[0] for sample in samples)
+        process_ms = statistics.median(sample[1] for sample in samples)
+        ok = import_ms <= budgets[name]
+        over_budget = over_budget or not ok
+        print(f"{name:<6} {import_ms:>11.1f} {process_ms:>12.1f} {budgets[name]:>11.1f}  {'OK' if ok else 'NG'}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
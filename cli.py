@@ -0,0 +1,314 @@
+import argparse
+import io
+import json
+import os
+import sys
+from contextlib import nullcontext
+
+from services.jsonl_store import JsonlStoreError
+from services.memory_tracker import MemoryBudgetExceeded, MemoryTracker
+from services.text_decoding import iter_decoded_lines
+from services.txt_parse import iter_medical_records, merge_records, parse_medical_lines
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="txt2json", description="カルテ記載テキストをJSON形式に変換",
+                                     epilog="常駐モード: txt2json serve --help / フォルダ監視: txt2json watch --help")
+    parser.add_argument("input", nargs="?", default="-", help="入力テキストファイル（省略時または-で標準入力）")
+    parser.add_argument("-o", "--output", help="出力先JSONファイル（省略時は標準出力）")
+    parser.add_argument("--encoding", help="入力の文字コード（省略時は先頭部分から自動判定）")
+    parser.add_argument("--format", choices=("json", "jsonl"),
+                        help="出力形式（既定: 標準入力ならjsonl、ファイルならjson）")
+    parser.add_argument("--max-seen", type=int, default=10000,
+                        help="jsonl出力で重複判定に使う直近の記録数")
+    parser.add_argument("--shard-by", metavar="FIELDS",
+                        help="month・departmentで分割して-oのフォルダに出力（例: month,department）")
+    parser.add_argument("--writers", type=int, default=4, help="分割出力の書き込みスレッド数")
+    parser.add_argument("--merge", metavar="JSON",
+                        help="変換結果を既存のJSON（以前の変換結果）に統合して出力（期間の重なる再書き出し用）")
+    parser.add_argument("--update", action="store_true",
+                        help="-oのJSONLファイルに新しい・変更された記録だけを反映（索引ファイル.idxを併用）")
+    parser.add_argument("--memory", action="store_true", help="段階ごとのメモリ使用量を標準エラー出力に表示")
+    parser.add_argument("--memory-budget-mb", type=float,
+                        help="メモリ使用量の上限（MB）。超えた時点で変換を中止する")
+    return parser
+
+
+def build_serve_parser():
+    from utils.config_manager import load_config
+
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="txt2json serve", description="変換処理を常駐させ、ソケット経由で受け付ける")
+    parser.add_argument("--host", default=config.get('Server', 'host', fallback='127.0.0.1'))
+    parser.add_argument("--port", type=int, default=config.getint('Server', 'port', fallback=8765))
+    parser.add_argument("--unix", metavar="PATH", help="TCPの代わりにUnixソケットで待ち受ける")
+    parser.add_argument("--workers", type=int, default=config.getint('Server', 'workers', fallback=4))
+    parser.add_argument("--max-body-kb", type=int, default=config.getint('Server', 'max_body_kb', fallback=10240))
+    parser.add_argument("--max-pending", type=int, default=config.getint('Server', 'max_pending', fallback=16),
+                        help="処理待ちにできる接続数（超えた接続には503を返す）")
+    return parser
+
+
+def serve(argv):
+    from services.parse_server import create_server
+
+    args = build_serve_parser().parse_args(argv)
+    try:
+        server = create_server(args.host, args.port, args.unix, max(1, args.workers), args.max_body_kb * 1024,
+                               args.max_pending)
+    except OSError as e:
+        print(f"エラー: 待ち受けを開始できません: {e}", file=sys.stderr)
+        return 1
+
+    address = args.unix or f"http://{args.host}:{server.server_address[1]}"
+    print(f"変換サーバーを開始しました: {address}（POST /parse, GET /health, GET /metrics）", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def build_watch_parser():
+    from utils.config_manager import load_config
+
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="txt2json watch", description="フォルダを監視し、追加・更新されたテキストを変換する")
+    parser.add_argument("folder", help="監視するフォルダ")
+    parser.add_argument("-o", "--output-dir", help="JSONの出力先フォルダ（省略時は監視フォルダ）")
+    parser.add_argument("--workers", type=int, default=config.getint('Watch', 'workers', fallback=2))
+    parser.add_argument("--max-pending", type=int, default=config.getint('Watch', 'max_pending', fallback=8),
+                        help="変換待ちにできるファイル数の上限")
+    parser.add_argument("--interval", type=float,
+                        default=config.getfloat('Watch', 'poll_interval_sec', fallback=2.0),
+                        help="定期確認で監視する場合の間隔（秒）")
+    parser.add_argument("--polling", action="store_true", help="inotifyを使わず定期確認で監視する")
+    parser.add_argument("--encoding", help="入力ファイルの文字コード（省略時は自動判定）")
+    return parser
+
+
+def watch(argv):
+    from services.folder_watcher import FolderIngestor, create_watch_source
+
+    args = build_watch_parser().parse_args(argv)
+    if not os.path.isdir(args.folder):
+        print(f"エラー: フォルダが見つかりません: {args.folder}", file=sys.stderr)
+        return 1
+
+    ingestor = FolderIngestor(args.folder, args.output_dir, max(1, args.workers), args.max_pending, args.encoding)
+    source = create_watch_source(args.folder, args.interval, args.polling)
+    print(f"フォルダの監視を開始しました: {args.folder}（{type(source).__name__}）", file=sys.stderr)
+    try:
+        ingestor.run(source)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.close()
+        ingestor.shutdown()
+    print(f"変換 {ingestor.converted_count}件 / スキップ {ingestor.skipped_count}件 / "
+          f"エラー {ingestor.error_count}件", file=sys.stderr)
+    return 0
+
+
+def open_output(path):
+    import tempfile
+
+    # 途中で中止した場合に空や書きかけの出力を残さないよう、一時ファイルに書いてから置き換える
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-", suffix=".tmp")
+    return os.fdopen(fd, "w", encoding="utf-8"), temp_path
+
+
+def finish_output(output_file, temp_path, path, completed):
+    from utils.file_utils import get_file_mode
+
+    output_file.close()
+    if completed:
+        os.chmod(temp_path, get_file_mode(path))
+        os.replace(temp_path, path)
+    else:
+        os.unlink(temp_path)
+
+
+def open_input(path):
+    if path == "-":
+        # 文字コードを判定するためバイト列で読む（テキストに差し替えられた標準入力はそのまま使う）
+        return getattr(sys.stdin, "buffer", sys.stdin)
+    return open(path, "rb")
+
+
+def read_lines(input_file, encoding):
+    if isinstance(input_file, io.TextIOBase):
+        return input_file
+    return iter_decoded_lines(input_file, encoding)
+
+
+def load_existing(path):
+    with open(path, encoding="utf-8") as file:
+        records = json.load(file)
+    if not isinstance(records, list):
+        raise ValueError("変換結果の一覧（JSON配列）ではありません")
+    return records
+
+
+def parse_records(lines, existing=None):
+    records = parse_medical_lines(lines)
+    if existing is None:
+        return records
+
+    added, updated = merge_records(existing, records)
+    print(f"既存のJSONに統合しました: 追加 {added}件 / 更新 {updated}件（合計 {len(existing)}件）", file=sys.stderr)
+    return existing
+
+
+def write_json(lines, output_file, tracker=None, existing=None):
+    if tracker is None:
+        json_data = json.dumps(parse_records(lines, existing), indent=2, ensure_ascii=False)
+    else:
+        with tracker.phase("変換"):
+            records = parse_records(tracker.guard(lines), existing)
+        with tracker.phase("JSON化"):
+            json_data = json.dumps(records, indent=2, ensure_ascii=False)
+        tracker.capture_top_sites()
+    output_file.write(json_data + "\n")
+
+
+def write_jsonl(lines, output_file, max_seen):
+    # 日付ごとに確定した記録から順に1行ずつ書き出し、入力全体を溜め込まない
+    for record in iter_medical_records(lines, max_seen):
+        output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # 後続のコマンドがすぐに受け取れるよう1件ごとに書き出す
+        output_file.flush()
+
+
+def write_shards(lines, output_dir, shard_by, writers):
+    from services.sharded_writer import ShardedWriter
+
+    # 同じ日時・診療科の記録が1行にまとまるよう全体をまとめてから、分割先ごとに別スレッドで書き込む
+    records = parse_medical_lines(lines)
+    with ShardedWriter(output_dir, shard_by, writers) as writer:
+        for record in records:
+            writer.write(record)
+    print(f"{sum(writer.counts.values())}件を{len(writer.counts)}ファイルに分割して出力しました: {output_dir}",
+          file=sys.stderr)
+
+
+def update_output(lines, output_path):
+    from services.jsonl_store import JsonlStore
+
+    store = JsonlStore(output_path)
+    added, updated = store.update(parse_medical_lines(lines))
+    print(f"{output_path} を更新しました: 追加 {added}件 / 更新 {updated}件", file=sys.stderr)
+
+
+def convert(lines, args, output_format, output_file, shard_by, tracker=None, existing=None):
+    if output_format == "json" and not shard_by:
+        write_json(lines, output_file, tracker, existing)
+        return
+
+    # 逐次出力では変換と書き出しが交互に進むため、まとめて1つの段階として計測する
+    if tracker is not None:
+        lines = tracker.guard(lines)
+    with tracker.phase("変換・出力") if tracker is not None else nullcontext():
+        if args.update:
+            update_output(lines, args.output)
+        elif shard_by:
+            write_shards(lines, args.output, shard_by, max(1, args.writers))
+        else:
+            write_jsonl(lines, output_file, args.max_seen)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        return serve(argv[1:])
+    if argv[:1] == ["watch"]:
+        return watch(argv[1:])
+
+    args = build_parser().parse_args(argv)
+    output_format = args.format or ("jsonl" if args.input == "-" else "json")
+
+    shard_by = None
+    if args.shard_by:
+        from services.sharded_writer import parse_shard_by
+
+        try:
+            shard_by = parse_shard_by(args.shard_by)
+        except ValueError as e:
+            print(f"エラー: {e}", file=sys.stderr)
+            return 1
+        if not args.output:
+            print("エラー: 分割出力には出力先フォルダ（-o）を指定してください", file=sys.stderr)
+            return 1
+
+    if args.update and (not args.output or shard_by or args.merge or args.format == "json"):
+        print("エラー: --updateには出力先のJSONLファイル（-o）を指定してください"
+              "（--shard-by・--merge・--format jsonとは併用できません）", file=sys.stderr)
+        return 1
+
+    existing = None
+    if args.merge:
+        if shard_by or args.format == "jsonl":
+            print("エラー: 既存のJSONへの統合はjson形式の出力でのみ指定できます", file=sys.stderr)
+            return 1
+        # 出力先と同じファイルを指定できるよう、出力を開く前に読み込む
+        try:
+            existing = load_existing(args.merge)
+        except (OSError, ValueError) as e:
+            print(f"エラー: 統合先のJSONを読み込めません: {e}", file=sys.stderr)
+            return 1
+        output_format = "json"
+
+    try:
+        input_file = open_input(args.input)
+    except FileNotFoundError:
+        print(f"エラー: ファイルが見つかりません: {args.input}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"エラー: ファイルを読み込めません: {e}", file=sys.stderr)
+        return 1
+
+    lines = read_lines(input_file, args.encoding)
+    if args.update:
+        output_format = "jsonl"
+    temp_path = None
+    if shard_by or args.update:
+        output_file = None
+    elif args.output:
+        output_file, temp_path = open_output(args.output)
+    else:
+        output_file = sys.stdout
+    tracker = None
+    if args.memory or args.memory_budget_mb:
+        budget = int(args.memory_budget_mb * 1024 * 1024) if args.memory_budget_mb else None
+        tracker = MemoryTracker(budget)
+    completed = False
+    try:
+        with tracker or nullcontext():
+            convert(lines, args, output_format, output_file, shard_by, tracker, existing)
+        completed = True
+    except UnicodeDecodeError as e:
+        print(f"エラー: ファイルを読み込めません: {e}", file=sys.stderr)
+        return 1
+    except (MemoryBudgetExceeded, JsonlStoreError) as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # head などの後続コマンドが先に終了した場合は、終了時の書き出しエラーも抑止する
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        if tracker is not None:
+            print(tracker.report(), file=sys.stderr)
+        if args.input != "-":
+            input_file.close()
+        if temp_path is not None:
+            finish_output(output_file, temp_path, args.output, completed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,48 @@
 import json
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 from tkinter import messagebox, scrolledtext
 
-import pyperclip
-
-from services import mouse_automation
-from services.txt_editor import TextEditor
-from services.txt_parse import parse_medical_text
-from utils.config_manager import load_config
+from services.automation_runner import AutomationRunner
+from services.capture_pipeline import CapturePipeline
+from services.clip_history import ClipHistory
+from services.clipboard_backend import create_clipboard_backend
+from services.clipboard_watcher import ClipboardWatcher, get_clipboard_sequence_source
+from services.json_viewer import PagedJsonViewer
+from services.memory_tracker import MemoryTracker
+from services.metrics import CONVERSION_BUCKETS, MetricsRegistry, count_lines
+from services.result_handoff import describe_handoff, exceeds_encoded_size, write_result_file
+from services.text_document import TextDocument
+from services.text_stats import TextStats, count_widget_text
+from services.tk_dispatch import TkDispatcher
+from services.toast import Toast
+from services.txt_parse import parse_medical_lines, parse_medical_text
+from services.virtual_text_view import VirtualTextView
+from utils.config_manager import add_config_listener, check_config_updates, load_config
 from version import VERSION
 
+CONFIG_CHECK_INTERVAL = 2000
+
+
+def get_helper_command(operation_type=None):
+    # 補助プログラム関連は初回利用時に読み込み、起動を軽くする
+    from services import mouse_automation
+    return mouse_automation.get_helper_command(operation_type)
+
+
+def parse_to_json(text):
+    parsed_data = parse_medical_text(text)
+    return parsed_data, json.dumps(parsed_data, indent=2, ensure_ascii=False)
+
 
 class MedicalTextConverter:
     def __init__(self, root):
         self.root = root
         self.config = load_config()
 
-        self.window_width = self.config.getint('Appearance', 'window_width', fallback=1100)
-        self.window_height = self.config.getint('Appearance', 'window_height', fallback=800)
-        self.main_window_position = self.config.get('Appearance', 'main_window_position', fallback='+10+10')
-        self.text_area_font_size = self.config.getint('Appearance', 'text_area_font_size', fallback=11)
-        self.text_area_font_name = self.config.get('Appearance', 'text_area_font_name', fallback='Yu Gothic UI')
-        self.button_width = self.config.getint('Appearance', 'button_width', fallback=15)
-        self.button_height = self.config.getint('Appearance', 'button_height', fallback=2)
+        self.load_settings()
 
         self.root.title(f"JSON形式変換 v{VERSION}")
         self.root.geometry(f"{self.window_width}x{self.window_height}{self.main_window_position}")
@@ -39,6 +59,11 @@ class MedicalTextConverter:
                                                     font=(self.text_area_font_name, self.text_area_font_size))
         self.text_input.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
+        # クリップボードから追記した内容は文書モデルにも保持し、入力欄を読み直さずに済ませる
+        self.input_document = TextDocument()
+        self.input_document_dirty = False
+        self.input_view = VirtualTextView(self.text_input, self.input_document, self.large_input_window_lines)
+
         self.frame_json = tk.LabelFrame(self.frame_top, text="JSON形式")
         self.frame_json.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
@@ -46,15 +71,56 @@ class MedicalTextConverter:
                                                      font=(self.text_area_font_name, self.text_area_font_size))
         self.text_output.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
+        self.json_viewer = PagedJsonViewer(self.text_output, self.json_page_size)
+
+        self.frame_json_nav = tk.Frame(self.frame_json)
+        self.frame_json_nav.pack(fill=tk.X, padx=5, pady=(0, 5))
+
+        self.prev_page_button = tk.Button(self.frame_json_nav, text="前へ", command=self.show_prev_page)
+        self.prev_page_button.pack(side=tk.LEFT)
+
+        self.next_page_button = tk.Button(self.frame_json_nav, text="次へ", command=self.show_next_page)
+        self.next_page_button.pack(side=tk.LEFT, padx=5)
+
+        self.page_label = tk.Label(self.frame_json_nav, text=self.json_viewer.status_text())
+        self.page_label.pack(side=tk.LEFT, padx=5)
+
+        self.live_preview_button = tk.Button(self.frame_json_nav, text="ライブ変換: OFF",
+                                             command=self.toggle_live_preview)
+        self.live_preview_button.pack(side=tk.LEFT, padx=5)
+
+        self.copy_all_button = tk.Button(self.frame_json_nav, text="全体コピー", command=self.copy_full_json)
+        self.copy_all_button.pack(side=tk.RIGHT)
+
+        self.jump_button = tk.Button(self.frame_json_nav, text="日付へ移動", command=self.jump_to_date)
+        self.jump_button.pack(side=tk.RIGHT, padx=5)
+
+        self.date_entry = tk.Entry(self.frame_json_nav, width=12)
+        self.date_entry.pack(side=tk.RIGHT)
+        self.date_entry.bind("<Return>", lambda event: self.jump_to_date())
+
         self.frame_stats = tk.Frame(root)
         self.frame_stats.pack(fill=tk.X)
 
         self.stats_label = tk.Label(self.frame_stats, text="カルテ記載行数: 0  文字数: 0")
         self.stats_label.pack(side=tk.LEFT, padx=5, pady=5)
+        self.text_stats = TextStats(self.text_input, self.stats_label)
+        # 連続したコピーでも通知ウィンドウは1つだけにし、同じ通知は回数をまとめて表示する
+        self.toast = Toast(self.root)
 
         self.monitor_status_label = tk.Label(self.frame_stats, text="クリップボード監視: OFF", fg="red")
         self.monitor_status_label.pack(side=tk.RIGHT, padx=5, pady=5)
 
+        self.dedup_label = tk.Label(self.frame_stats, text="重複除外: 0")
+        self.dedup_label.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        self.large_input_button = tk.Button(self.frame_stats, text="大量入力モード: OFF",
+                                            command=self.toggle_large_input_mode)
+        self.large_input_button.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        self.memory_label = tk.Label(self.frame_stats, text="")
+        self.memory_label.pack(side=tk.LEFT, padx=5, pady=5)
+
         self.frame_buttons = tk.Frame(root)
         self.frame_buttons.pack(fill=tk.X, pady=10)
 
@@ -73,6 +139,11 @@ class MedicalTextConverter:
                                           width=self.button_width, height=self.button_height)
         self.soap_copy_button.pack(side=tk.LEFT, padx=10)
 
+        self.pipeline_button = tk.Button(self.frame_buttons, text="一括変換",
+                                         command=self.run_capture_pipeline,
+                                         width=self.button_width, height=self.button_height)
+        self.pipeline_button.pack(side=tk.LEFT, padx=10)
+
         self.convert_button = tk.Button(self.frame_buttons, text="JSON形式変換",
                                         command=self.convert_to_json,
                                         width=self.button_width, height=self.button_height)
@@ -89,129 +160,555 @@ class MedicalTextConverter:
         self.editor_button.pack(side=tk.LEFT, padx=10)
 
         self.close_button = tk.Button(self.frame_buttons, text="閉じる",
-                                      command=self.root.destroy,
+                                      command=self.close_window,
                                       width=self.button_width, height=self.button_height)
         self.close_button.pack(side=tk.LEFT, padx=10)
 
+        self.main_buttons = [self.new_button, self.soap_button, self.soap_copy_button, self.pipeline_button,
+                             self.convert_button, self.clear_button, self.editor_button, self.close_button]
+
+        self.clipboard = create_clipboard_backend(self.clipboard_backend_name, self.root)
+        self.clip_history = ClipHistory(self.clip_history_size)
         self.clipboard_content = ''
         self.is_first_check = True
-        self.check_clipboard()
-
-        self.text_input.bind("<KeyRelease>", self.update_stats)
+        self.clipboard_watcher = ClipboardWatcher(get_clipboard_sequence_source(),
+                                                  self.poll_min_interval, self.poll_max_interval)
+        self.clipboard_after_id = None
+
+        # ライブ変換：入力の変更ごとに世代を進め、最新世代の変換結果だけを採用する
+        self.dispatcher = TkDispatcher(self.root)
+        self.parse_executor = ThreadPoolExecutor(max_workers=1)
+        self.input_generation = 0
+        self.is_live_preview = False
+        self.live_after_id = None
+        self.live_parse_running = False
+        self.live_parse_pending = False
+        self.live_result = None
+
+        self.automation_runner = AutomationRunner(self.dispatcher, self.helper_timeout)
+
+        # 一括変換：詳細検索設定→カルテコピー→取り込み→変換→コピーを1回の操作で行う
+        self.capture_pipeline = CapturePipeline(self.automation_runner, self.dispatcher, self.parse_executor,
+                                                self.clipboard, get_helper_command,
+                                                parse_to_json,
+                                                on_captured=self.on_pipeline_captured,
+                                                on_finished=self.on_pipeline_finished,
+                                                on_error=self.on_pipeline_failed,
+                                                sequence_source=get_clipboard_sequence_source())
+        self.pipeline_display_id = None
+
+        # 運用状況の把握用。設定したファイルへPrometheusのテキスト形式で定期的に書き出す
+        self.metrics = MetricsRegistry()
+        self.clipboard_polls = self.metrics.counter("txt2json_clipboard_polls_total", "クリップボードの確認回数")
+        self.clips_appended = self.metrics.counter("txt2json_clips_appended_total", "入力欄に追記したクリップ数")
+        self.clips_dropped = self.metrics.counter("txt2json_clips_dropped_total", "重複のため除外したクリップ数")
+        self.conversions = self.metrics.counter("txt2json_conversions_total", "JSON変換の回数")
+        self.conversion_errors = self.metrics.counter("txt2json_conversion_errors_total", "JSON変換のエラー回数")
+        self.converted_lines = self.metrics.counter("txt2json_converted_lines_total", "JSON変換した入力の行数")
+        self.conversion_seconds = self.metrics.histogram("txt2json_conversion_seconds", "JSON変換の所要時間（秒）",
+                                                         CONVERSION_BUCKETS)
+        self.metrics.histogram_family("txt2json_helper_seconds", "補助プログラムの所要時間（秒）", "helper",
+                                      self.automation_runner.histograms)
+        self.metrics.histogram_family("txt2json_pipeline_seconds", "一括変換の工程ごとの所要時間（秒）", "stage",
+                                      self.capture_pipeline.histograms)
+        self.metrics_after_id = None
+        self.schedule_metrics_write()
+
+        self.text_input.bind("<<Modified>>", self.on_input_edited)
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
+
+        add_config_listener(self.apply_config)
+        self.root.after(CONFIG_CHECK_INTERVAL, self.check_config)
+
+    def load_settings(self):
+        self.window_width = self.config.getint('Appearance', 'window_width', fallback=1100)
+        self.window_height = self.config.getint('Appearance', 'window_height', fallback=800)
+        self.main_window_position = self.config.get('Appearance', 'main_window_position', fallback='+10+10')
+        self.text_area_font_size = self.config.getint('Appearance', 'text_area_font_size', fallback=11)
+        self.text_area_font_name = self.config.get('Appearance', 'text_area_font_name', fallback='Yu Gothic UI')
+        self.button_width = self.config.getint('Appearance', 'button_width', fallback=15)
+        self.button_height = self.config.getint('Appearance', 'button_height', fallback=2)
+        self.json_page_size = self.config.getint('Appearance', 'json_page_size', fallback=50)
+        self.large_input_window_lines = self.config.getint('Appearance', 'large_input_window_lines', fallback=200)
+        self.poll_min_interval = self.config.getint('Clipboard', 'poll_min_interval_ms', fallback=100)
+        self.poll_max_interval = self.config.getint('Clipboard', 'poll_max_interval_ms', fallback=1000)
+        self.clipboard_backend_name = self.config.get('Clipboard', 'backend', fallback='tk')
+        self.clip_history_size = self.config.getint('Clipboard', 'history_size', fallback=32)
+        self.live_preview_delay = self.config.getint('Conversion', 'live_preview_delay_ms', fallback=500)
+        self.memory_tracking = self.config.getint('Conversion', 'memory_tracking', fallback=0)
+        self.memory_budget_mb = self.config.getint('Conversion', 'memory_budget_mb', fallback=0)
+        self.handoff_threshold_kb = self.config.getint('Conversion', 'handoff_threshold_kb', fallback=1024)
+        self.handoff_dir = self.config.get('Conversion', 'handoff_dir', fallback='')
+        self.handoff_copy = self.config.get('Conversion', 'handoff_copy', fallback='path')
+        self.handoff_keep = self.config.getint('Conversion', 'handoff_keep', fallback=20)
+        self.helper_timeout = self.config.getint('Automation', 'helper_timeout_sec', fallback=60)
+        self.metrics_textfile_path = self.config.get('Metrics', 'textfile_path', fallback='')
+        self.metrics_write_interval = self.config.getint('Metrics', 'write_interval_sec', fallback=15)
+
+    def check_config(self):
+        check_config_updates()
+        self.root.after(CONFIG_CHECK_INTERVAL, self.check_config)
+
+    def apply_config(self, config):
+        # 設定ファイルの変更を再起動せずに反映する
+        old_geometry = (self.window_width, self.window_height, self.main_window_position)
+        old_backend_name = self.clipboard_backend_name
+        old_metrics_settings = (self.metrics_textfile_path, self.metrics_write_interval)
+        self.config = config
+        self.load_settings()
+
+        if (self.window_width, self.window_height, self.main_window_position) != old_geometry:
+            self.root.geometry(f"{self.window_width}x{self.window_height}{self.main_window_position}")
+
+        font = (self.text_area_font_name, self.text_area_font_size)
+        self.text_input.config(font=font)
+        self.text_output.config(font=font)
+        for button in self.main_buttons:
+            button.config(width=self.button_width, height=self.button_height)
+
+        self.json_viewer.page_size = max(1, self.json_page_size)
+        if self.json_viewer.records:
+            self.json_viewer.show_page(self.json_viewer.page)
+        self.update_page_label()
+
+        self.input_view.window_lines = max(1, self.large_input_window_lines)
+        if self.input_view.active:
+            self.input_view.refresh()
+
+        self.clipboard_watcher.min_interval = self.poll_min_interval
+        self.clipboard_watcher.max_interval = max(self.poll_min_interval, self.poll_max_interval)
+        self.clip_history.max_clips = self.clip_history_size
+        self.automation_runner.timeout = self.helper_timeout
+        if self.clipboard_backend_name != old_backend_name:
+            self.clipboard = create_clipboard_backend(self.clipboard_backend_name, self.root)
+            self.capture_pipeline.clipboard = self.clipboard
+        if (self.metrics_textfile_path, self.metrics_write_interval) != old_metrics_settings:
+            self.schedule_metrics_write()
+
+    def schedule_metrics_write(self):
+        if self.metrics_after_id is not None:
+            self.root.after_cancel(self.metrics_after_id)
+            self.metrics_after_id = None
+        if self.metrics_textfile_path:
+            self.metrics_after_id = self.root.after(max(1, self.metrics_write_interval) * 1000, self.write_metrics)
+
+    def write_metrics(self):
+        self.metrics_after_id = None
+        try:
+            self.metrics.write_textfile(self.metrics_textfile_path)
+        except OSError as e:
+            print(f"メトリクス書き出しエラー: {e}")
+        self.schedule_metrics_write()
+
+    def record_conversion(self, elapsed, line_count):
+        self.conversions.inc()
+        self.converted_lines.inc(line_count)
+        if elapsed is not None:
+            self.conversion_seconds.observe(elapsed)
+
+    def get_input_line_count(self):
+        if self.input_view.active:
+            return self.input_document.line_count
+        return count_widget_text(self.text_input)[0]
 
     def show_notification(self, message, timeout=2000, position=None):
         if position is None:
             position = self.main_window_position
-
-        popup = tk.Toplevel(self.root)
-        popup.title("通知")
-        popup.geometry("200x100")
-        popup.geometry(position)
-
-        popup.configure(bg="#f0f0f0")
-        popup.attributes("-topmost", True)
-
-        label = tk.Label(popup, text=message, font=("MS Gothic", 12), bg="#f0f0f0", pady=20)
-        label.pack(expand=True, fill=tk.BOTH)
-
-        popup.after(timeout, popup.destroy)
+        self.toast.show(message, timeout, position)
 
     def check_clipboard(self):
-        if self.is_monitoring_clipboard:
-            try:
-                clipboard_text = pyperclip.paste()
+        self.clipboard_after_id = None
+        if not self.is_monitoring_clipboard:
+            return
+        self.clipboard_polls.inc()
+
+        changed = False
+        try:
+            if self.clipboard_watcher.has_changed():
+                clipboard_text = self.clipboard.paste()
                 if clipboard_text != self.clipboard_content:
+                    changed = True
                     self.clipboard_content = clipboard_text
                     if not self.is_first_check and clipboard_text:
-                        current_text = self.text_input.get("1.0", tk.END).strip()
-                        if current_text:
-                            self.text_input.insert(tk.END, "\n" + clipboard_text)
+                        # 最近取り込んだ内容と重複する部分は入力欄に入れる前に除外する
+                        new_text = self.clip_history.filter(clipboard_text)
+                        if new_text is None:
+                            self.clips_dropped.inc()
+                            self.update_dedup_label()
+                            self.show_notification("重複のため除外しました")
                         else:
-                            self.text_input.insert(tk.END, clipboard_text)
-                        self.update_stats(None)
+                            self.clips_appended.inc()
+                            self.append_clipboard_text(new_text)
+                            self.refresh_document_stats()
+                            self.update_dedup_label()
 
-                        self.show_notification("コピーしました")
+                            self.show_notification("コピーしました")
 
                     self.is_first_check = False
-            except Exception as e:
-                print(f"クリップボード監視エラー: {e}")
+        except Exception as e:
+            print(f"クリップボード監視エラー: {e}")
 
-        self.root.after(500, self.check_clipboard)
+        self.clipboard_after_id = self.root.after(self.clipboard_watcher.next_interval(changed),
+                                                  self.check_clipboard)
 
-    def update_stats(self, event):
-        text = self.text_input.get("1.0", tk.END)
-        lines = text.count('\n')
-        chars = len(text) - lines  # 改行文字を除く
+    def append_clipboard_text(self, clipboard_text):
+        if self.input_document_dirty:
+            self.sync_input_document()
 
-        if text.strip() == "":
-            lines = 0
-            chars = 0
+        separator = "\n" if self.input_document.has_content else ""
+        self.input_document.append(clipboard_text)
 
-        self.stats_label.config(text=f"行数: {lines}  文字数: {chars}")
+        if self.input_view.active:
+            self.input_view.refresh()
+        else:
+            self.text_input.insert(tk.END, separator + clipboard_text)
+        self.mark_input_changed()
+
+    def update_dedup_label(self):
+        self.dedup_label.config(text=f"重複除外: {self.clip_history.dropped_count}"
+                                     f"（一部除外: {self.clip_history.trimmed_count}）")
+
+    def sync_input_document(self):
+        self.input_document.clear()
+        self.input_document.append(self.text_input.get("1.0", "end-1c"))
+        self.input_document_dirty = False
+
+    def on_input_edited(self, event):
+        # 変更フラグで内容が実際に変わった場合だけを扱う（カーソル移動などでは変換結果を捨てない）
+        if not self.text_input.edit_modified():
+            return
+        if self.input_view.active:
+            # 大量入力モードの表示範囲の描き直しは入力の変更ではない
+            self.text_input.edit_modified(False)
+            return
+        # 手入力で変更された場合は次回の追記時に文書モデルを入力欄から作り直す
+        self.input_document_dirty = True
+        # 手入力後は履歴と入力欄の内容が一致する保証がない
+        self.clip_history.clear()
+        self.text_stats.schedule()
+        self.mark_input_changed()
+
+    def mark_input_changed(self):
+        # 次の変更で再び<<Modified>>が通知されるよう、変更フラグを戻しておく
+        self.text_input.edit_modified(False)
+        self.input_generation += 1
+        if not self.is_live_preview:
+            return
+        # 連続した変更は最後の変更から一定時間後の1回の変換にまとめる
+        if self.live_after_id is not None:
+            self.root.after_cancel(self.live_after_id)
+        self.live_after_id = self.root.after(self.live_preview_delay, self.start_live_parse)
+
+    def toggle_live_preview(self):
+        self.is_live_preview = not self.is_live_preview
+        if self.is_live_preview:
+            self.live_preview_button.config(text="ライブ変換: ON")
+            self.start_live_parse()
+        else:
+            self.live_preview_button.config(text="ライブ変換: OFF")
+            if self.live_after_id is not None:
+                self.root.after_cancel(self.live_after_id)
+                self.live_after_id = None
+            self.live_result = None
+
+    def start_live_parse(self):
+        self.live_after_id = None
+        if not self.is_live_preview:
+            return
+        if self.live_parse_running:
+            # 実行中の変換が終わってから最新の内容で変換し直す
+            self.live_parse_pending = True
+            return
+
+        text = self.get_input_text()
+        if not text.strip():
+            self.live_result = None
+            return
+
+        generation = self.input_generation
+        self.live_parse_running = True
+        self.live_parse_pending = False
+        self.dispatcher.submit(self.parse_executor, parse_to_json, text,
+                               on_done=lambda result: self.on_live_parsed(generation, result),
+                               on_error=self.on_live_parse_failed)
+
+    def on_live_parsed(self, generation, result):
+        self.live_parse_running = False
+        if self.is_live_preview and generation == self.input_generation:
+            self.live_result = (generation, *result)
+            self.json_viewer.set_records(*result)
+            self.update_page_label()
+        if self.live_parse_pending:
+            self.start_live_parse()
+
+    def on_live_parse_failed(self, error):
+        self.live_parse_running = False
+        print(f"ライブ変換エラー: {error}")
+        if self.live_parse_pending:
+            self.start_live_parse()
+
+    def get_live_result(self):
+        if self.live_result is not None and self.live_result[0] == self.input_generation:
+            return self.live_result[1:]
+        return None
+
+    def get_input_text(self):
+        if self.input_view.active:
+            return self.input_document.text()
+        return self.text_input.get("1.0", tk.END)
+
+    def toggle_large_input_mode(self):
+        if self.input_view.active:
+            text = self.input_document.text()
+            self.input_view.deactivate()
+            self.text_input.delete("1.0", tk.END)
+            self.text_input.insert(tk.END, text)
+            # 同じ内容を戻しただけのため、手入力による変更として扱わない
+            self.text_input.edit_modified(False)
+            self.large_input_button.config(text="大量入力モード: OFF")
+        else:
+            # 入力欄の内容を文書モデルへ移し、以降は表示範囲だけを描画する
+            self.sync_input_document()
+            self.input_view.activate()
+            self.large_input_button.config(text="大量入力モード: ON")
+        self.refresh_document_stats()
+
+    def refresh_document_stats(self):
+        self.text_stats.cancel()
+        self.text_stats.show(*self.input_document.stats())
+
+    def update_stats(self, event):
+        if self.input_view.active:
+            self.refresh_document_stats()
+            return
+        self.text_stats.refresh()
 
     def soap_copy(self):
         try:
+            command = get_helper_command("soap_copy")
+            if command is None:
+                messagebox.showerror("エラー", "SOAPコピーの実行ファイルが見つかりません")
+                return
+
             self.root.iconify()
-            mouse_automation.main("soap_copy")
-            self.root.deiconify()
+            # 補助プログラムの実行中もUIを止めない
+            self.automation_runner.submit("soap_copy", command,
+                                          on_done=self.on_soap_copy_done, on_error=self.on_soap_copy_failed)
         except Exception as e:
+            self.root.deiconify()
             messagebox.showerror("エラー", f"SOAPコピー中にエラーが発生しました: {e}")
 
+    def on_soap_copy_done(self, result):
+        self.root.deiconify()
+        if not result.ok:
+            messagebox.showerror("エラー", f"SOAPコピー中にエラーが発生しました: {result.describe()}")
+
+    def on_soap_copy_failed(self, error):
+        self.root.deiconify()
+        messagebox.showerror("エラー", f"SOAPコピー中にエラーが発生しました: {error}")
+
     def convert_to_json(self):
         try:
-            text = self.text_input.get("1.0", tk.END)
-            if not text.strip():
-                messagebox.showwarning("警告", "変換するテキストがありません。")
-                return
+            # ライブ変換で最新の入力が変換済みであれば、その結果をそのままコピーする
+            live_result = self.get_live_result()
+            if live_result is None:
+                text = self.get_input_text()
+                if not text.strip():
+                    messagebox.showwarning("警告", "変換するテキストがありません。")
+                    return
 
             self.set_monitoring_state(False)
 
-            parsed_data = parse_medical_text(text)
-            json_data = json.dumps(parsed_data, indent=2, ensure_ascii=False)
-
-            self.text_output.delete("1.0", tk.END)
-            self.text_output.insert(tk.END, json_data)
-
-            pyperclip.copy(json_data)
+            if live_result is None:
+                start = time.perf_counter()
+                parsed_data, json_data = self.parse_for_conversion(text)
+                elapsed = time.perf_counter() - start
+                line_count = count_lines(text)
+            else:
+                # ライブ変換の結果を使い回した場合は変換していないため、所要時間には含めない
+                parsed_data, json_data = live_result
+                elapsed = None
+                line_count = self.get_input_line_count()
+
+            # 出力欄には表示中のページだけを描画する
+            self.json_viewer.set_records(parsed_data, json_data)
+            self.update_page_label()
+
+            self.record_conversion(elapsed, line_count)
+
+            if self.should_hand_off(json_data):
+                # 大きな結果はクリップボードに載せず、別スレッドでファイルに書き出してその場所をコピーする
+                self.hand_off_result(parsed_data, json_data)
+                return
+            self.clipboard.copy(json_data)
 
             messagebox.showinfo("完了", "JSON形式に変換しコピーしました")
 
         except Exception as e:
+            self.conversion_errors.inc()
             messagebox.showerror("エラー", f"変換中にエラーが発生しました: {e}")
 
+    def should_hand_off(self, json_data):
+        return self.handoff_threshold_kb > 0 and exceeds_encoded_size(json_data, self.handoff_threshold_kb * 1024)
+
+    def hand_off_result(self, parsed_data, json_data):
+        record_count = len(parsed_data)
+        self.dispatcher.submit(self.parse_executor, write_result_file, self.handoff_dir, json_data,
+                               self.handoff_keep,
+                               on_done=lambda result: self.on_result_written(record_count, *result),
+                               on_error=self.on_result_write_failed)
+        self.show_notification("ファイルに書き出しています")
+
+    def on_result_written(self, record_count, path, size):
+        self.clipboard.copy(describe_handoff(path, record_count, size, self.handoff_copy))
+        messagebox.showinfo("完了", f"変換結果が大きいためファイルに書き出し、その場所をコピーしました\n{path}")
+
+    def on_result_write_failed(self, error):
+        messagebox.showerror("エラー", f"変換結果の書き出し中にエラーが発生しました: {error}")
+
+    def parse_for_conversion(self, text):
+        if not self.memory_tracking and not self.memory_budget_mb:
+            return parse_to_json(text)
+
+        # 設定で有効にした場合のみ、段階ごとのメモリ使用量を計測する
+        tracker = MemoryTracker(self.memory_budget_mb * 1024 * 1024 or None)
+        try:
+            with tracker:
+                with tracker.phase("変換"):
+                    # 行を読み進める途中でも上限を確認し、超えた時点で中止する
+                    parsed_data = parse_medical_lines(tracker.guard(StringIO(text)))
+                with tracker.phase("JSON化"):
+                    json_data = json.dumps(parsed_data, indent=2, ensure_ascii=False)
+                tracker.capture_top_sites()
+        finally:
+            self.memory_label.config(text=tracker.summary())
+            print(tracker.report())
+        return parsed_data, json_data
+
     def clear_text(self):
-        self.text_input.delete("1.0", tk.END)
-        self.text_output.delete("1.0", tk.END)
-        self.update_stats(None)
+        self.clip_history.clear()
+        self.input_document.clear()
+        self.input_document_dirty = False
+        if self.input_view.active:
+            self.input_view.refresh()
+        else:
+            self.text_input.delete("1.0", tk.END)
+        self.mark_input_changed()
+        self.json_viewer.clear()
+        self.update_page_label()
+        self.refresh_document_stats()
+
+    def update_page_label(self):
+        self.page_label.config(text=self.json_viewer.status_text())
+
+    def show_prev_page(self):
+        self.json_viewer.prev_page()
+        self.update_page_label()
+
+    def show_next_page(self):
+        self.json_viewer.next_page()
+        self.update_page_label()
+
+    def jump_to_date(self):
+        if not self.json_viewer.jump_to_date(self.date_entry.get()):
+            messagebox.showwarning("警告", "日付はYYYY/MM/DD形式で入力してください。")
+            return
+        self.update_page_label()
+
+    def copy_full_json(self):
+        if not self.json_viewer.records:
+            messagebox.showwarning("警告", "コピーするJSONがありません。")
+            return
+        self.clipboard.copy(self.json_viewer.full_json())
+        self.show_notification("コピーしました")
 
     def set_monitoring_state(self, enabled):
         self.is_monitoring_clipboard = enabled
         if enabled:
             self.monitor_status_label.config(text="クリップボード監視: ON", fg="green")
+            if self.clipboard_after_id is None:
+                self.clipboard_watcher.reset()
+                self.clipboard_after_id = self.root.after(self.clipboard_watcher.min_interval,
+                                                          self.check_clipboard)
         else:
             self.monitor_status_label.config(text="クリップボード監視: OFF", fg="red")
+            # 監視OFFの間はタイマー自体を止める
+            if self.clipboard_after_id is not None:
+                self.root.after_cancel(self.clipboard_after_id)
+                self.clipboard_after_id = None
 
     def start_monitoring(self):
         self.set_monitoring_state(True)
         self.clear_text()
-        pyperclip.copy("")
+        self.clipboard.copy("")
         self.clipboard_content = ""
         self.is_first_check = False
 
     def run_mouse_automation(self):
         try:
+            command = get_helper_command()
+            if command is None:
+                messagebox.showerror("エラー", "マウス操作の実行ファイルが見つかりません")
+                return
+
             self.root.iconify()
-            mouse_automation.main()
-            self.show_notification("設定完了", timeout=2000)
+            self.automation_runner.submit("mouse_operation", command,
+                                          on_done=self.on_mouse_automation_done,
+                                          on_error=self.on_mouse_automation_failed)
         except Exception as e:
             messagebox.showerror("エラー", f"マウス操作中にエラーが発生しました: {e}")
 
+    def on_mouse_automation_done(self, result):
+        if result.ok:
+            self.show_notification("設定完了", timeout=2000)
+        else:
+            messagebox.showerror("エラー", f"マウス操作中にエラーが発生しました: {result.describe()}")
+
+    def on_mouse_automation_failed(self, error):
+        messagebox.showerror("エラー", f"マウス操作中にエラーが発生しました: {error}")
+
+    def run_capture_pipeline(self):
+        # 取り込みは一括変換側で行うため、監視による二重取り込みを防ぐ
+        self.set_monitoring_state(False)
+        self.root.iconify()
+        self.capture_pipeline.start()
+
+    def on_pipeline_captured(self, job):
+        if self.capture_pipeline.helper_job is None:
+            self.root.deiconify()
+        self.pipeline_display_id = job.job_id
+        self.clear_text()
+        self.append_clipboard_text(job.text)
+        self.refresh_document_stats()
+
+    def on_pipeline_finished(self, job):
+        print(f"一括変換 #{job.job_id + 1}: {job.describe()}")
+        self.record_conversion(job.timings["parse"], count_lines(job.text))
+        # 次の患者を取り込み済みの場合は、表示を古い結果で上書きしない
+        if job.job_id == self.pipeline_display_id:
+            self.json_viewer.set_records(job.parsed_data, job.json_data)
+            self.update_page_label()
+        self.show_notification("コピーしました")
+
+    def on_pipeline_failed(self, job, stage, error):
+        self.conversion_errors.inc()
+        if self.capture_pipeline.helper_job is None:
+            self.root.deiconify()
+        messagebox.showerror("エラー", f"一括変換中にエラーが発生しました（{stage}）: {error}")
+
     def open_text_editor(self):
         self.set_monitoring_state(False)
         self.root.withdraw()
+        from services.txt_editor import TextEditor
         editor = TextEditor(self.root, "")
         editor.on_close = self._restore_clipboard_monitoring
 
+    def close_window(self):
+        # 待機中の変換は破棄し、変換用のスレッドを残さずに終了する
+        self.parse_executor.shutdown(wait=False, cancel_futures=True)
+        self.automation_runner.shutdown()
+        self.root.destroy()
+
     def _restore_clipboard_monitoring(self):
         self.is_monitoring_clipboard = False
 
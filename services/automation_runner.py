@@ -0,0 +1,73 @@
+import subprocess
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HelperResult:
+    def __init__(self, name, returncode, elapsed, timed_out=False, timeout=None):
+        self.name = name
+        self.returncode = returncode
+        self.elapsed = elapsed
+        self.timed_out = timed_out
+        self.timeout = timeout
+
+    @property
+    def ok(self):
+        return not self.timed_out and self.returncode == 0
+
+    def describe(self):
+        if self.timed_out:
+            return f"{self.timeout}秒以内に終了しなかったため強制終了しました"
+        return f"終了コード {self.returncode}"
+
+
+class LatencyHistogram:
+    BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, float('inf'))
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or self.BUCKETS
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+
+def run_helper(name, command, timeout):
+    start = time.perf_counter()
+    process = subprocess.Popen(command)
+    try:
+        # 0以下を指定した場合は終了まで待つ
+        returncode = process.wait(timeout=timeout if timeout and timeout > 0 else None)
+    except subprocess.TimeoutExpired:
+        # 応答しない補助プログラムがアプリを巻き込まないよう強制終了する
+        process.kill()
+        process.wait()
+        return HelperResult(name, None, time.perf_counter() - start, timed_out=True, timeout=timeout)
+    return HelperResult(name, returncode, time.perf_counter() - start)
+
+
+class AutomationRunner:
+    def __init__(self, dispatcher, timeout=60):
+        self.dispatcher = dispatcher
+        self.timeout = timeout
+        # 重なった要求はワーカー1つのキューで順番に実行する
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.histograms = {}
+
+    def submit(self, name, command, on_done=None, on_error=None, timeout=None):
+        def done(result):
+            self.histograms.setdefault(name, LatencyHistogram()).observe(result.elapsed)
+            if on_done:
+                on_done(result)
+
+        return self.dispatcher.submit(self.executor, run_helper, name, command,
+                                      self.timeout if timeout is None else timeout,
+                                      on_done=done, on_error=on_error)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,175 @@
+import time
+from collections import deque
+
+from services.automation_runner import LatencyHistogram
+
+HELPER_STAGES = (("mouse_operation", None), ("soap_copy", "soap_copy"))
+STAGE_LABELS = {
+    "mouse_operation": "詳細検索設定",
+    "soap_copy": "カルテコピー",
+    "capture": "取り込み",
+    "parse": "変換",
+    "copy": "コピー",
+}
+
+
+def timed_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+class PipelineJob:
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.timings = {}
+        self.text = None
+        self.parsed_data = None
+        self.json_data = None
+
+    def total(self):
+        return sum(self.timings.values())
+
+    def describe(self):
+        stages = [f"{STAGE_LABELS[stage]} {self.timings[stage]:.2f}秒"
+                  for stage in STAGE_LABELS if stage in self.timings]
+        return " / ".join(stages) + f"（合計 {self.total():.2f}秒）"
+
+
+class CapturePipeline:
+    def __init__(self, runner, dispatcher, parse_executor, clipboard, get_command, parse,
+                 on_captured=None, on_finished=None, on_error=None, sequence_source=None):
+        self.runner = runner
+        self.dispatcher = dispatcher
+        self.parse_executor = parse_executor
+        self.clipboard = clipboard
+        self.get_command = get_command
+        self.parse = parse
+        self.on_captured = on_captured
+        self.on_finished = on_finished
+        self.on_error = on_error
+        self.sequence_source = sequence_source
+
+        self.next_id = 0
+        self.waiting = deque()
+        self.helper_job = None
+        self.clipboard_sequence = None
+        self.parsing = 0
+        self.ready = deque()
+        self.histograms = {stage: LatencyHistogram() for stage in STAGE_LABELS}
+
+    @property
+    def busy(self):
+        return self.helper_job is not None or bool(self.waiting) or self.parsing > 0 or bool(self.ready)
+
+    def start(self):
+        job = PipelineJob(self.next_id)
+        self.next_id += 1
+        self.waiting.append(job)
+        self._start_next_helpers()
+        return job
+
+    def _start_next_helpers(self):
+        # 補助プログラムは画面操作を伴うため、患者ごとに1件ずつ順番に実行する
+        if self.helper_job is not None or not self.waiting:
+            return
+        self.helper_job = self.waiting.popleft()
+        self._run_helper(self.helper_job, 0)
+
+    def _run_helper(self, job, index):
+        if index == len(HELPER_STAGES):
+            self._capture(job)
+            return
+
+        name, operation = HELPER_STAGES[index]
+        try:
+            command = self.get_command(operation)
+            if command is None:
+                self._fail(job, name, f"{STAGE_LABELS[name]}の実行ファイルが見つかりません")
+                return
+            if operation == "soap_copy":
+                self._mark_clipboard()
+            self.runner.submit(name, command,
+                               on_done=lambda result: self._on_helper_done(job, index, result),
+                               on_error=lambda error: self._fail(job, name, error))
+        except Exception as e:
+            self._fail(job, name, e)
+
+    def _on_helper_done(self, job, index, result):
+        name = HELPER_STAGES[index][0]
+        job.timings[name] = result.elapsed
+        if not result.ok:
+            self._fail(job, name, result.describe())
+            return
+        self._run_helper(job, index + 1)
+
+    def _mark_clipboard(self):
+        # カルテのコピーに失敗した場合に、前の患者の内容を取り込まないよう目印を残す
+        if self.sequence_source is not None:
+            self.clipboard_sequence = self.sequence_source()
+        else:
+            self.clipboard.copy("")
+
+    def _capture(self, job):
+        start = time.perf_counter()
+        if self.sequence_source is not None and self.sequence_source() == self.clipboard_sequence:
+            self._fail(job, "capture", "カルテのコピーでクリップボードが更新されませんでした")
+            return
+        try:
+            job.text = self.clipboard.paste()
+        except Exception as e:
+            self._fail(job, "capture", e)
+            return
+        job.timings["capture"] = time.perf_counter() - start
+        self.helper_job = None
+
+        if not job.text or not job.text.strip():
+            self._fail(job, "capture", "クリップボードにテキストがありません")
+            return
+
+        # 変換は別スレッドで行い、その間に次の患者の補助プログラムを進める
+        self.parsing += 1
+        self.dispatcher.submit(self.parse_executor, timed_call, self.parse, job.text,
+                               on_done=lambda result: self._on_parsed(job, result),
+                               on_error=lambda error: self._on_parse_failed(job, error))
+        self._flush_ready()
+        self._start_next_helpers()
+        if self.on_captured:
+            self.on_captured(job)
+
+    def _on_parsed(self, job, result):
+        self.parsing -= 1
+        elapsed, (job.parsed_data, job.json_data) = result
+        job.timings["parse"] = elapsed
+        self.ready.append(job)
+        self._flush_ready()
+
+    def _on_parse_failed(self, job, error):
+        self.parsing -= 1
+        self._fail(job, "parse", error)
+
+    def _flush_ready(self):
+        # 補助プログラムの実行中はクリップボードを書き換えない（取り込み前の内容を壊さないため）
+        if self.helper_job is not None:
+            return
+        while self.ready:
+            job = self.ready.popleft()
+            start = time.perf_counter()
+            try:
+                self.clipboard.copy(job.json_data)
+            except Exception as e:
+                self._fail(job, "copy", e)
+                continue
+            job.timings["copy"] = time.perf_counter() - start
+            for stage, seconds in job.timings.items():
+                self.histograms[stage].observe(seconds)
+            if self.on_finished:
+                self.on_finished(job)
+
+    def _fail(self, job, stage, error):
+        if self.helper_job is job:
+            self.helper_job = None
+        if self.on_error:
+            self.on_error(job, STAGE_LABELS[stage], error)
+        self._flush_ready()
+        self._start_next_helpers()
@@ -0,0 +1,107 @@
+import hashlib
+import zlib
+from collections import deque
+
+
+def digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def split_chunks(lines, window=4, divisor=8):
+    # 直近window行のハッシュの和で区切るため、同じ内容はコピー開始位置によらず同じ位置で区切られる
+    chunks = []
+    start = 0
+    rolling = 0
+    recent = deque()
+    for index, line in enumerate(lines):
+        line_hash = zlib.crc32(line.encode('utf-8'))
+        recent.append(line_hash)
+        rolling += line_hash
+        if len(recent) > window:
+            rolling -= recent.popleft()
+        if len(recent) == window and rolling % divisor == 0:
+            chunks.append((start, index + 1))
+            start = index + 1
+    if start < len(lines):
+        chunks.append((start, len(lines)))
+    return chunks
+
+
+class ClipHistory:
+    def __init__(self, max_clips=32):
+        self.max_clips = max_clips
+        self.clips = deque()
+        self.clip_ids = {}
+        self.chunk_index = {}
+        self.next_id = 0
+        self.dropped_count = 0
+        self.trimmed_count = 0
+
+    def clear(self):
+        self.clips.clear()
+        self.clip_ids.clear()
+        self.chunk_index.clear()
+
+    def filter(self, text):
+        if self.max_clips <= 0:
+            return text
+
+        raw_lines = text.split('\n')
+        lines = [line.strip() for line in raw_lines]
+        whole_hash = digest('\n'.join(lines))
+        chunks = split_chunks(lines)
+        chunk_hashes = [digest('\n'.join(lines[start:end])) for start, end in chunks]
+
+        if whole_hash in self.clip_ids or self._is_contained(lines, chunk_hashes):
+            self.dropped_count += 1
+            return None
+
+        overlap = self._tail_overlap(lines, chunks, chunk_hashes)
+        self._remember(lines, whole_hash, chunks, chunk_hashes)
+
+        if overlap:
+            self.trimmed_count += 1
+            return '\n'.join(raw_lines[overlap:])
+        return text
+
+    def _is_contained(self, lines, chunk_hashes):
+        needle = '\n' + '\n'.join(lines).strip('\n') + '\n'
+        candidates = {self.chunk_index[chunk_hash][0] for chunk_hash in chunk_hashes
+                      if chunk_hash in self.chunk_index}
+        for clip_id, clip_lines, _, _ in self.clips:
+            if clip_id in candidates and needle in '\n' + '\n'.join(clip_lines) + '\n':
+                return True
+        return False
+
+    def _tail_overlap(self, lines, chunks, chunk_hashes):
+        # 直前のクリップ末尾と重なる先頭行だけを取り除く（文書末尾にそのまま続くことを確認できる場合のみ）
+        if not self.clips:
+            return 0
+
+        last_id, last_lines, _, _ = self.clips[-1]
+        for (start, _), chunk_hash in zip(chunks, chunk_hashes):
+            entry = self.chunk_index.get(chunk_hash)
+            if entry is None or entry[0] != last_id:
+                continue
+            offset = entry[1] - start
+            overlap = len(last_lines) - offset
+            if offset >= 0 and 0 < overlap < len(lines) and lines[:overlap] == last_lines[offset:]:
+                return overlap
+        return 0
+
+    def _remember(self, lines, whole_hash, chunks, chunk_hashes):
+        clip_id = self.next_id
+        self.next_id += 1
+
+        self.clips.append((clip_id, lines, whole_hash, chunk_hashes))
+        self.clip_ids[whole_hash] = clip_id
+        for (start, _), chunk_hash in zip(chunks, chunk_hashes):
+            self.chunk_index[chunk_hash] = (clip_id, start)
+
+        while len(self.clips) > self.max_clips:
+            old_id, _, old_hash, old_chunk_hashes = self.clips.popleft()
+            if self.clip_ids.get(old_hash) == old_id:
+                del self.clip_ids[old_hash]
+            for chunk_hash in old_chunk_hashes:
+                if self.chunk_index.get(chunk_hash, (None,))[0] == old_id:
+                    del self.chunk_index[chunk_hash]
@@ -0,0 +1,57 @@
+from tkinter import TclError
+
+
+class TkClipboardBackend:
+    name = "tk"
+
+    def __init__(self, root, fallback=None):
+        self.root = root
+        self.fallback = fallback or PyperclipBackend()
+
+    def paste(self):
+        # Tkのクリップボードはプロセス内で読めるため、外部コマンドを起動しない
+        try:
+            return self.root.clipboard_get()
+        except TclError:
+            # 空またはテキスト以外の内容
+            return ""
+
+    def copy(self, text):
+        try:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(text)
+        except TclError:
+            self.fallback.copy(text)
+
+
+class PyperclipBackend:
+    name = "pyperclip"
+
+    def paste(self):
+        import pyperclip
+        return pyperclip.paste()
+
+    def copy(self, text):
+        import pyperclip
+        pyperclip.copy(text)
+
+
+class MemoryClipboardBackend:
+    name = "memory"
+
+    def __init__(self, text=""):
+        self.text = text
+
+    def paste(self):
+        return self.text
+
+    def copy(self, text):
+        self.text = text
+
+
+def create_clipboard_backend(name, root=None):
+    if name == TkClipboardBackend.name and root is not None:
+        return TkClipboardBackend(root)
+    if name == MemoryClipboardBackend.name:
+        return MemoryClipboardBackend()
+    return PyperclipBackend()
@@ -0,0 +1,44 @@
+import sys
+
+
+def get_clipboard_sequence_source():
+    # Windowsではクリップボードの更新回数を取得でき、内容を読まずに変更を検知できる
+    if sys.platform != 'win32':
+        return None
+    try:
+        import ctypes
+        return ctypes.windll.user32.GetClipboardSequenceNumber
+    except (ImportError, AttributeError, OSError):
+        return None
+
+
+class ClipboardWatcher:
+    def __init__(self, sequence_source=None, min_interval=100, max_interval=1000, backoff=1.5):
+        self.sequence_source = sequence_source
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.interval = min_interval
+        self._last_sequence = None
+
+    def reset(self):
+        self.interval = self.min_interval
+        self._last_sequence = None
+
+    def has_changed(self):
+        # 更新回数を取得できない環境では毎回内容を比較する必要がある
+        if self.sequence_source is None:
+            return True
+
+        sequence = self.sequence_source()
+        if sequence == self._last_sequence:
+            return False
+        self._last_sequence = sequence
+        return True
+
+    def next_interval(self, changed):
+        if changed or self.sequence_source is not None:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(int(self.interval * self.backoff), self.max_interval)
+        return self.interval
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.text_decoding import iter_file_lines
+from services.txt_parse import parse_medical_lines
+from utils.file_utils import write_file_atomic
+
+INDEX_FILE_NAME = ".txt2json_processed.jsonl"
+COMPACT_MIN_LINES = 1000
+
+
+def is_text_file(name):
+    return name.lower().endswith(".txt")
+
+
+def scan_folder(folder):
+    # ファイル名ごとに(更新時刻, サイズ)を記録し、内容を読まずに変更を検知する
+    signatures = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and is_text_file(entry.name):
+                info = entry.stat()
+                signatures[entry.path] = (info.st_mtime_ns, info.st_size)
+    return signatures
+
+
+class PollingSource:
+    def __init__(self, folder, interval=2.0):
+        self.folder = folder
+        self.interval = interval
+        self.snapshot = {}
+        self.reported = {}
+
+    def initial(self):
+        # 起動時に書き込み中のファイルもあるため、既存ファイルも次の走査で落ち着いてから処理する
+        self.snapshot = scan_folder(self.folder)
+        return []
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval)
+        current = scan_folder(self.folder)
+
+        # 前回の走査から変化がない（書き込みが終わった）ファイルだけを返す
+        changed = [path for path, signature in current.items()
+                   if self.snapshot.get(path) == signature and self.reported.get(path) != signature]
+        for path in changed:
+            self.reported[path] = current[path]
+        for path in list(self.reported):
+            if path not in current:
+                del self.reported[path]
+        self.snapshot = current
+        return sorted(changed)
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_Q_OVERFLOW = 0x00004000
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, folder):
+        import ctypes
+        import ctypes.util
+
+        self.folder = folder
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotifyを初期化できません")
+        watch = libc.inotify_add_watch(self.fd, os.fsencode(folder), self.IN_CLOSE_WRITE | self.IN_MOVED_TO)
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"フォルダを監視できません: {folder}")
+
+    def initial(self):
+        return sorted(scan_folder(self.folder))
+
+    def wait(self, timeout=None):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        data = os.read(self.fd, 64 * 1024)
+        paths = []
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            _, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            start = offset + self.EVENT_HEADER.size
+            name = os.fsdecode(data[start:start + length].rstrip(b"\0"))
+            offset = start + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # イベントが溢れた場合はフォルダ全体を確認し直す
+                return sorted(scan_folder(self.folder))
+            path = os.path.join(self.folder, name)
+            if is_text_file(name) and path not in paths:
+                paths.append(path)
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watch_source(folder, interval=2.0, polling=False):
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifySource(folder)
+        except (OSError, AttributeError) as e:
+            print(f"inotifyを利用できないため定期確認で監視します: {e}", file=sys.stderr)
+    return PollingSource(folder, interval)
+
+
+class ProcessedIndex:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        # 出力ファイル名ごとに、最後に変換した内容のダイジェストを記録する
+        self.digests = {}
+        self.in_progress = set()
+        self.log_lines = 0
+        if os.path.exists(path):
+            try:
+                self.load()
+            except (OSError, ValueError) as e:
+                self.digests = {}
+                print(f"処理済み一覧を読み込めません: {e}", file=sys.stderr)
+
+    def load(self):
+        truncated = False
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    # 追記の途中で終了した最後の行は捨てる
+                    truncated = True
+                    break
+                name, digest = json.loads(line)
+                self.digests[name] = digest
+                self.log_lines += 1
+        if truncated:
+            self.compact()
+
+    def claim(self, name, digest):
+        # 同じファイルの同じ内容を複数のワーカーで同時に処理しない
+        with self.lock:
+            if self.digests.get(name) == digest or (name, digest) in self.in_progress:
+                return False
+            self.in_progress.add((name, digest))
+            return True
+
+    def complete(self, name, digest):
+        with self.lock:
+            self.in_progress.discard((name, digest))
+            self.digests[name] = digest
+            # 1件ごとには追記だけを行い、古い記録が溜まったら書き直して詰める
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps([name, digest], ensure_ascii=False) + "\n")
+            self.log_lines += 1
+            if self.log_lines > max(COMPACT_MIN_LINES, 2 * len(self.digests)):
+                self.compact()
+
+    def compact(self):
+        write_file_atomic(self.path, "".join(json.dumps([name, digest], ensure_ascii=False) + "\n"
+                                             for name, digest in self.digests.items()))
+        self.log_lines = len(self.digests)
+
+    def release(self, name, digest):
+        with self.lock:
+            self.in_progress.discard((name, digest))
+
+
+class FolderIngestor:
+    def __init__(self, folder, output_dir=None, workers=2, max_pending=8, encoding=None):
+        self.folder = folder
+        self.output_dir = output_dir or folder
+        self.encoding = encoding
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.index = ProcessedIndex(os.path.join(self.output_dir, INDEX_FILE_NAME))
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="folder-ingest")
+        # 処理待ちが上限に達したら、空きが出るまで新しいファイルの受け付けを待つ
+        self.slots = threading.BoundedSemaphore(max(workers, max_pending))
+        self.counts_lock = threading.Lock()
+        self.converted_count = 0
+        self.skipped_count = 0
+        self.error_count = 0
+
+    def output_path(self, path):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.output_dir, stem + ".json")
+
+    def submit(self, path):
+        self.slots.acquire()
+        future = self.executor.submit(self.process_file, path)
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def read_lines(self, path):
+        # ファイル全体をバイト列として持たず、行を読みながらダイジェストを計算する
+        digest = hashlib.blake2b(digest_size=16)
+        lines = []
+        for line in iter_file_lines(path, self.encoding):
+            digest.update(line.encode("utf-8"))
+            lines.append(line)
+        return lines, digest.hexdigest()
+
+    def process_file(self, path):
+        try:
+            lines, digest = self.read_lines(path)
+        except (OSError, ValueError) as e:
+            self._count_error(path, e)
+            return None
+
+        output_path = self.output_path(path)
+        name = os.path.basename(output_path)
+        if not self.index.claim(name, digest):
+            with self.counts_lock:
+                self.skipped_count += 1
+            print(f"処理済みのためスキップしました: {path}", file=sys.stderr)
+            return None
+
+        try:
+            records = parse_medical_lines(lines)
+            write_file_atomic(output_path, json.dumps(records, indent=2, ensure_ascii=False))
+        except Exception as e:
+            self.index.release(name, digest)
+            self._count_error(path, e)
+            return None
+
+        self.index.complete(name, digest)
+        with self.counts_lock:
+            self.converted_count += 1
+        print(f"変換しました: {path} -> {output_path}", file=sys.stderr)
+        return output_path
+
+    def _count_error(self, path, error):
+        with self.counts_lock:
+            self.error_count += 1
+        print(f"エラー: {path} を変換できません: {error}", file=sys.stderr)
+
+    def run(self, source, stop_event=None, timeout=1.0):
+        stop_event = stop_event or threading.Event()
+        for path in source.initial():
+            self.submit(path)
+        while not stop_event.is_set():
+            for path in source.wait(timeout):
+                self.submit(path)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,77 @@
+import json
+import re
+import tkinter as tk
+from bisect import bisect_left
+
+
+class PagedJsonViewer:
+    def __init__(self, text_widget, page_size=50):
+        self.text_widget = text_widget
+        self.page_size = max(1, page_size)
+        self.records = []
+        self.page = 0
+        self._full_json = None
+
+    @property
+    def page_count(self):
+        if not self.records:
+            return 0
+        return (len(self.records) - 1) // self.page_size + 1
+
+    def set_records(self, records, json_data=None):
+        # 変換結果全体はウィジェットに入れず、ここで保持する
+        self.records = records
+        self._full_json = json_data
+        self.show_page(0)
+
+    def clear(self):
+        self.records = []
+        self._full_json = None
+        self.page = 0
+        self.text_widget.delete("1.0", tk.END)
+
+    def full_json(self):
+        if self._full_json is None:
+            self._full_json = json.dumps(self.records, indent=2, ensure_ascii=False)
+        return self._full_json
+
+    def show_page(self, page):
+        if self.page_count:
+            page = min(max(page, 0), self.page_count - 1)
+        else:
+            page = 0
+        self.page = page
+
+        start = page * self.page_size
+        page_records = self.records[start:start + self.page_size]
+
+        self.text_widget.delete("1.0", tk.END)
+        if page_records:
+            self.text_widget.insert(tk.END, json.dumps(page_records, indent=2, ensure_ascii=False))
+
+    def next_page(self):
+        self.show_page(self.page + 1)
+
+    def prev_page(self):
+        self.show_page(self.page - 1)
+
+    def jump_to_date(self, date_text):
+        date_match = re.match(r"\s*(\d{4})[/-](\d{1,2})[/-](\d{1,2})", date_text or "")
+        if not date_match or not self.records:
+            return False
+
+        year, month, day = date_match.groups()
+        target = f"{year}-{int(month):02d}-{int(day):02d}"
+
+        # 変換結果はタイムスタンプ順に並んでいるため二分探索できる
+        index = bisect_left(self.records, target, key=lambda record: record.get('timestamp') or '')
+        if index >= len(self.records):
+            index = len(self.records) - 1
+
+        self.show_page(index // self.page_size)
+        return True
+
+    def status_text(self):
+        if not self.records:
+            return "0 / 0 ページ（0件）"
+        return f"{self.page + 1} / {self.page_count} ページ（{len(self.records)}件）"
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+
+from utils.file_utils import write_file_atomic
+
+INDEX_SUFFIX = ".idx"
+
+
+class JsonlStoreError(ValueError):
+    pass
+
+
+def record_digest(record):
+    record_str = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(record_str.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def group_key(record, digest):
+    # 日時の分からない記録は区別できないため、内容そのものを鍵にする（更新ではなく追加として扱う）
+    if not record.get('timestamp'):
+        return "#" + digest
+    return f"{record['timestamp']}|{record.get('department', '')}"
+
+
+def encode_line(record):
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+class JsonlStore:
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.groups = {}
+        self.size = 0
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        index = self.read_index()
+        info = os.stat(self.path)
+        if index is not None and index.get('size') == info.st_size and index.get('mtime_ns') == info.st_mtime_ns:
+            self.groups = index['groups']
+            self.size = index['size']
+            return
+
+        # 索引がない・古い（書き込み途中で終了した、他のツールが書き換えた）場合はファイルから作り直す
+        self.rebuild()
+
+    def read_index(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return index if isinstance(index, dict) and isinstance(index.get('groups'), dict) else None
+
+    def read_lines(self):
+        with open(self.path, 'rb') as file:
+            yield from file
+
+    def rebuild(self):
+        self.groups = {}
+        size = 0
+        missing_newline = False
+        for line_number, line in enumerate(self.read_lines(), 1):
+            if not line.strip():
+                size += len(line)
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                if not line.endswith(b"\n"):
+                    # 追記の途中で終了した最後の行は捨てる
+                    break
+                raise JsonlStoreError(f"{self.path} の{line_number}行目を読み込めません: {e}") from e
+            digest = record_digest(record)
+            self.groups[group_key(record, digest)] = digest
+            size += len(line)
+            missing_newline = not line.endswith(b"\n")
+
+        if os.path.getsize(self.path) != size or missing_newline:
+            with open(self.path, 'r+b') as file:
+                file.truncate(size)
+                if missing_newline:
+                    # 改行で終わっていないファイルは、追記できるよう改行を補う
+                    file.seek(size)
+                    file.write(b"\n")
+                    size += 1
+        self.size = size
+        self.save_index()
+
+    def save_index(self):
+        info = os.stat(self.path)
+        write_file_atomic(self.index_path, json.dumps({
+            'size': self.size,
+            'mtime_ns': info.st_mtime_ns,
+            'groups': self.groups,
+        }, ensure_ascii=False))
+
+    def update(self, records):
+        new_records = {}
+        changed = {}
+        for record in records:
+            digest = record_digest(record)
+            key = group_key(record, digest)
+            current = self.groups.get(key)
+            if current == digest:
+                continue
+            if current is None or key in new_records:
+                new_records[key] = record
+            else:
+                changed[key] = record
+            self.groups[key] = digest
+
+        if changed:
+            # 既存の記録が変わった場合のみ、全体を一時ファイルに書き出して置き換える
+            self.rewrite(changed, new_records.values())
+        elif new_records:
+            self.append(new_records.values())
+        return len(new_records), len(changed)
+
+    def append(self, records):
+        data = b"".join(encode_line(record) for record in records)
+        with open(self.path, 'ab') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        # 追記が終わってから索引を更新する。途中で終了した場合は、次回読み込み時にファイルから作り直す
+        self.size += len(data)
+        self.save_index()
+
+    def rewrite(self, changed, new_records):
+        lines = []
+        replaced = set()
+        for line in self.read_lines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = group_key(record, record_digest(record))
+            if key in changed:
+                # 他のツールが同じ鍵の行を重ねて書いていた場合は、最初の行だけを置き換えて残りは捨てる
+                if key in replaced:
+                    continue
+                replaced.add(key)
+                record = changed[key]
+            lines.append(encode_line(record))
+        lines.extend(encode_line(record) for record in new_records)
+
+        data = b"".join(lines)
+        write_file_atomic(self.path, data)
+        self.size = len(data)
+        self.save_index()
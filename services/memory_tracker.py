@@ -0,0 +1,106 @@
+import linecache
+import os
+import tracemalloc
+from contextlib import contextmanager
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024 or unit == "MB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+class MemoryBudgetExceeded(Exception):
+    def __init__(self, phase, used, budget):
+        self.phase = phase
+        self.used = used
+        self.budget = budget
+        super().__init__(f"メモリ使用量が上限を超えたため中止しました"
+                         f"（{phase}: {format_bytes(used)} / 上限 {format_bytes(budget)}）")
+
+
+class PhaseStats:
+    def __init__(self, name, peak, retained):
+        self.name = name
+        self.peak = peak
+        self.retained = retained
+
+    def describe(self):
+        return f"{self.name}: 最大 {format_bytes(self.peak)} / 保持 {format_bytes(self.retained)}"
+
+
+class MemoryTracker:
+    def __init__(self, budget=None, top=3, check_every=1000):
+        self.budget = budget
+        self.top = top
+        self.check_every = check_every
+        self.phases = []
+        self.top_sites = []
+        self.current_phase = None
+        self._baseline = 0
+        self._started = False
+
+    def __enter__(self):
+        # 計測中は割り当てごとに記録するため遅くなる。必要な時だけ有効にする
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def phase(self, name):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        self.current_phase = name
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.phases.append(PhaseStats(name, peak - before, current - before))
+            self.current_phase = None
+        self.check_budget(name, peak)
+
+    def check_budget(self, name, traced):
+        used = traced - self._baseline
+        if self.budget and used > self.budget:
+            raise MemoryBudgetExceeded(name, used, self.budget)
+
+    def guard(self, lines):
+        # 入力を読み進める途中でも上限を確認し、超えた時点で中止する
+        for index, line in enumerate(lines, 1):
+            if index % self.check_every == 0:
+                self.check_budget(self.current_phase or "変換", tracemalloc.get_traced_memory()[0])
+            yield line
+
+    def capture_top_sites(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        self.top_sites = []
+        for statistic in snapshot.statistics("lineno")[:self.top]:
+            frame = statistic.traceback[0]
+            code = linecache.getline(frame.filename, frame.lineno).strip()
+            self.top_sites.append((f"{os.path.basename(frame.filename)}:{frame.lineno}", statistic.size, code))
+        return self.top_sites
+
+    def summary(self):
+        # 画面の表示欄向けに1行にまとめる（割り当ての多い箇所は位置と大きさのみ）
+        parts = [phase.describe() for phase in self.phases]
+        if self.top_sites:
+            parts.append("多い箇所: " + ", ".join(f"{location} {format_bytes(size)}"
+                                                  for location, size, _ in self.top_sites))
+        return "  ".join(parts)
+
+    def report(self):
+        lines = [f"メモリ {phase.describe()}" for phase in self.phases]
+        for location, size, code in self.top_sites:
+            lines.append(f"  {format_bytes(size):>8}  {location}  {code}")
+        return "\n".join(lines)
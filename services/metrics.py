@@ -0,0 +1,110 @@
+from services.automation_runner import LatencyHistogram
+from utils.file_utils import write_file_atomic
+
+CONVERSION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+
+def count_lines(text):
+    # 大きな入力でも行の一覧を作らずに数える
+    if not text:
+        return 0
+    return text.count("\n") + (0 if text.endswith("\n") else 1)
+
+
+def format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        # 頻繁に呼ばれる箇所で使うため、加算のみで済ませる
+        self.value += amount
+
+    def render(self):
+        return [f"{self.name} {format_value(self.value)}"]
+
+
+class HistogramFamily:
+    def __init__(self, name, help_text, label=None, buckets=None, children=None):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        # 既存の集計（補助プログラムの所要時間など）をそのまま出力できるよう、辞書を共有する
+        self.children = children if children is not None else {}
+
+    def labels(self, value=None):
+        child = self.children.get(value)
+        if child is None:
+            child = self.children[value] = LatencyHistogram(self.buckets)
+        return child
+
+    def observe(self, seconds):
+        self.labels().observe(seconds)
+
+    def render(self):
+        lines = []
+        for value, histogram in sorted(self.children.items(), key=lambda item: str(item[0])):
+            labels = [(self.label, value)] if self.label and value is not None else []
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(labels + [('le', format_value(bound))])} "
+                             f"{cumulative}")
+            if histogram.buckets[-1] != float('inf'):
+                lines.append(f"{self.name}_bucket{format_labels(labels + [('le', '+Inf')])} {histogram.count}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(round(histogram.total, 6))}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {histogram.count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def histogram(self, name, help_text, buckets=None):
+        family = self._register(HistogramFamily(name, help_text, buckets=buckets))
+        family.labels()
+        return family
+
+    def histogram_family(self, name, help_text, label, children=None, buckets=None):
+        return self._register(HistogramFamily(name, help_text, label, buckets, children))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            kind = "counter" if isinstance(metric, Counter) else "histogram"
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        # node_exporterが書き込み途中のファイルを読まないよう、置き換えで書き出す
+        write_file_atomic(path, self.render())
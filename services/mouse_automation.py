@@ -1,43 +1,19 @@
 import os
-import subprocess
+import sys
 
 from utils.config_manager import load_config
 
 
-def soap_copy():
+def get_helper_command(operation_type=None):
     config = load_config()
+    key = 'soap_copy_file_path' if operation_type == "soap_copy" else 'operation_file_path'
+    exe_path = config.get('Paths', key)
+    if not os.path.exists(exe_path):
+        print(f"エラー: ファイルが見つかりません: {exe_path}")
+        return None
 
-    try:
-        exe_path = config.get('Paths', 'soap_copy_file_path')
-        if os.path.exists(exe_path):
-            subprocess.run([exe_path], check=True)
-        else:
-            print(f"エラー: ファイルが見つかりません: {exe_path}")
+    # テスト用の代替スクリプトも同じ設定で指定できるようにする
+    if exe_path.endswith('.py'):
+        return [sys.executable, exe_path]
+    return [exe_path]
 
-    except subprocess.CalledProcessError as e:
-        print(f"SOAPコピーEXE実行エラー: {e}")
-    except Exception as e:
-        print(f"SOAPコピーエラー: {e}")
-
-
-def run_mouse_operation():
-    config = load_config()
-
-    try:
-        exe_path = config.get('Paths', 'operation_file_path')
-        if os.path.exists(exe_path):
-            subprocess.run([exe_path], check=True)
-        else:
-            print(f"エラー: ファイルが見つかりません: {exe_path}")
-
-    except subprocess.CalledProcessError as e:
-        print(f"マウス操作EXE実行エラー: {e}")
-    except Exception as e:
-        print(f"マウス操作エラー: {e}")
-
-
-def main(operation_type=None):
-    if operation_type == "soap_copy":
-        soap_copy()
-    else:
-        run_mouse_operation()
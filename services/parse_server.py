@@ -0,0 +1,201 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+from services.automation_runner import LatencyHistogram
+from services.txt_parse import parse_medical_text
+from version import VERSION
+
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, float('inf'))
+
+
+class ServerMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency = LatencyHistogram(PARSE_BUCKETS)
+
+    def begin(self):
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+
+    def end(self, elapsed, ok=True):
+        with self.lock:
+            self.in_flight -= 1
+            if ok:
+                self.latency.observe(elapsed)
+            else:
+                self.errors += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "uptime_sec": round(time.time() - self.started, 3),
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "parse_count": self.latency.count,
+                "parse_seconds_total": round(self.latency.total, 6),
+                "parse_seconds_buckets": {
+                    ("+Inf" if bound == float('inf') else str(bound)): count
+                    for bound, count in zip(self.latency.buckets, self.latency.counts)
+                },
+            }
+
+
+class ParseRequestHandler(BaseHTTPRequestHandler):
+    server_version = f"TXT2JSON32/{VERSION}"
+    # 接続を使い回して1件ごとの接続コストを省く
+    protocol_version = "HTTP/1.1"
+    # 放置された接続がワーカーを占有し続けないようにする
+    timeout = 5
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok", "version": VERSION})
+        elif self.path == "/metrics":
+            self.send_json(200, self.server.metrics.snapshot())
+        else:
+            self.send_json(404, {"error": f"見つかりません: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/parse":
+            self.send_json(404, {"error": f"見つかりません: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            self.send_json(411, {"error": "Content-Lengthが必要です"})
+            return
+        if length < 0:
+            self.close_connection = True
+            self.send_json(400, {"error": "Content-Lengthが不正です"})
+            return
+        if length > self.server.max_body_bytes:
+            # 本文を読まずに応答するため、この接続は使い回さない
+            self.close_connection = True
+            self.send_json(413, {"error": f"本文が大きすぎます（上限 {self.server.max_body_bytes} バイト）"})
+            return
+
+        body = self.rfile.read(length)
+        metrics = self.server.metrics
+        metrics.begin()
+        start = time.perf_counter()
+        try:
+            records = parse_medical_text(body.decode("utf-8"))
+        except UnicodeDecodeError:
+            metrics.end(time.perf_counter() - start, ok=False)
+            self.send_json(400, {"error": "本文はUTF-8で送信してください"})
+            return
+        except Exception as e:
+            metrics.end(time.perf_counter() - start, ok=False)
+            self.send_json(500, {"error": f"変換中にエラーが発生しました: {e}"})
+            return
+        metrics.end(time.perf_counter() - start)
+        self.send_json(200, records)
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 1件ごとのアクセスログは出さない（件数は/metricsで確認する）
+        pass
+
+
+def build_busy_response():
+    body = json.dumps({"error": "処理待ちの接続が多すぎます"}, ensure_ascii=False).encode("utf-8")
+    return (b"HTTP/1.1 503 Service Unavailable\r\n"
+            b"Content-Type: application/json; charset=utf-8\r\n"
+            b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n"
+            b"Connection: close\r\n\r\n" + body)
+
+
+class PooledServerMixIn:
+    # 接続ごとにスレッドを作らず、決まった数のワーカーで処理する
+    def init_pool(self, workers, max_body_bytes, max_pending=16):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse-server")
+        # 処理中と待ちの接続数に上限を設け、溢れた分はキューに積まずにすぐ断る
+        self.slots = threading.BoundedSemaphore(workers + max(0, max_pending))
+        self.metrics = ServerMetrics()
+        self.max_body_bytes = max_body_bytes
+
+    def process_request(self, request, client_address):
+        if not self.slots.acquire(blocking=False):
+            self.reject_request(request)
+            return
+        try:
+            self.executor.submit(self.process_request_worker, request, client_address)
+        except RuntimeError:
+            self.slots.release()
+            self.shutdown_request(request)
+
+    def reject_request(self, request):
+        try:
+            request.sendall(build_busy_response())
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+    def process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+class ParseTCPServer(PooledServerMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+if hasattr(socket, "AF_UNIX"):
+    class ParseUnixServer(PooledServerMixIn, socketserver.UnixStreamServer):
+        def server_bind(self):
+            # 前回の異常終了で残ったソケットファイルは削除してから待ち受ける
+            path = self.server_address
+            if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+            super().server_bind()
+
+        def server_close(self):
+            super().server_close()
+            if os.path.exists(self.server_address):
+                os.unlink(self.server_address)
+
+
+def create_server(host="127.0.0.1", port=8765, unix_path=None, workers=4, max_body_bytes=10 * 1024 * 1024,
+                  max_pending=16):
+    if unix_path:
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("この環境ではUnixソケットを利用できません")
+        server = ParseUnixServer(unix_path, ParseRequestHandler)
+    else:
+        server = ParseTCPServer((host, port), ParseRequestHandler)
+    server.init_pool(workers, max_body_bytes, max_pending)
+    return server
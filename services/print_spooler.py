@@ -0,0 +1,98 @@
+import os
+import shlex
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from services.automation_runner import run_helper
+
+
+def default_print_command():
+    return "notepad /p" if sys.platform == "win32" else "lpr"
+
+
+def build_print_command(command, path):
+    # シェルを通さず引数の一覧で実行するため、パスに空白や記号が含まれていてもそのまま渡せる
+    args = shlex.split(command or default_print_command(), posix=os.name != "nt")
+    # Windowsの書式（"C:\Program Files\..."）では円記号を残し、囲みの引用符だけを外す
+    args = [arg[1:-1] if len(arg) >= 2 and arg[0] == arg[-1] == '"' else arg for arg in args]
+    if "{file}" in args:
+        return [path if arg == "{file}" else arg for arg in args]
+    return args + [path]
+
+
+def remove_print_file(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"印刷用の一時ファイルを削除できません: {e}")
+
+
+def print_file(command, path, timeout):
+    # 画面が閉じられて完了の通知が届かない場合も残らないよう、一時ファイルはワーカー側で削除する
+    try:
+        return run_helper("print", command, timeout)
+    finally:
+        remove_print_file(path)
+
+
+class PrintJob:
+    def __init__(self, job_id, path):
+        self.job_id = job_id
+        self.path = path
+        self.result = None
+
+
+class PrintSpooler:
+    def __init__(self, dispatcher, command=None, on_status=None, timeout=60):
+        self.dispatcher = dispatcher
+        self.command = command
+        self.on_status = on_status
+        self.timeout = timeout
+        # 補助プログラムとは別のワーカーで順番に印刷し、互いの完了を待たせない
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="print")
+        self.next_id = 1
+        self.pending = 0
+
+    def submit(self, text):
+        fd, path = tempfile.mkstemp(prefix="print_", suffix=".txt")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+
+        job = PrintJob(self.next_id, path)
+        self.next_id += 1
+        self.pending += 1
+        self.report(job, "印刷待ち")
+        try:
+            # 印刷はワーカーのキューで順番に実行し、呼び出し元の画面を止めない
+            self.dispatcher.submit(self.executor, print_file, build_print_command(self.command, path), path,
+                                   self.timeout,
+                                   on_done=lambda result: self.on_done(job, result),
+                                   on_error=lambda error: self.on_error(job, error))
+        except Exception:
+            self.pending -= 1
+            remove_print_file(path)
+            raise
+        return job
+
+    def on_done(self, job, result):
+        self.pending -= 1
+        job.result = result
+        if result.ok:
+            self.report(job, "印刷しました")
+        else:
+            self.report(job, f"印刷に失敗しました（{result.describe()}）")
+
+    def on_error(self, job, error):
+        self.pending -= 1
+        self.report(job, f"印刷に失敗しました: {error}")
+
+    def report(self, job, message):
+        if self.on_status:
+            self.on_status(job, message)
+
+    def shutdown(self):
+        # 受け付け済みの印刷は画面を閉じた後も続け、終わったものから一時ファイルを削除する
+        self.executor.shutdown(wait=False)
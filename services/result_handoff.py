@@ -0,0 +1,55 @@
+import os
+import tempfile
+from datetime import datetime
+
+from services.memory_tracker import format_bytes
+
+FILE_PREFIX = "txt2json_"
+
+
+def default_handoff_dir():
+    return os.path.join(tempfile.gettempdir(), "txt2json")
+
+
+def exceeds_encoded_size(text, limit_bytes):
+    # UTF-8では1文字が1～4バイトのため、文字数だけで決まる場合は変換せずに判定する
+    if len(text) > limit_bytes:
+        return True
+    if len(text) * 4 <= limit_bytes:
+        return False
+    return len(text.encode("utf-8")) > limit_bytes
+
+
+def prune_result_files(directory, keep):
+    # 書き出したファイルは新しいものから指定の件数だけ残し、古いものから削除する
+    entries = []
+    with os.scandir(directory) as scan:
+        for entry in scan:
+            if entry.is_file() and entry.name.startswith(FILE_PREFIX) and entry.name.endswith(".json"):
+                entries.append((entry.stat().st_mtime_ns, entry.name, entry.path))
+    entries.sort(reverse=True)
+    for _, _, path in entries[keep:]:
+        try:
+            os.unlink(path)
+        except OSError as e:
+            print(f"古い変換結果を削除できません: {e}")
+
+
+def write_result_file(directory, json_data, keep=0):
+    directory = directory or default_handoff_dir()
+    os.makedirs(directory, exist_ok=True)
+    # 続けて変換しても上書きしないよう、日時と一意な文字列をファイル名に含める
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    fd, path = tempfile.mkstemp(prefix=f"{FILE_PREFIX}{timestamp}_", suffix=".json", dir=directory)
+    data = json_data.encode("utf-8")
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    if keep > 0:
+        prune_result_files(directory, keep)
+    return path, len(data)
+
+
+def describe_handoff(path, record_count, size, copy_mode="path"):
+    if copy_mode == "summary":
+        return f"変換結果 {record_count}件（{format_bytes(size)}）: {path}"
+    return path
@@ -0,0 +1,134 @@
+import json
+import os
+import queue
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+
+SHARD_FIELDS = ("month", "department")
+UNSAFE_NAME_PATTERN = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+_STOP = object()
+
+
+def parse_shard_by(value):
+    fields = tuple(field.strip() for field in value.split(",") if field.strip())
+    unknown = [field for field in fields if field not in SHARD_FIELDS]
+    if not fields or unknown:
+        raise ValueError(f"分割方法は {', '.join(SHARD_FIELDS)} をカンマ区切りで指定してください: {value}")
+    return fields
+
+
+def safe_name(name, default="不明"):
+    # ファイル名に使えない文字を置き換え、フォルダの外を指さないようにする
+    name = UNSAFE_NAME_PATTERN.sub("_", name or "").strip().rstrip(". ")
+    if not name or name in (".", ".."):
+        return default
+    return name
+
+
+def shard_path(record, shard_by):
+    parts = []
+    for field in shard_by:
+        if field == "month":
+            timestamp = record.get("timestamp") or ""
+            parts.append(timestamp[:7] if len(timestamp) >= 7 else "日付不明")
+        else:
+            parts.append(safe_name(record.get("department")))
+    return os.path.join(*parts) + ".jsonl"
+
+
+class ShardWriterThread(threading.Thread):
+    def __init__(self, output_dir, queue_size, max_open_files):
+        super().__init__(daemon=True)
+        self.output_dir = output_dir
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.max_open_files = max_open_files
+        self.files = OrderedDict()
+        self.started_paths = set()
+        self.error = None
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                # エラー後も受け取りは続け、書き込み側が待ち続けないようにする
+                continue
+            try:
+                relative_path, line = item
+                self.get_file(relative_path).write(line)
+            except Exception as e:
+                self.error = e
+        self.close_files()
+
+    def get_file(self, relative_path):
+        file = self.files.get(relative_path)
+        if file is not None:
+            self.files.move_to_end(relative_path)
+            return file
+
+        # 同時に開くファイル数を抑え、古いものから閉じる（再度開く場合は追記）
+        if len(self.files) >= self.max_open_files:
+            _, oldest = self.files.popitem(last=False)
+            oldest.close()
+
+        path = os.path.join(self.output_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        mode = "a" if relative_path in self.started_paths else "w"
+        file = open(path, mode, encoding="utf-8")
+        self.started_paths.add(relative_path)
+        self.files[relative_path] = file
+        return file
+
+    def close_files(self):
+        for file in self.files.values():
+            try:
+                file.close()
+            except Exception as e:
+                self.error = self.error or e
+        self.files.clear()
+
+
+class ShardedWriter:
+    def __init__(self, output_dir, shard_by=SHARD_FIELDS, writers=4, queue_size=1000, max_open_files=64):
+        self.output_dir = output_dir
+        self.shard_by = shard_by
+        self.counts = Counter()
+        os.makedirs(output_dir, exist_ok=True)
+
+        # 同じファイルは常に同じスレッドが書き込むため、ファイルごとのロックは不要
+        self.threads = [ShardWriterThread(output_dir, queue_size, max_open_files) for _ in range(max(1, writers))]
+        for thread in self.threads:
+            thread.start()
+
+    def write(self, record):
+        relative_path = shard_path(record, self.shard_by)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        thread = self.threads[zlib.crc32(relative_path.encode("utf-8")) % len(self.threads)]
+        # キューが満杯の場合は書き込みが追いつくまで待つ
+        thread.queue.put((relative_path, line))
+        self.counts[relative_path] += 1
+
+    def close(self):
+        for thread in self.threads:
+            thread.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+
+        errors = [thread.error for thread in self.threads if thread.error is not None]
+        if errors:
+            raise errors[0]
+        return dict(self.counts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.close()
+        except Exception:
+            # 呼び出し側の例外を優先する
+            if exc_type is None:
+                raise
@@ -0,0 +1,82 @@
+import codecs
+
+SNIFF_BYTES = 4096
+CHUNK_SIZE = 64 * 1024
+ASCII_BYTES = bytes(range(128))
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _decodes(head, encoding, eof):
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(head, final=eof)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def sniff_encoding(head, eof=False):
+    # 先頭数KBだけを見て判定する（末尾で途切れた多バイト文字は不正とみなさない）
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    if head.isascii() or _decodes(head, "utf-8", eof):
+        return "utf-8"
+    if _decodes(head, "cp932", eof):
+        return "cp932"
+    # どちらとしても不正な場合は、電子カルテの書き出しで多いCP932として扱う
+    return "cp932"
+
+
+def _read_chunk(stream, size):
+    # パイプでは届いた分だけを返すread1を使い、入力の途中でも処理を進める
+    read = getattr(stream, "read1", None) or stream.read
+    return read(size)
+
+
+def _ascii_length(data):
+    return len(data) - len(data.lstrip(ASCII_BYTES))
+
+
+def iter_decoded_lines(stream, encoding=None, chunk_size=CHUNK_SIZE, errors="strict"):
+    pending = ""
+    chunk = _read_chunk(stream, chunk_size)
+    if encoding is None:
+        # 非ASCIIの文字が現れるまでは判定できないため、ASCIIとして読み進めながら行を返す
+        while chunk and chunk.isascii():
+            lines = (pending + chunk.decode("ascii")).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+            chunk = _read_chunk(stream, chunk_size)
+        # パイプで入力を待たないよう、最初の非ASCIIを含むチャンクだけで判定する
+        encoding = sniff_encoding(chunk, not chunk)
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+
+    while True:
+        # 変換処理と同じく"\n"で区切り、改行で終わっていない最後の行は次のチャンクとつなげる
+        lines = (pending + decoder.decode(chunk, final=not chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+        if not chunk:
+            break
+        chunk = _read_chunk(stream, chunk_size)
+    if pending:
+        yield pending
+
+
+def iter_file_lines(path, encoding=None, chunk_size=CHUNK_SIZE, errors="strict"):
+    with open(path, "rb") as file:
+        yield from iter_decoded_lines(file, encoding, chunk_size, errors)
+
+
+def decode_bytes(data, encoding=None, errors="strict"):
+    if encoding is None:
+        end = _ascii_length(data) + SNIFF_BYTES
+        encoding = sniff_encoding(data[:end], len(data) <= end)
+    return data.decode(encoding, errors)
@@ -0,0 +1,65 @@
+from bisect import bisect_right
+
+
+class TextDocument:
+    def __init__(self):
+        self.chunks = []
+        self.chunk_starts = []  # 各チャンク先頭の行番号
+        self.line_count = 0
+        self.length = 0
+        self.has_content = False
+
+    def append(self, text):
+        if not text:
+            return
+
+        lines = text.split('\n')
+        if self.chunks and not self.has_content:
+            # 空白のみの内容には改行を挟まずに続ける
+            self.chunks[-1][-1] += lines[0]
+            lines = lines[1:]
+        elif self.chunks:
+            self.length += 1  # チャンク間の改行
+
+        if lines:
+            self.chunk_starts.append(self.line_count)
+            self.chunks.append(lines)
+            self.line_count += len(lines)
+        self.length += len(text)
+        if not self.has_content:
+            self.has_content = bool(text.strip())
+
+    def clear(self):
+        self.chunks = []
+        self.chunk_starts = []
+        self.line_count = 0
+        self.length = 0
+        self.has_content = False
+
+    def get_lines(self, start, count):
+        if count <= 0 or start >= self.line_count:
+            return []
+        start = max(start, 0)
+
+        result = []
+        index = bisect_right(self.chunk_starts, start) - 1
+        offset = start - self.chunk_starts[index]
+        while index < len(self.chunks) and len(result) < count:
+            chunk = self.chunks[index]
+            result.extend(chunk[offset:offset + count - len(result)])
+            index += 1
+            offset = 0
+        return result
+
+    def iter_lines(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def text(self):
+        return "\n".join(self.iter_lines())
+
+    def stats(self):
+        # ウィジェットのget("1.0", END)で数えた場合と同じ値を返す
+        if not self.has_content:
+            return 0, 0
+        return self.line_count, self.length - (self.line_count - 1)
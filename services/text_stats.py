@@ -0,0 +1,45 @@
+import tkinter as tk
+
+
+def format_stats(lines, chars):
+    return f"行数: {lines}  文字数: {chars}"
+
+
+def count_widget_text(text_widget):
+    # Tk側で数えることで、全文をPythonの文字列へコピーしない
+    if not text_widget.search(r"\S", "1.0", tk.END, regexp=True):
+        return 0, 0
+
+    lines = int(text_widget.index("end-1c").split(".")[0])
+    result = text_widget.count("1.0", "end-1c", "chars")
+    if isinstance(result, tuple):
+        result = result[0]
+    total_chars = result or 0
+
+    return lines, total_chars - (lines - 1)  # 改行文字を除く
+
+
+class TextStats:
+    def __init__(self, text_widget, label, delay=150):
+        self.text_widget = text_widget
+        self.label = label
+        self.delay = delay
+        self._after_id = None
+
+    def schedule(self, event=None):
+        # 連続したキー入力では最後の入力から一定時間後に一度だけ数え直す
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+        self._after_id = self.text_widget.after(self.delay, self.refresh)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def refresh(self):
+        self._after_id = None
+        self.show(*count_widget_text(self.text_widget))
+
+    def show(self, lines, chars):
+        self.label.config(text=format_stats(lines, chars))
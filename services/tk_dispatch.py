@@ -0,0 +1,44 @@
+import queue
+
+
+class TkDispatcher:
+    def __init__(self, root, interval=50):
+        self.root = root
+        self.interval = interval
+        self.pending = 0
+        self._results = queue.SimpleQueue()
+        self._after_id = None
+
+    def submit(self, executor, func, *args, on_done=None, on_error=None):
+        # Tkは別スレッドから操作できないため、結果はキュー経由でメインスレッドに戻す
+        future = executor.submit(func, *args)
+        self.pending += 1
+        future.add_done_callback(lambda f: self._results.put((f, on_done, on_error)))
+        self._schedule()
+        return future
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval, self.poll)
+
+    def poll(self):
+        self._after_id = None
+        while True:
+            try:
+                future, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.pending -= 1
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(future.result())
+
+        # 処理中のジョブがなければポーリングを止める
+        if self.pending > 0:
+            self._schedule()
@@ -0,0 +1,87 @@
+import tkinter as tk
+from collections import OrderedDict
+
+
+def format_toast(message, count):
+    return message if count <= 1 else f"{message} ×{count}"
+
+
+class Toast:
+    def __init__(self, root, size="200x100"):
+        self.root = root
+        self.size = size
+        self.popup = None
+        self.label = None
+        self.message = None
+        self.count = 0
+        self.timeout = 0
+        self.pending = OrderedDict()
+        self._after_id = None
+
+    def build(self):
+        # 通知ごとにウィンドウを作らず、一度作ったものを表示・非表示で使い回す
+        self.popup = tk.Toplevel(self.root)
+        self.popup.title("通知")
+        self.popup.geometry(self.size)
+        self.popup.configure(bg="#f0f0f0")
+        self.popup.attributes("-topmost", True)
+        self.popup.protocol("WM_DELETE_WINDOW", self.hide)
+
+        self.label = tk.Label(self.popup, font=("MS Gothic", 12), bg="#f0f0f0", pady=20)
+        self.label.pack(expand=True, fill=tk.BOTH)
+
+    @property
+    def visible(self):
+        return self.message is not None
+
+    def show(self, message, timeout=2000, position=None):
+        if self.visible and message != self.message:
+            # 表示中と異なる通知は、同じ内容ごとにまとめて順に表示する（表示位置は最後に指定されたもの）
+            timeout_ms, count, queued_position = self.pending.pop(message, (timeout, 0, None))
+            self.pending[message] = (max(timeout_ms, timeout), count + 1, position or queued_position)
+            return
+
+        if self.popup is None:
+            self.build()
+        if position is not None:
+            self.popup.geometry(position)
+
+        if self.visible:
+            self.count += 1
+            if self.pending:
+                # 待っている通知がある間は、同じ通知が続いても表示時間を延ばさない
+                self.label.config(text=format_toast(self.message, self.count))
+                return
+        else:
+            self.message = message
+            self.count = 1
+            self.popup.deiconify()
+        self.timeout = timeout
+        self.render()
+
+    def render(self):
+        self.label.config(text=format_toast(self.message, self.count))
+        # 同じ通知が続いている間は、最後の通知から表示時間を数え直す
+        if self._after_id is not None:
+            self.popup.after_cancel(self._after_id)
+        self._after_id = self.popup.after(self.timeout, self.expire)
+
+    def expire(self):
+        self._after_id = None
+        if self.pending:
+            self.message, (self.timeout, self.count, position) = self.pending.popitem(last=False)
+            if position is not None:
+                self.popup.geometry(position)
+            self.render()
+            return
+        self.hide()
+
+    def hide(self):
+        if self._after_id is not None:
+            self.popup.after_cancel(self._after_id)
+            self._after_id = None
+        self.pending.clear()
+        self.message = None
+        self.count = 0
+        if self.popup is not None:
+            self.popup.withdraw()
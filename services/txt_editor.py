@@ -1,11 +1,11 @@
-import os
-import tempfile
 import tkinter as tk
-from datetime import datetime
 from tkinter import messagebox, scrolledtext
 
 import pyperclip
 
+from services.print_spooler import PrintSpooler
+from services.text_stats import TextStats
+from services.tk_dispatch import TkDispatcher
 from utils.config_manager import load_config
 
 
@@ -41,6 +41,15 @@ class TextEditor:
 
         self.stats_label = tk.Label(stats_frame, text="行数: 0  文字数: 0")
         self.stats_label.pack(side=tk.LEFT, padx=5, pady=5)
+        self.text_stats = TextStats(self.text_area, self.stats_label)
+
+        self.print_status_label = tk.Label(stats_frame, text="")
+        self.print_status_label.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        self.print_spooler = PrintSpooler(TkDispatcher(self.window),
+                                          self.config.get('Print', 'command', fallback=''),
+                                          on_status=self.show_print_status,
+                                          timeout=self.config.getint('Automation', 'helper_timeout_sec', fallback=60))
 
         button_frame = tk.Frame(self.window)
         button_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -64,21 +73,13 @@ class TextEditor:
                                  width=self.button_width, height=self.button_height)
         close_button.pack(side=tk.LEFT, padx=5)
 
-        self.text_area.bind("<KeyRelease>", self.update_stats)
+        self.text_area.bind("<KeyRelease>", self.text_stats.schedule)
         self.update_stats(None)
 
         self.window.protocol("WM_DELETE_WINDOW", self.close_window)
 
     def update_stats(self, event):
-        text = self.text_area.get("1.0", tk.END)
-        lines = text.count('\n')
-        chars = len(text) - lines  # 改行文字を除く
-
-        if text.strip() == "":
-            lines = 0
-            chars = 0
-
-        self.stats_label.config(text=f"行数: {lines}  文字数: {chars}")
+        self.text_stats.refresh()
 
     def paste_text(self):
         try:
@@ -103,21 +104,21 @@ class TextEditor:
                 messagebox.showinfo("情報", "印刷するテキストがありません。")
                 return
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_name = f"print_{timestamp}.txt"
-
-            temp_dir = tempfile.gettempdir()
-            temp_file = os.path.join(temp_dir, file_name)
-
-            with open(temp_file, "w", encoding="utf-8") as f:
-                f.write(text_content)
-
-            os.system(f'notepad /p "{temp_file}"')
+            # 印刷の完了を待たずに操作を続けられるよう、キューに追加するだけにする
+            self.print_spooler.submit(text_content)
 
         except Exception as e:
             messagebox.showerror("エラー", f"印刷中にエラーが発生しました: {e}")
 
+    def show_print_status(self, job, message):
+        try:
+            self.print_status_label.config(text=f"印刷 #{job.job_id}: {message}")
+        except tk.TclError:
+            # 印刷中に確認画面が閉じられた場合は表示しない
+            pass
+
     def close_window(self):
+        self.print_spooler.shutdown()
         if self.parent:
             self.window.destroy()
             self.parent.deiconify()
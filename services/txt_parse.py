@@ -1,10 +1,11 @@
 import json
-import os
 import re
-from collections import defaultdict
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
 from io import StringIO
 
+from services.text_decoding import iter_file_lines
+
 
 def convert_to_timestamp(date_str, time_str):
     try:
@@ -44,35 +45,42 @@ def process_record(current_record, content_buffer, records, new_record_data=None
     return ""
 
 
+SOAP_MAPPING = {
+    'S': 'subject',
+    'O': 'object',
+    'A': 'assessment',
+    'P': 'plan',
+    'F': 'comment',
+    'サ': 'summary'
+}
+
+
+def add_record_to_group(group, record):
+    soap_section = record['soap_section']
+    soap_field = SOAP_MAPPING.get(soap_section, f"{soap_section}")
+
+    if 'timestamp' not in group:
+        timestamp = convert_to_timestamp(record['date'], record['time'])
+        group['timestamp'] = timestamp
+        group['department'] = record['department']
+
+    content = record['content'].strip()
+    if soap_field in group:
+        existing_content = group[soap_field]
+        if content in existing_content:
+            return False
+        group[soap_field] += "\n" + content
+    else:
+        group[soap_field] = content
+    return True
+
+
 def group_records_by_datetime(records):
     grouped = defaultdict(dict)
 
     for record in records:
         key = (record['date'], record['department'], record['time'])
-
-        soap_section = record['soap_section']
-        soap_mapping = {
-            'S': 'subject',
-            'O': 'object',
-            'A': 'assessment',
-            'P': 'plan',
-            'F': 'comment',
-            'サ': 'summary'
-        }
-        soap_field = soap_mapping.get(soap_section, f"{soap_section}")
-
-        if 'timestamp' not in grouped[key]:
-            timestamp = convert_to_timestamp(record['date'], record['time'])
-            grouped[key]['timestamp'] = timestamp
-            grouped[key]['department'] = record['department']
-
-        content = record['content'].strip()
-        if soap_field in grouped[key]:
-            existing_content = grouped[key][soap_field]
-            if content not in existing_content:
-                grouped[key][soap_field] += "\n" + content
-        else:
-            grouped[key][soap_field] = content
+        add_record_to_group(grouped[key], record)
 
     result = list(grouped.values())
 
@@ -95,26 +103,76 @@ def remove_duplicates(records):
     return unique_records
 
 
-def parse_medical_text(text):
+GROUP_KEY_FIELDS = ('timestamp', 'department')
+
+
+def record_sort_key(record):
+    return record.get('timestamp') or ''
+
+
+def merge_sections(current, record):
+    changed = False
+    for field, content in record.items():
+        if field in GROUP_KEY_FIELDS:
+            continue
+        existing_content = current.get(field)
+        if existing_content is None:
+            current[field] = content
+        elif content in existing_content:
+            continue
+        elif existing_content in content:
+            # 新しい書き出しの方が追記されている場合は置き換える
+            current[field] = content
+        else:
+            current[field] = existing_content + "\n" + content
+        changed = True
+    return changed
+
+
+def merge_records(existing, new_records):
+    # existingは変換済みの結果（時刻順）。追加分ごとに二分探索で位置を探してその場で更新するため、
+    # 処理量は既存の件数ではなく追加分の件数に比例する
+    added = updated = 0
+    for record in new_records:
+        timestamp = record_sort_key(record)
+        start = bisect_left(existing, timestamp, key=record_sort_key)
+        end = bisect_right(existing, timestamp, lo=start, key=record_sort_key)
+        for current in existing[start:end]:
+            if current.get('department') == record.get('department'):
+                if merge_sections(current, record):
+                    updated += 1
+                break
+        else:
+            existing.insert(end, dict(record))
+            added += 1
+    return added, updated
+
+
+DATE_PATTERN = re.compile(r"(\d{4}/\d{2}/\d{2}\(.?\))(?:\s*（入院\s*(\d+)\s*日目）)?")
+ENTRY_PATTERN = re.compile(r"(.+?)\s+(.+?)\s+(.+?)\s+(\d{2}:\d{2})")
+SOAP_PATTERN = re.compile(r"([SOAPFサ])\s*>")
+
+
+def iter_record_blocks(lines, on_line_skipped=None):
+    # 日付行が現れるたびに、それまでに確定したレコードをまとめて返す
     records = []
     current_record = {}
     content_buffer = ""
 
-    date_pattern = re.compile(r"(\d{4}/\d{2}/\d{2}\(.?\))(?:\s*（入院\s*(\d+)\s*日目）)?")
-    entry_pattern = re.compile(r"(.+?)\s+(.+?)\s+(.+?)\s+(\d{2}:\d{2})")
-    soap_pattern = re.compile(r"([SOAPFサ])\s*>")
-
-    for line in StringIO(text):
+    for line in lines:
         line = line.strip()
         if not line:
             continue
 
-        date_match = date_pattern.match(line)
+        date_match = DATE_PATTERN.match(line)
         if date_match:
             content_buffer = process_record(current_record, content_buffer, records, {'date': date_match.group(1)})
+            if records:
+                yield records
+                records = []
             continue
 
-        entry_match = entry_pattern.match(line)
+        entry_match = ENTRY_PATTERN.match(line)
         if entry_match and current_record.get('date'):
             content_buffer = process_record(current_record, content_buffer, records, {
                 'department': entry_match.group(1).strip(),
@@ -122,7 +180,7 @@ def parse_medical_text(text):
             })
             continue
 
-        soap_match = soap_pattern.match(line)
+        soap_match = SOAP_PATTERN.match(line)
         if soap_match and current_record.get('department'):
             content_buffer = process_record(current_record, content_buffer, records,
                                             {'soap_section': soap_match.group(1)})
@@ -130,11 +188,19 @@ def parse_medical_text(text):
 
         if current_record.get('soap_section'):
             content_buffer += line + "\n"
+        elif on_line_skipped is not None:
+            # 日付・診療科・SOAPのいずれにも属さず、変換されない行
+            on_line_skipped(line)
 
     process_record(current_record, content_buffer, records)
+    if records:
+        yield records
+
 
+def remove_duplicate_entries(records, seen_keys=None, on_record=None):
     unique_records = []
-    seen_keys = set()
+    if seen_keys is None:
+        seen_keys = set()
 
     for record in records:
         key = (record['date'], record['department'], record['time'], record['soap_section'], record['content'])
@@ -142,9 +208,63 @@ def parse_medical_text(text):
         if key not in seen_keys:
             seen_keys.add(key)
             unique_records.append(record)
+            if on_record is not None:
+                on_record(record)
+
+    return unique_records
+
+
+def parse_medical_text(text, on_record=None, on_group=None, on_line_skipped=None):
+    return parse_medical_lines(StringIO(text), on_record, on_group, on_line_skipped)
+
+
+def parse_medical_file(path, encoding=None, on_record=None, on_group=None, on_line_skipped=None):
+    # ファイル全体を読み込まず、文字コードを判定しながら少しずつ読み進める
+    return parse_medical_lines(iter_file_lines(path, encoding), on_record, on_group, on_line_skipped)
+
+
+def parse_medical_lines(lines, on_record=None, on_group=None, on_line_skipped=None):
+    # on_recordは日付ごとに確定した記録（重複除外後）を、読み進めながら順に受け取る
+    seen_keys = set()
+    unique_records = []
+    for block in iter_record_blocks(lines, on_line_skipped):
+        unique_records.extend(remove_duplicate_entries(block, seen_keys, on_record))
 
     grouped_records = group_records_by_datetime(unique_records)
 
     final_records = remove_duplicates(grouped_records)
 
+    # 同じ日時の記録が後から追加されることがあるため、on_groupは並べ替え後の確定した順で通知する
+    if on_group is not None:
+        for group in final_records:
+            on_group(group)
+
     return final_records
+
+
+def iter_medical_records(lines, max_seen=10000):
+    # 日付ごとに確定した記録から順に返す。直近max_seen件の出力済みの記録は覚えておき、
+    # 後の日付ブロックに同じ日時・診療科の記録が現れた場合はそこへまとめる
+    emitted = OrderedDict()
+
+    for block in iter_record_blocks(lines):
+        updated = {}
+        for record in block:
+            key = (record['date'], record['department'], record['time'])
+            group = updated.get(key)
+            if group is None:
+                group = dict(emitted.get(key, {}))
+                if not add_record_to_group(group, record):
+                    # 出力済みの記録に含まれる記載（期間の重なるコピー）は除外する
+                    continue
+                updated[key] = group
+            else:
+                add_record_to_group(group, record)
+
+        for key, group in sorted(updated.items(), key=lambda item: item[1]['timestamp'] or ''):
+            # 出力済みの記録に記載が加わった場合は、まとめ直した記録を改めて返す（後の行が優先）
+            emitted[key] = group
+            emitted.move_to_end(key)
+            if len(emitted) > max_seen:
+                emitted.popitem(last=False)
+            yield group
@@ -0,0 +1,73 @@
+import tkinter as tk
+
+
+class VirtualTextView:
+    def __init__(self, text_widget, document, window_lines=200):
+        self.text_widget = text_widget
+        self.document = document
+        self.window_lines = max(1, window_lines)
+        self.first_line = 0
+        self.follow_tail = True
+        self.active = False
+
+    def activate(self):
+        self.active = True
+        self.follow_tail = True
+        # ウィジェット自身のスクロールを切り離し、スクロールバーで文書上の位置を操作する
+        self.text_widget.config(yscrollcommand=lambda *args: None)
+        self.text_widget.vbar.config(command=self.on_scroll)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text_widget.bind(sequence, self.on_mouse_wheel)
+        self.refresh()
+
+    def deactivate(self):
+        self.active = False
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text_widget.unbind(sequence)
+        self.text_widget.vbar.config(command=self.text_widget.yview)
+        self.text_widget.config(yscrollcommand=self.text_widget.vbar.set, state=tk.NORMAL)
+
+    def max_first_line(self):
+        return max(0, self.document.line_count - self.window_lines)
+
+    def scroll_to(self, first_line):
+        self.first_line = min(max(first_line, 0), self.max_first_line())
+        self.follow_tail = self.first_line == self.max_first_line()
+        self.render()
+
+    def refresh(self):
+        # 末尾表示中であれば追記分に追従する
+        if self.follow_tail:
+            self.first_line = self.max_first_line()
+        self.render()
+
+    def render(self):
+        lines = self.document.get_lines(self.first_line, self.window_lines)
+
+        self.text_widget.config(state=tk.NORMAL)
+        self.text_widget.delete("1.0", tk.END)
+        self.text_widget.insert(tk.END, "\n".join(lines))
+        self.text_widget.config(state=tk.DISABLED)
+
+        total = self.document.line_count
+        if total:
+            self.text_widget.vbar.set(self.first_line / total, (self.first_line + len(lines)) / total)
+        else:
+            self.text_widget.vbar.set(0.0, 1.0)
+
+    def on_scroll(self, action, value, unit=None):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(value) * self.document.line_count))
+        elif action == tk.SCROLL:
+            step = self.window_lines if unit == tk.PAGES else 1
+            self.scroll_to(self.first_line + int(value) * step)
+
+    def on_mouse_wheel(self, event):
+        if getattr(event, 'num', None) == 4:
+            delta = -3
+        elif getattr(event, 'num', None) == 5:
+            delta = 3
+        else:
+            delta = -3 if event.delta > 0 else 3
+        self.scroll_to(self.first_line + delta)
+        return "break"
@@ -0,0 +1,17 @@
+import argparse
+import sys
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="補助プログラムの代わりに使うテスト用スクリプト")
+    parser.add_argument("--sleep", type=float, default=0.0)
+    parser.add_argument("--exit-code", type=int, default=0)
+    args = parser.parse_args()
+
+    time.sleep(args.sleep)
+    sys.exit(args.exit_code)
+
+
+if __name__ == "__main__":
+    main()
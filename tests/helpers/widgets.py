@@ -0,0 +1,6 @@
+def set_widget_text(mock_widget, text):
+    """Tk側での集計(search/index/count)がtextの内容を返すよう設定"""
+    content = text[:-1] if text.endswith("\n") else text
+    mock_widget.search.return_value = "1.0" if content.strip() else ""
+    mock_widget.index.return_value = f"{content.count(chr(10)) + 1}.0"
+    mock_widget.count.return_value = (len(content),)
@@ -0,0 +1,163 @@
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from services.automation_runner import AutomationRunner, HelperResult, LatencyHistogram, run_helper
+
+HELPER = os.path.join(os.path.dirname(__file__), "helpers", "stand_in_helper.py")
+
+
+def helper_command(*args):
+    return [sys.executable, HELPER, *args]
+
+
+class ImmediateDispatcher:
+    """ワーカースレッドの完了を待ってからコールバックを呼ぶテスト用ディスパッチャ"""
+
+    def submit(self, executor, func, *args, on_done=None, on_error=None):
+        future = executor.submit(func, *args)
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+        else:
+            if on_done:
+                on_done(result)
+        return future
+
+
+class TestRunHelper:
+    """補助プログラム実行のテスト"""
+
+    def test_success(self):
+        """正常終了のテスト"""
+        result = run_helper("soap_copy", helper_command(), timeout=10)
+
+        assert result.ok
+        assert result.returncode == 0
+        assert result.name == "soap_copy"
+        assert result.elapsed >= 0
+
+    def test_non_zero_exit(self):
+        """異常終了のテスト"""
+        result = run_helper("soap_copy", helper_command("--exit-code", "3"), timeout=10)
+
+        assert not result.ok
+        assert result.returncode == 3
+        assert result.describe() == "終了コード 3"
+
+    def test_timeout_kills_process(self):
+        """タイムアウト時に強制終了するテスト"""
+        start = time.perf_counter()
+        result = run_helper("mouse_operation", helper_command("--sleep", "30"), timeout=0.5)
+
+        assert time.perf_counter() - start < 10
+        assert result.timed_out
+        assert not result.ok
+        assert "強制終了" in result.describe()
+
+    def test_missing_executable(self):
+        """実行ファイルが存在しない場合のテスト"""
+        with pytest.raises(OSError):
+            run_helper("soap_copy", [os.path.join(os.path.dirname(HELPER), "missing.exe")], timeout=1)
+
+
+class TestLatencyHistogram:
+    """所要時間ヒストグラムのテスト"""
+
+    def test_observe(self):
+        """バケットへの振り分けのテスト"""
+        histogram = LatencyHistogram()
+        histogram.observe(0.1)
+        histogram.observe(1.5)
+        histogram.observe(120)
+
+        assert histogram.count == 3
+        assert histogram.total == pytest.approx(121.6)
+        assert histogram.counts[0] == 1
+        assert histogram.counts[LatencyHistogram.BUCKETS.index(2)] == 1
+        assert histogram.counts[-1] == 1
+
+
+class TestAutomationRunner:
+    """AutomationRunnerのテスト"""
+
+    def test_submit_records_latency(self):
+        """完了時に所要時間を記録するテスト"""
+        runner = AutomationRunner(ImmediateDispatcher(), timeout=10)
+        on_done = Mock()
+
+        runner.submit("soap_copy", helper_command(), on_done=on_done)
+
+        result = on_done.call_args[0][0]
+        assert isinstance(result, HelperResult)
+        assert result.ok
+        assert runner.histograms["soap_copy"].count == 1
+        runner.shutdown()
+
+    def test_submit_uses_default_timeout(self):
+        """既定のタイムアウトを使うテスト"""
+        runner = AutomationRunner(ImmediateDispatcher(), timeout=0.5)
+        on_done = Mock()
+
+        runner.submit("mouse_operation", helper_command("--sleep", "30"), on_done=on_done)
+
+        result = on_done.call_args[0][0]
+        assert result.timed_out
+        assert result.timeout == 0.5
+        runner.shutdown()
+
+    def test_submit_explicit_zero_timeout(self):
+        """0を指定した場合は既定値ではなくタイムアウトなしで実行するテスト"""
+        runner = AutomationRunner(ImmediateDispatcher(), timeout=0.01)
+        on_done = Mock()
+
+        runner.submit("soap_copy", helper_command("--sleep", "0.3"), on_done=on_done, timeout=0)
+
+        result = on_done.call_args[0][0]
+        assert result.ok
+        assert not result.timed_out
+        runner.shutdown()
+
+    def test_submit_error(self):
+        """起動失敗時にon_errorを呼ぶテスト"""
+        runner = AutomationRunner(ImmediateDispatcher(), timeout=1)
+        on_error = Mock()
+
+        runner.submit("soap_copy", ["/nonexistent/helper.exe"], on_error=on_error)
+
+        assert isinstance(on_error.call_args[0][0], OSError)
+        assert "soap_copy" not in runner.histograms
+        runner.shutdown()
+
+    def test_requests_run_one_at_a_time(self):
+        """重なった要求が順番に実行されるテスト"""
+        runner = AutomationRunner(ImmediateDispatcher(), timeout=10)
+
+        running = []
+        overlap = []
+        lock = threading.Lock()
+
+        def fake_run(name, command, timeout):
+            with lock:
+                running.append(name)
+                overlap.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(name)
+
+        futures = [runner.executor.submit(fake_run, f"job{i}", [], 1) for i in range(3)]
+        for future in futures:
+            future.result()
+
+        assert max(overlap) == 1
+        runner.shutdown()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,243 @@
+from unittest.mock import Mock
+
+import pytest
+
+from services.automation_runner import HelperResult
+from services.capture_pipeline import CapturePipeline, PipelineJob, timed_call
+from services.clipboard_backend import MemoryClipboardBackend
+
+
+class FakeRunner:
+    """補助プログラムの完了をテスト側で指示するランナー"""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, name, command, on_done=None, on_error=None):
+        self.calls.append((name, command, on_done, on_error))
+
+    def finish(self, returncode=0, elapsed=0.1):
+        name, _, on_done, _ = self.calls[-1]
+        on_done(HelperResult(name, returncode, elapsed))
+
+
+class FakeDispatcher:
+    """変換の完了をテスト側で指示するディスパッチャ"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, executor, func, *args, on_done=None, on_error=None):
+        self.jobs.append((func, args, on_done, on_error))
+
+    def finish(self, index=0):
+        func, args, on_done, on_error = self.jobs.pop(index)
+        try:
+            result = func(*args)
+        except Exception as e:
+            on_error(e)
+        else:
+            on_done(result)
+
+
+def fake_parse(text):
+    return [{"text": text}], f'["{text}"]'
+
+
+@pytest.fixture
+def pipeline_parts():
+    runner = FakeRunner()
+    dispatcher = FakeDispatcher()
+    clipboard = MemoryClipboardBackend()
+    callbacks = Mock()
+    pipeline = CapturePipeline(runner, dispatcher, Mock(), clipboard,
+                               lambda operation: [f"{operation or 'mouse'}.exe"], fake_parse,
+                               on_captured=callbacks.captured, on_finished=callbacks.finished,
+                               on_error=callbacks.error)
+    return pipeline, runner, dispatcher, clipboard, callbacks
+
+
+def run_helpers(runner, clipboard, text):
+    runner.finish()
+    clipboard.copy(text)
+    runner.finish()
+
+
+class TestTimedCall:
+    """timed_call関数のテスト"""
+
+    def test_returns_elapsed_and_result(self):
+        """所要時間と結果を返すテスト"""
+        elapsed, result = timed_call(lambda x: x * 2, 3)
+
+        assert result == 6
+        assert elapsed >= 0
+
+
+class TestPipelineJob:
+    """PipelineJobのテスト"""
+
+    def test_describe(self):
+        """段階ごとの所要時間表示のテスト"""
+        job = PipelineJob(0)
+        job.timings = {"soap_copy": 1.5, "parse": 0.25}
+
+        assert job.describe() == "カルテコピー 1.50秒 / 変換 0.25秒（合計 1.75秒）"
+
+
+class TestCapturePipeline:
+    """CapturePipelineのテスト"""
+
+    def test_full_run(self, pipeline_parts):
+        """1件の一括変換のテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+
+        job = pipeline.start()
+        assert runner.calls[0][:2] == ("mouse_operation", ["mouse.exe"])
+
+        run_helpers(runner, clipboard, "カルテ本文")
+        assert runner.calls[1][:2] == ("soap_copy", ["soap_copy.exe"])
+        callbacks.captured.assert_called_once_with(job)
+        assert job.text == "カルテ本文"
+
+        dispatcher.finish()
+
+        callbacks.finished.assert_called_once_with(job)
+        assert clipboard.paste() == '["カルテ本文"]'
+        assert job.parsed_data == [{"text": "カルテ本文"}]
+        assert set(job.timings) == {"mouse_operation", "soap_copy", "capture", "parse", "copy"}
+        assert pipeline.histograms["parse"].count == 1
+        assert not pipeline.busy
+
+    def test_parse_overlaps_next_helpers(self, pipeline_parts):
+        """変換中に次の患者の補助プログラムが始まるテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+
+        pipeline.start()
+        second = pipeline.start()
+        assert len(runner.calls) == 1
+
+        run_helpers(runner, clipboard, "患者1")
+
+        # 1件目の変換が終わる前に2件目の詳細検索設定が始まる
+        assert len(dispatcher.jobs) == 1
+        assert runner.calls[-1][0] == "mouse_operation"
+        assert pipeline.helper_job is second
+
+    def test_copy_deferred_while_helper_running(self, pipeline_parts):
+        """補助プログラム実行中はコピーを保留するテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+
+        first = pipeline.start()
+        pipeline.start()
+        run_helpers(runner, clipboard, "患者1")
+
+        dispatcher.finish()
+        callbacks.finished.assert_not_called()
+        assert clipboard.paste() == "患者1"
+
+        run_helpers(runner, clipboard, "患者2")
+
+        callbacks.finished.assert_called_once_with(first)
+        assert clipboard.paste() == '["患者1"]'
+
+        dispatcher.finish()
+        assert clipboard.paste() == '["患者2"]'
+        assert callbacks.finished.call_count == 2
+
+    def test_helper_failure(self, pipeline_parts):
+        """補助プログラム異常終了のテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+
+        job = pipeline.start()
+        runner.finish(returncode=1)
+
+        callbacks.error.assert_called_once_with(job, "詳細検索設定", "終了コード 1")
+        assert len(runner.calls) == 1
+        assert not pipeline.busy
+
+    def test_helper_failure_starts_next_job(self, pipeline_parts):
+        """失敗した場合も次の患者に進むテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+
+        pipeline.start()
+        second = pipeline.start()
+        runner.finish(returncode=1)
+
+        assert pipeline.helper_job is second
+        assert runner.calls[-1][0] == "mouse_operation"
+
+    def test_command_not_found(self, pipeline_parts):
+        """実行ファイル未発見のテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+        pipeline.get_command = lambda operation: None
+
+        job = pipeline.start()
+
+        callbacks.error.assert_called_once_with(job, "詳細検索設定", "詳細検索設定の実行ファイルが見つかりません")
+        assert runner.calls == []
+
+    def test_empty_capture(self, pipeline_parts):
+        """取り込み内容が空の場合のテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+
+        job = pipeline.start()
+        run_helpers(runner, clipboard, "  ")
+
+        callbacks.error.assert_called_once_with(job, "取り込み", "クリップボードにテキストがありません")
+        assert dispatcher.jobs == []
+
+    def test_parse_failure(self, pipeline_parts):
+        """変換エラーのテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+        error = ValueError("解析エラー")
+        pipeline.parse = Mock(side_effect=error)
+
+        job = pipeline.start()
+        run_helpers(runner, clipboard, "カルテ本文")
+        dispatcher.finish()
+
+        callbacks.error.assert_called_once_with(job, "変換", error)
+        callbacks.finished.assert_not_called()
+        assert not pipeline.busy
+
+
+    def test_stale_clipboard_cleared(self, pipeline_parts):
+        """カルテのコピーで更新されなかった前の内容を取り込まないテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+        clipboard.copy("前の患者")
+
+        job = pipeline.start()
+        runner.finish()
+        runner.finish()
+
+        callbacks.error.assert_called_once_with(job, "取り込み", "クリップボードにテキストがありません")
+        assert dispatcher.jobs == []
+
+    def test_clipboard_sequence_unchanged(self, pipeline_parts):
+        """更新回数が変わらない場合に取り込みを失敗とするテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+        pipeline.sequence_source = Mock(return_value=5)
+        clipboard.copy("前の患者")
+
+        job = pipeline.start()
+        runner.finish()
+        runner.finish()
+
+        callbacks.error.assert_called_once_with(job, "取り込み", "カルテのコピーでクリップボードが更新されませんでした")
+        assert clipboard.paste() == "前の患者"
+
+    def test_clipboard_sequence_changed(self, pipeline_parts):
+        """更新回数が変わった場合に取り込むテスト"""
+        pipeline, runner, dispatcher, clipboard, callbacks = pipeline_parts
+        pipeline.sequence_source = Mock(side_effect=[5, 6])
+
+        job = pipeline.start()
+        run_helpers(runner, clipboard, "カルテ本文")
+
+        callbacks.captured.assert_called_once_with(job)
+        assert job.text == "カルテ本文"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
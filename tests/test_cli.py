@@ -0,0 +1,291 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from benchmarks.startup import parse_importtime
+from cli import main
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_TEXT = """2024/05/26(日)
+内科 田中医師 外来 14:30
+S>
+頭痛があります
+O>
+血圧 120/80
+"""
+
+
+def loaded_modules(statement):
+    code = f"import sys; {statement}; print(','.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR,
+                            capture_output=True, text=True, check=True)
+    return set(result.stdout.strip().split(","))
+
+
+class TestImportIsolation:
+    """GUIに依存しない読み込みのテスト"""
+
+    def test_txt_parse_without_gui(self):
+        """変換処理の読み込みでGUI関連を読み込まないテスト"""
+        modules = loaded_modules("import services.txt_parse")
+
+        assert "tkinter" not in modules
+        assert "pyperclip" not in modules
+
+    def test_cli_without_gui(self):
+        """CLIの読み込みでGUI関連を読み込まないテスト"""
+        modules = loaded_modules("import cli")
+
+        assert "tkinter" not in modules
+        assert "pyperclip" not in modules
+
+    def test_main_defers_editor_and_automation(self):
+        """GUIの起動時に確認画面と自動化処理を読み込まないテスト"""
+        modules = loaded_modules("import main")
+
+        assert "services.txt_editor" not in modules
+        assert "services.mouse_automation" not in modules
+        assert "pyperclip" not in modules
+
+
+class TestCli:
+    """CLIのテスト"""
+
+    def test_convert_file(self, tmp_path, capsys):
+        """ファイルを変換し標準出力に書き出すテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT, encoding="utf-8")
+
+        assert main([str(input_path)]) == 0
+
+        result = json.loads(capsys.readouterr().out)
+        assert result[0]["subject"] == "頭痛があります"
+        assert result[0]["timestamp"] == "2024-05-26T14:30:00Z"
+
+    def test_convert_stdin_to_file(self, tmp_path):
+        """標準入力を変換しファイルに書き出すテスト"""
+        output_path = tmp_path / "karte.json"
+
+        with patch("sys.stdin", io.StringIO(SAMPLE_TEXT)):
+            assert main(["-", "--format", "json", "-o", str(output_path)]) == 0
+
+        result = json.loads(output_path.read_text(encoding="utf-8"))
+        assert result[0]["object"] == "血圧 120/80"
+
+    def test_encoding(self, tmp_path, capsys):
+        """文字コード指定のテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_bytes(SAMPLE_TEXT.encode("cp932"))
+
+        assert main([str(input_path), "--encoding", "cp932"]) == 0
+        assert "頭痛があります" in capsys.readouterr().out
+
+    def test_detect_encoding(self, tmp_path, capsys):
+        """文字コードを自動判定するテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_bytes(SAMPLE_TEXT.encode("cp932"))
+
+        assert main([str(input_path)]) == 0
+        assert json.loads(capsys.readouterr().out)[0]["subject"] == "頭痛があります"
+
+    def test_detect_encoding_stdin(self, capsys):
+        """標準入力の文字コードを自動判定するテスト"""
+        stdin = Mock()
+        stdin.buffer = io.BytesIO(SAMPLE_TEXT.encode("cp932"))
+
+        with patch("sys.stdin", stdin):
+            assert main(["-"]) == 0
+
+        assert json.loads(capsys.readouterr().out.splitlines()[0])["subject"] == "頭痛があります"
+
+    def test_stream_stdin_jsonl(self, capsys):
+        """標準入力をJSONLで書き出すテスト"""
+        text = SAMPLE_TEXT + "2024/05/27(月)\n外科 佐藤医師 病棟 09:00\nP>\n経過観察\n"
+
+        with patch("sys.stdin", io.StringIO(text)):
+            assert main(["-"]) == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])["subject"] == "頭痛があります"
+        assert json.loads(lines[1])["plan"] == "経過観察"
+
+    def test_stream_file_jsonl(self, tmp_path):
+        """ファイルをJSONLで書き出すテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT + SAMPLE_TEXT, encoding="utf-8")
+        output_path = tmp_path / "karte.jsonl"
+
+        assert main([str(input_path), "--format", "jsonl", "-o", str(output_path)]) == 0
+
+        # 同じ日付ブロックの重複は1件にまとめる
+        lines = output_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+
+    def test_stream_before_end_of_input(self):
+        """入力の終了を待たずに確定した記録を書き出すテスト"""
+        process = subprocess.Popen([sys.executable, "cli.py", "-"], cwd=ROOT_DIR, stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, text=True, encoding="utf-8")
+        try:
+            process.stdin.write(SAMPLE_TEXT + "2024/05/27(月)\n")
+            process.stdin.flush()
+
+            # 次の日付行で前の日付の記録が確定する
+            first_line = process.stdout.readline()
+            assert json.loads(first_line)["subject"] == "頭痛があります"
+
+            process.stdin.close()
+            assert process.wait(timeout=10) == 0
+        finally:
+            process.kill()
+            process.stdout.close()
+
+    def test_memory_report(self, tmp_path, capsys):
+        """メモリ使用量を表示するテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT, encoding="utf-8")
+
+        assert main([str(input_path), "--memory"]) == 0
+
+        err = capsys.readouterr().err
+        assert "メモリ 変換: 最大" in err
+        assert "メモリ JSON化: 最大" in err
+
+    def test_memory_budget_exceeded(self, tmp_path, capsys):
+        """メモリ使用量の上限を超えた場合のテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT, encoding="utf-8")
+        output_path = tmp_path / "karte.json"
+        output_path.write_text("[]", encoding="utf-8")
+
+        assert main([str(input_path), "--memory-budget-mb", "0.001", "-o", str(output_path)]) == 1
+
+        assert "メモリ使用量が上限を超えたため中止しました" in capsys.readouterr().err
+        # 以前の出力はそのまま残し、書きかけの一時ファイルも残さない
+        assert output_path.read_text(encoding="utf-8") == "[]"
+        assert sorted(os.listdir(tmp_path)) == ["karte.json", "karte.txt"]
+
+    def test_memory_budget_exceeded_new_output(self, tmp_path, capsys):
+        """中止した場合は新しい出力ファイルを作らないテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT, encoding="utf-8")
+        output_path = tmp_path / "karte.jsonl"
+
+        assert main([str(input_path), "--format", "jsonl", "--memory-budget-mb", "0.001", "-o", str(output_path)]) == 1
+
+        assert not output_path.exists()
+        assert os.listdir(tmp_path) == ["karte.txt"]
+
+    def test_merge_into_existing(self, tmp_path, capsys):
+        """期間の重なる書き出しを既存のJSONに統合するテスト"""
+        existing_path = tmp_path / "karte.json"
+        existing_path.write_text(json.dumps([
+            {"timestamp": "2024-05-25T09:00:00Z", "department": "外科", "plan": "経過観察"},
+            {"timestamp": "2024-05-26T14:30:00Z", "department": "内科", "subject": "頭痛があります"},
+        ], ensure_ascii=False), encoding="utf-8")
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT, encoding="utf-8")
+
+        # 出力先に統合元と同じファイルを指定できる
+        assert main([str(input_path), "--merge", str(existing_path), "-o", str(existing_path)]) == 0
+
+        result = json.loads(existing_path.read_text(encoding="utf-8"))
+        assert [record["department"] for record in result] == ["外科", "内科"]
+        assert result[1]["subject"] == "頭痛があります"
+        assert result[1]["object"] == "血圧 120/80"
+        assert "追加 0件 / 更新 1件（合計 2件）" in capsys.readouterr().err
+
+    def test_merge_requires_json(self, tmp_path, capsys):
+        """統合はjson形式でのみ指定できるテスト"""
+        existing_path = tmp_path / "karte.json"
+        existing_path.write_text("[]", encoding="utf-8")
+
+        assert main(["-", "--format", "jsonl", "--merge", str(existing_path)]) == 1
+        assert "json形式の出力でのみ指定できます" in capsys.readouterr().err
+
+    def test_merge_invalid_existing(self, tmp_path, capsys):
+        """統合先のJSONが不正な場合のテスト"""
+        existing_path = tmp_path / "karte.json"
+        existing_path.write_text("{}", encoding="utf-8")
+
+        assert main(["-", "--merge", str(existing_path)]) == 1
+        assert "エラー: 統合先のJSONを読み込めません" in capsys.readouterr().err
+
+    def test_update_output(self, tmp_path, capsys):
+        """既存のJSONLに新しい記録だけを反映するテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT, encoding="utf-8")
+        output_path = tmp_path / "karte.jsonl"
+
+        assert main([str(input_path), "--update", "-o", str(output_path)]) == 0
+        input_path.write_text(SAMPLE_TEXT + "2024/05/27(月)\n外科 山田医師 外来 09:00\nP>\n経過観察\n",
+                              encoding="utf-8")
+        assert main([str(input_path), "--update", "-o", str(output_path)]) == 0
+
+        lines = output_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["department"] for line in lines] == ["内科", "外科"]
+        assert "追加 1件 / 更新 0件" in capsys.readouterr().err
+
+    def test_update_corrupted_output(self, tmp_path, capsys):
+        """更新先のJSONLが壊れている場合のテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT, encoding="utf-8")
+        output_path = tmp_path / "karte.jsonl"
+        output_path.write_text("壊れた行\n", encoding="utf-8")
+
+        assert main([str(input_path), "--update", "-o", str(output_path)]) == 1
+        assert "1行目を読み込めません" in capsys.readouterr().err
+
+    def test_update_requires_output(self, capsys):
+        """更新出力には出力先が必要なテスト"""
+        assert main(["-", "--update"]) == 1
+        assert "--updateには出力先のJSONLファイル（-o）を指定してください" in capsys.readouterr().err
+
+    def test_shard_merges_groups(self, tmp_path):
+        """分割出力で同じ日時・診療科の記録を1行にまとめるテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(SAMPLE_TEXT + "2024/05/27(月)\n外科 山田医師 外来 09:00\nP>\n経過観察\n" + SAMPLE_TEXT,
+                              encoding="utf-8")
+        input_path.write_text(input_path.read_text(encoding="utf-8") + "S>\n吐き気\n", encoding="utf-8")
+        output_dir = tmp_path / "out"
+
+        assert main([str(input_path), "--shard-by", "month,department", "-o", str(output_dir)]) == 0
+
+        lines = (output_dir / "2024-05" / "内科.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["subject"] == "頭痛があります\n吐き気"
+
+    def test_file_not_found(self, tmp_path, capsys):
+        """入力ファイル未発見のテスト"""
+        missing = tmp_path / "missing.txt"
+
+        assert main([str(missing)]) == 1
+        assert f"エラー: ファイルが見つかりません: {missing}" in capsys.readouterr().err
+
+
+class TestStartupBenchmark:
+    """起動時間計測のテスト"""
+
+    def test_parse_importtime(self):
+        """-X importtimeの出力解析のテスト"""
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        450 |   services.txt_parse\n"
+                  "import time:        80 |       1530 | cli\n")
+
+        assert parse_importtime(stderr, "cli") == 1530
+        assert parse_importtime(stderr, "services.txt_parse") == 450
+
+    def test_parse_importtime_missing(self):
+        """対象モジュールがない場合のテスト"""
+        with pytest.raises(ValueError):
+            parse_importtime("import time: 1 | 1 | os\n", "cli")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+import pytest
+
+from services.clip_history import ClipHistory, split_chunks
+
+
+def make_day(day):
+    """1日分のカルテ記載を作成"""
+    return "\n".join([
+        f"2024/05/{day:02d}(月)",
+        f"内科 医師 外来 {day % 24:02d}:30",
+        "S >", f"頭痛{day}", "続いている",
+        "O >", f"血圧{100 + day}/80", f"体温36.{day % 10}",
+        "A >", "経過観察",
+        "P >", f"処方{day}",
+    ])
+
+
+def make_days(first, last):
+    return "\n".join(make_day(day) for day in range(first, last + 1))
+
+
+class TestSplitChunks:
+    """内容に基づくチャンク分割のテスト"""
+
+    def test_chunks_cover_all_lines(self):
+        """チャンクが全行を隙間なく覆うテスト"""
+        lines = make_days(1, 5).split("\n")
+
+        chunks = split_chunks(lines)
+
+        assert chunks[0][0] == 0
+        assert chunks[-1][1] == len(lines)
+        assert all(end == next_start for (_, end), (next_start, _) in zip(chunks, chunks[1:]))
+
+    def test_boundaries_independent_of_start(self):
+        """開始位置が異なっても同じ内容は同じ位置で区切られるテスト"""
+        lines = make_days(1, 8).split("\n")
+        offset = 12 * 3
+
+        full_cuts = {end for _, end in split_chunks(lines)}
+        partial_cuts = {end + offset for _, end in split_chunks(lines[offset:])}
+
+        # 先頭のウィンドウ分を過ぎれば区切り位置は一致する
+        assert {cut for cut in full_cuts if cut > offset + 4} <= partial_cuts
+
+
+class TestClipHistory:
+    """クリップボード履歴による重複除外のテスト"""
+
+    def test_new_clip_passes(self):
+        """新しい内容はそのまま通るテスト"""
+        history = ClipHistory()
+
+        assert history.filter("カルテ") == "カルテ"
+        assert history.dropped_count == 0
+
+    def test_exact_repeat_dropped(self):
+        """同一内容の再コピーが除外されるテスト"""
+        history = ClipHistory()
+        history.filter(make_days(1, 3))
+
+        assert history.filter(make_days(1, 3)) is None
+        assert history.dropped_count == 1
+
+    def test_repeat_with_whitespace_differences_dropped(self):
+        """前後の空白だけが異なる再コピーが除外されるテスト"""
+        history = ClipHistory()
+        history.filter("行1\n行2")
+
+        assert history.filter("行1  \r\n  行2") is None
+
+    def test_contained_clip_dropped(self):
+        """取り込み済み内容の一部の再コピーが除外されるテスト"""
+        history = ClipHistory()
+        history.filter(make_days(1, 6))
+
+        assert history.filter(make_days(3, 4)) is None
+
+    def test_overlapping_clip_trimmed(self):
+        """直前のコピーと重なる先頭部分が取り除かれるテスト"""
+        history = ClipHistory()
+        history.filter(make_days(1, 5))
+
+        result = history.filter(make_days(3, 8))
+
+        assert result == make_days(6, 8)
+        assert history.trimmed_count == 1
+        assert history.dropped_count == 0
+
+    def test_clip_spanning_several_clips_kept(self):
+        """複数のクリップにまたがる内容は除外しないテスト"""
+        history = ClipHistory()
+        history.filter(make_day(1))
+        history.filter(make_day(2))
+
+        clip = make_day(1) + "\n" + make_day(2)
+
+        assert history.filter(clip) is not None
+
+    def test_history_bounded(self):
+        """履歴件数が上限を超えないテスト"""
+        history = ClipHistory(max_clips=2)
+        for day in range(1, 5):
+            history.filter(make_day(day))
+
+        assert len(history.clips) == 2
+        assert history.filter(make_day(1)) == make_day(1)
+        assert all(clip_id in {c[0] for c in history.clips} for clip_id, _ in history.chunk_index.values())
+
+    def test_disabled(self):
+        """履歴件数0では除外しないテスト"""
+        history = ClipHistory(max_clips=0)
+        history.filter("カルテ")
+
+        assert history.filter("カルテ") == "カルテ"
+
+    def test_clear(self):
+        """クリア後は除外されないテスト"""
+        history = ClipHistory()
+        history.filter("カルテ")
+
+        history.clear()
+
+        assert history.filter("カルテ") == "カルテ"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+from tkinter import TclError
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.clipboard_backend import (
+    MemoryClipboardBackend,
+    PyperclipBackend,
+    TkClipboardBackend,
+    create_clipboard_backend
+)
+
+
+class TestTkClipboardBackend:
+    """Tkクリップボードのテスト"""
+
+    def test_paste(self):
+        """貼り付けのテスト"""
+        mock_root = Mock()
+        mock_root.clipboard_get.return_value = "テキスト"
+
+        assert TkClipboardBackend(mock_root).paste() == "テキスト"
+
+    def test_paste_empty_clipboard(self):
+        """空のクリップボードのテスト"""
+        mock_root = Mock()
+        mock_root.clipboard_get.side_effect = TclError("CLIPBOARD selection doesn't exist")
+
+        assert TkClipboardBackend(mock_root).paste() == ""
+
+    def test_copy(self):
+        """コピーのテスト"""
+        mock_root = Mock()
+
+        TkClipboardBackend(mock_root).copy("テキスト")
+
+        mock_root.clipboard_clear.assert_called_once()
+        mock_root.clipboard_append.assert_called_once_with("テキスト")
+
+    def test_copy_falls_back(self):
+        """Tkでコピーできない場合の代替のテスト"""
+        mock_root = Mock()
+        mock_root.clipboard_clear.side_effect = TclError("error")
+        fallback = MemoryClipboardBackend()
+
+        TkClipboardBackend(mock_root, fallback).copy("テキスト")
+
+        assert fallback.paste() == "テキスト"
+
+
+class TestPyperclipBackend:
+    """pyperclipクリップボードのテスト"""
+
+    @patch('pyperclip.paste')
+    def test_paste(self, mock_paste):
+        """貼り付けのテスト"""
+        mock_paste.return_value = "テキスト"
+
+        assert PyperclipBackend().paste() == "テキスト"
+
+    @patch('pyperclip.copy')
+    def test_copy(self, mock_copy):
+        """コピーのテスト"""
+        PyperclipBackend().copy("テキスト")
+
+        mock_copy.assert_called_once_with("テキスト")
+
+
+class TestCreateClipboardBackend:
+    """クリップボード生成のテスト"""
+
+    def test_create_tk(self):
+        """Tkクリップボードの生成テスト"""
+        assert isinstance(create_clipboard_backend("tk", Mock()), TkClipboardBackend)
+
+    def test_create_tk_without_root(self):
+        """ルートウィンドウがない場合はpyperclipを使うテスト"""
+        assert isinstance(create_clipboard_backend("tk"), PyperclipBackend)
+
+    def test_create_memory(self):
+        """メモリクリップボードの生成テスト"""
+        backend = create_clipboard_backend("memory")
+        backend.copy("テキスト")
+
+        assert backend.paste() == "テキスト"
+
+    def test_create_unknown(self):
+        """不明な指定ではpyperclipを使うテスト"""
+        assert isinstance(create_clipboard_backend("unknown", Mock()), PyperclipBackend)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.clipboard_watcher import ClipboardWatcher, get_clipboard_sequence_source
+
+
+class TestClipboardWatcher:
+    """クリップボード変更検知のテスト"""
+
+    def test_without_sequence_source_always_changed(self):
+        """更新回数を取得できない場合は常に変更ありとするテスト"""
+        watcher = ClipboardWatcher()
+
+        assert watcher.has_changed() is True
+        assert watcher.has_changed() is True
+
+    def test_sequence_source_detects_change(self):
+        """更新回数による変更検知のテスト"""
+        sequence = Mock(side_effect=[1, 1, 2])
+        watcher = ClipboardWatcher(sequence)
+
+        assert watcher.has_changed() is True
+        assert watcher.has_changed() is False
+        assert watcher.has_changed() is True
+
+    def test_reset_forces_next_check(self):
+        """リセット後は変更ありとするテスト"""
+        watcher = ClipboardWatcher(Mock(return_value=5))
+        watcher.has_changed()
+
+        watcher.reset()
+
+        assert watcher.has_changed() is True
+
+    def test_backoff_when_unchanged(self):
+        """変更がない間はポーリング間隔を延ばすテスト"""
+        watcher = ClipboardWatcher(min_interval=100, max_interval=300, backoff=2)
+
+        assert watcher.next_interval(False) == 200
+        assert watcher.next_interval(False) == 300
+        assert watcher.next_interval(False) == 300
+        assert watcher.next_interval(True) == 100
+
+    def test_no_backoff_with_sequence_source(self):
+        """更新回数を取得できる場合は最短間隔を維持するテスト"""
+        watcher = ClipboardWatcher(Mock(return_value=1), min_interval=100, max_interval=300)
+
+        assert watcher.next_interval(False) == 100
+
+    def test_sequence_source_unavailable_on_other_platforms(self):
+        """Windows以外では更新回数を使わないテスト"""
+        with patch('sys.platform', 'linux'):
+            assert get_clipboard_sequence_source() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,161 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from utils import config_manager
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """一時ディレクトリの設定ファイルを使用するフィクスチャ"""
+    path = tmp_path / "config.ini"
+    path.write_text("[Appearance]\nwindow_width = 1100\n", encoding="utf-8")
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(path))
+    config_manager.clear_config_cache()
+    yield path
+    config_manager.clear_config_cache()
+    config_manager._config_listeners.clear()
+
+
+def touch_later(path, content):
+    """内容を書き換え、更新日時を確実に進める"""
+    stat = os.stat(path)
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestLoadConfig:
+    """設定読み込みのテスト"""
+
+    def test_load_config(self, config_file):
+        """設定読み込みのテスト"""
+        config = config_manager.load_config()
+
+        assert config.getint('Appearance', 'window_width') == 1100
+
+    def test_load_config_cached(self, config_file):
+        """更新がなければファイルを読み直さないテスト"""
+        first = config_manager.load_config()
+
+        with patch('builtins.open') as mock_open:
+            second = config_manager.load_config()
+
+        assert second is first
+        mock_open.assert_not_called()
+
+    def test_load_config_reloads_on_mtime_change(self, config_file):
+        """更新日時が変わると読み直すテスト"""
+        config_manager.load_config()
+        touch_later(config_file, "[Appearance]\nwindow_width = 900\n")
+
+        config = config_manager.load_config()
+
+        assert config.getint('Appearance', 'window_width') == 900
+
+    def test_load_config_file_not_found(self, tmp_path, monkeypatch):
+        """設定ファイルがない場合のテスト"""
+        monkeypatch.setattr(config_manager, "CONFIG_PATH", str(tmp_path / "none.ini"))
+        config_manager.clear_config_cache()
+
+        with patch('builtins.print'), pytest.raises(FileNotFoundError):
+            config_manager.load_config()
+
+
+class TestConfigListeners:
+    """設定変更通知のテスト"""
+
+    def test_check_config_updates_notifies(self, config_file):
+        """更新時にリスナーへ通知するテスト"""
+        listener = Mock()
+        config_manager.add_config_listener(listener)
+        config_manager.load_config()
+        touch_later(config_file, "[Appearance]\nwindow_width = 900\n")
+
+        assert config_manager.check_config_updates() is True
+
+        config = listener.call_args[0][0]
+        assert config.getint('Appearance', 'window_width') == 900
+
+    def test_check_config_updates_without_change(self, config_file):
+        """更新がなければ通知しないテスト"""
+        listener = Mock()
+        config_manager.add_config_listener(listener)
+        config_manager.load_config()
+
+        assert config_manager.check_config_updates() is False
+        listener.assert_not_called()
+
+    def test_listener_error_does_not_stop_others(self, config_file):
+        """リスナーの例外が他のリスナーへの通知を妨げないテスト"""
+        failing = Mock(side_effect=Exception("エラー"))
+        listener = Mock()
+        config_manager.add_config_listener(failing)
+        config_manager.add_config_listener(listener)
+        config_manager.load_config()
+        touch_later(config_file, "[Appearance]\nwindow_width = 900\n")
+
+        with patch('builtins.print'):
+            config_manager.check_config_updates()
+
+        listener.assert_called_once()
+
+    def test_deleted_file_logged_once(self, config_file):
+        """設定ファイルが削除されてもエラーを1回だけ出し、前回の設定を使い続けるテスト"""
+        listener = Mock()
+        config_manager.add_config_listener(listener)
+        first = config_manager.load_config()
+        os.unlink(config_file)
+
+        with patch('builtins.print') as mock_print:
+            for _ in range(3):
+                assert config_manager.check_config_updates() is False
+            assert config_manager.load_config() is first
+
+        mock_print.assert_called_once()
+        assert "設定ファイルが見つかりません" in mock_print.call_args[0][0]
+        listener.assert_not_called()
+
+    def test_recovers_after_restore(self, config_file):
+        """削除された設定ファイルが戻ると読み込み直して通知するテスト"""
+        listener = Mock()
+        config_manager.add_config_listener(listener)
+        config_manager.load_config()
+        os.unlink(config_file)
+        with patch('builtins.print'):
+            config_manager.check_config_updates()
+
+        config_file.write_text("[Appearance]\nwindow_width = 900\n", encoding="utf-8")
+        with patch('builtins.print') as mock_print:
+            assert config_manager.check_config_updates() is True
+
+        assert "読み込み直しました" in mock_print.call_args[0][0]
+        assert listener.call_args[0][0].getint('Appearance', 'window_width') == 900
+
+    def test_remove_listener(self, config_file):
+        """リスナー解除のテスト"""
+        listener = Mock()
+        config_manager.add_config_listener(listener)
+        config_manager.remove_config_listener(listener)
+        config_manager.load_config()
+        touch_later(config_file, "[Appearance]\nwindow_width = 900\n")
+
+        config_manager.check_config_updates()
+
+        listener.assert_not_called()
+
+    def test_save_config_updates_cache(self, config_file):
+        """保存した設定がキャッシュに反映されるテスト"""
+        listener = Mock()
+        config_manager.add_config_listener(listener)
+        config = config_manager.load_config()
+        config.set('Appearance', 'window_width', '1200')
+
+        config_manager.save_config(config)
+
+        assert config_manager.load_config() is config
+        listener.assert_called_once_with(config)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
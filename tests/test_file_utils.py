@@ -0,0 +1,45 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from utils.file_utils import UMASK, write_file_atomic
+
+
+class TestWriteFileAtomic:
+    """write_file_atomic関数のテスト"""
+
+    def test_write(self, tmp_path):
+        """文字列を書き出し、一時ファイルを残さないテスト"""
+        path = tmp_path / "out.json"
+
+        write_file_atomic(str(path), "変換結果")
+
+        assert path.read_text(encoding="utf-8") == "変換結果"
+        assert os.listdir(tmp_path) == ["out.json"]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="権限の検証はPOSIXのみ")
+    def test_new_file_respects_umask(self, tmp_path):
+        """新しいファイルがumaskに従った権限になるテスト"""
+        path = tmp_path / "out.json"
+
+        write_file_atomic(str(path), b"data")
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~UMASK
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="権限の検証はPOSIXのみ")
+    def test_keeps_existing_mode(self, tmp_path):
+        """既存のファイルの権限を引き継ぐテスト"""
+        path = tmp_path / "out.json"
+        path.write_bytes(b"old")
+        os.chmod(path, 0o640)
+
+        write_file_atomic(str(path), b"new")
+
+        assert path.read_bytes() == b"new"
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,316 @@
+import json
+import os
+import sys
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cli import main
+from services.folder_watcher import (
+    INDEX_FILE_NAME,
+    FolderIngestor,
+    InotifySource,
+    PollingSource,
+    ProcessedIndex,
+    create_watch_source,
+    scan_folder,
+)
+
+SAMPLE_TEXT = """2024/05/26(日)
+内科 田中医師 外来 14:30
+S>
+頭痛があります
+"""
+
+
+def write_text(path, text=SAMPLE_TEXT):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+class TestScanFolder:
+    """scan_folder関数のテスト"""
+
+    def test_only_text_files(self, tmp_path):
+        """.txtファイルだけを対象にするテスト"""
+        write_text(tmp_path / "a.txt")
+        write_text(tmp_path / "b.TXT")
+        write_text(tmp_path / "c.json")
+        (tmp_path / "sub.txt").mkdir()
+
+        assert sorted(os.path.basename(path) for path in scan_folder(str(tmp_path))) == ["a.txt", "b.TXT"]
+
+
+class TestPollingSource:
+    """PollingSourceのテスト"""
+
+    def test_reports_settled_files_once(self, tmp_path):
+        """書き込みが落ち着いたファイルを1回だけ返すテスト"""
+        source = PollingSource(str(tmp_path), interval=0)
+        assert source.initial() == []
+
+        path = str(tmp_path / "a.txt")
+        write_text(path)
+        # 前回の走査から変化したばかりのファイルはまだ返さない
+        assert source.wait() == []
+        assert source.wait() == [path]
+        assert source.wait() == []
+
+    def test_reports_changed_file(self, tmp_path):
+        """内容が変わったファイルを再度返すテスト"""
+        path = str(tmp_path / "a.txt")
+        write_text(path)
+        source = PollingSource(str(tmp_path), interval=0)
+        source.initial()
+        assert source.wait() == [path]
+
+        write_text(path, SAMPLE_TEXT + "追記\n")
+        assert source.wait() == []
+        assert source.wait() == [path]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotifyはLinuxのみ")
+class TestInotifySource:
+    """InotifySourceのテスト"""
+
+    def test_detects_new_file(self, tmp_path):
+        """書き込みを終えたファイルを検知するテスト"""
+        write_text(tmp_path / "existing.txt")
+        source = InotifySource(str(tmp_path))
+        try:
+            assert source.initial() == [str(tmp_path / "existing.txt")]
+
+            write_text(tmp_path / "new.txt")
+            write_text(tmp_path / "ignored.json")
+
+            assert source.wait(timeout=5) == [str(tmp_path / "new.txt")]
+            assert source.wait(timeout=0) == []
+        finally:
+            source.close()
+
+    def test_detects_moved_file(self, tmp_path):
+        """別の場所から移動されたファイルを検知するテスト"""
+        (tmp_path / "watch").mkdir()
+        source = InotifySource(str(tmp_path / "watch"))
+        try:
+            write_text(tmp_path / "a.txt")
+            os.replace(tmp_path / "a.txt", tmp_path / "watch" / "a.txt")
+
+            assert source.wait(timeout=5) == [str(tmp_path / "watch" / "a.txt")]
+        finally:
+            source.close()
+
+
+class TestCreateWatchSource:
+    """create_watch_sourceのテスト"""
+
+    def test_polling_requested(self, tmp_path):
+        """定期確認を指定した場合のテスト"""
+        source = create_watch_source(str(tmp_path), interval=3, polling=True)
+
+        assert isinstance(source, PollingSource)
+        assert source.interval == 3
+
+    @patch('services.folder_watcher.InotifySource')
+    @patch('builtins.print')
+    def test_fallback_to_polling(self, mock_print, mock_inotify, tmp_path):
+        """inotifyが使えない場合に定期確認へ切り替えるテスト"""
+        mock_inotify.side_effect = OSError("利用不可")
+
+        with patch('sys.platform', 'linux'):
+            source = create_watch_source(str(tmp_path))
+
+        assert isinstance(source, PollingSource)
+        assert "定期確認で監視します" in mock_print.call_args[0][0]
+
+
+class TestProcessedIndex:
+    """ProcessedIndexのテスト"""
+
+    def test_claim_and_persist(self, tmp_path):
+        """処理済みの内容を保存し、再起動後もスキップするテスト"""
+        path = str(tmp_path / INDEX_FILE_NAME)
+        index = ProcessedIndex(path)
+
+        assert index.claim("a.json", "abc")
+        assert not index.claim("a.json", "abc")
+        index.complete("a.json", "abc")
+
+        assert not ProcessedIndex(path).claim("a.json", "abc")
+
+    def test_keyed_by_output_name(self, tmp_path):
+        """同じ内容でも出力先が異なれば処理するテスト"""
+        index = ProcessedIndex(str(tmp_path / INDEX_FILE_NAME))
+        assert index.claim("a.json", "abc")
+        index.complete("a.json", "abc")
+
+        assert index.claim("b.json", "abc")
+        # 内容が変わったファイルを元に戻した場合も処理し直す
+        index.complete("a.json", "def")
+        assert index.claim("a.json", "abc")
+
+    def test_release(self, tmp_path):
+        """失敗した内容を再度処理できるテスト"""
+        index = ProcessedIndex(str(tmp_path / INDEX_FILE_NAME))
+
+        assert index.claim("a.json", "abc")
+        index.release("a.json", "abc")
+        assert index.claim("a.json", "abc")
+
+    @patch('services.folder_watcher.COMPACT_MIN_LINES', 2)
+    def test_compact(self, tmp_path):
+        """追記した記録が溜まったら詰めて書き直すテスト"""
+        path = tmp_path / INDEX_FILE_NAME
+        index = ProcessedIndex(str(path))
+        for digest in ("1", "2", "3"):
+            index.complete("a.json", digest)
+
+        assert path.read_text(encoding="utf-8").splitlines() == ['["a.json", "3"]']
+        assert ProcessedIndex(str(path)).digests == {"a.json": "3"}
+
+    def test_truncated_line(self, tmp_path):
+        """追記の途中で終了した行を捨てるテスト"""
+        path = tmp_path / INDEX_FILE_NAME
+        path.write_text('["a.json", "abc"]\n["b.js', encoding="utf-8")
+
+        index = ProcessedIndex(str(path))
+        index.complete("c.json", "def")
+
+        assert ProcessedIndex(str(path)).digests == {"a.json": "abc", "c.json": "def"}
+
+    @patch('builtins.print')
+    def test_broken_index(self, mock_print, tmp_path):
+        """壊れた一覧ファイルのテスト"""
+        path = tmp_path / INDEX_FILE_NAME
+        path.write_text("{\n", encoding="utf-8")
+
+        index = ProcessedIndex(str(path))
+
+        assert index.digests == {}
+        assert "処理済み一覧を読み込めません" in mock_print.call_args[0][0]
+
+
+@patch('builtins.print')
+class TestFolderIngestor:
+    """FolderIngestorのテスト"""
+
+    def test_convert_next_to_source(self, mock_print, tmp_path):
+        """監視フォルダにJSONを書き出すテスト"""
+        write_text(tmp_path / "karte.txt")
+        ingestor = FolderIngestor(str(tmp_path))
+
+        output_path = ingestor.submit(str(tmp_path / "karte.txt")).result()
+        ingestor.shutdown()
+
+        assert output_path == str(tmp_path / "karte.json")
+        with open(output_path, encoding="utf-8") as file:
+            assert json.load(file)[0]["subject"] == "頭痛があります"
+        assert ingestor.converted_count == 1
+
+    def test_convert_to_output_dir(self, mock_print, tmp_path):
+        """出力先フォルダにJSONを書き出すテスト"""
+        write_text(tmp_path / "karte.txt")
+        output_dir = tmp_path / "out"
+        ingestor = FolderIngestor(str(tmp_path), str(output_dir))
+
+        ingestor.submit(str(tmp_path / "karte.txt")).result()
+        ingestor.shutdown()
+
+        assert (output_dir / "karte.json").exists()
+        assert (output_dir / INDEX_FILE_NAME).exists()
+        assert not (tmp_path / "karte.json").exists()
+
+    def test_skip_processed_content(self, mock_print, tmp_path):
+        """変換済みの内容から変わっていないファイルをスキップするテスト"""
+        write_text(tmp_path / "a.txt")
+        write_text(tmp_path / "b.txt")
+        ingestor = FolderIngestor(str(tmp_path))
+
+        ingestor.submit(str(tmp_path / "a.txt")).result()
+        assert ingestor.submit(str(tmp_path / "a.txt")).result() is None
+        # 同じ内容でも別のファイルは出力先が異なるため変換する
+        assert ingestor.submit(str(tmp_path / "b.txt")).result() == str(tmp_path / "b.json")
+        ingestor.shutdown()
+
+        assert ingestor.skipped_count == 1
+
+    def test_convert_cp932(self, mock_print, tmp_path):
+        """CP932のファイルを自動判定して変換するテスト"""
+        (tmp_path / "a.txt").write_bytes(SAMPLE_TEXT.encode("cp932"))
+        ingestor = FolderIngestor(str(tmp_path))
+
+        output_path = ingestor.submit(str(tmp_path / "a.txt")).result()
+        ingestor.shutdown()
+
+        with open(output_path, encoding="utf-8") as file:
+            assert json.load(file)[0]["subject"] == "頭痛があります"
+
+    def test_decode_error(self, mock_print, tmp_path):
+        """指定した文字コードと異なる場合のテスト"""
+        (tmp_path / "a.txt").write_bytes(SAMPLE_TEXT.encode("cp932"))
+        ingestor = FolderIngestor(str(tmp_path), encoding="utf-8")
+
+        assert ingestor.submit(str(tmp_path / "a.txt")).result() is None
+        ingestor.shutdown()
+
+        assert ingestor.error_count == 1
+        # 失敗した内容は処理済みにしない
+        assert ingestor.index.digests == {}
+
+    def test_back_pressure(self, mock_print, tmp_path):
+        """処理待ちが上限に達すると受け付けを待つテスト"""
+        release = threading.Event()
+        ingestor = FolderIngestor(str(tmp_path), workers=1, max_pending=2)
+        ingestor.process_file = Mock(side_effect=lambda path: release.wait(5))
+
+        ingestor.submit("a.txt")
+        ingestor.submit("b.txt")
+        third = threading.Thread(target=ingestor.submit, args=("c.txt",))
+        third.start()
+        third.join(0.2)
+
+        assert third.is_alive()
+        release.set()
+        third.join(5)
+        assert not third.is_alive()
+        ingestor.shutdown()
+        assert ingestor.process_file.call_count == 3
+
+    def test_run(self, mock_print, tmp_path):
+        """監視の開始から停止までのテスト"""
+        write_text(tmp_path / "karte.txt")
+        ingestor = FolderIngestor(str(tmp_path))
+        stop_event = threading.Event()
+        source = Mock()
+        source.initial.return_value = [str(tmp_path / "karte.txt")]
+        source.wait.side_effect = lambda timeout: stop_event.set() or []
+
+        ingestor.run(source, stop_event)
+        ingestor.shutdown()
+
+        assert (tmp_path / "karte.json").exists()
+
+
+class TestWatchCommand:
+    """watchサブコマンドのテスト"""
+
+    def test_folder_not_found(self, tmp_path, capsys):
+        """監視フォルダ未発見のテスト"""
+        assert main(["watch", str(tmp_path / "missing")]) == 1
+        assert "フォルダが見つかりません" in capsys.readouterr().err
+
+    @patch('services.folder_watcher.FolderIngestor.run')
+    def test_watch(self, mock_run, tmp_path):
+        """引数を渡して監視を開始するテスト"""
+        mock_run.side_effect = KeyboardInterrupt
+
+        assert main(["watch", str(tmp_path), "--polling", "--interval", "0.5"]) == 0
+
+        source = mock_run.call_args[0][0]
+        assert isinstance(source, PollingSource)
+        assert source.interval == 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from services.json_viewer import PagedJsonViewer
+
+
+def make_records(count):
+    return [
+        {'timestamp': f"2024-05-{day:02d}T09:00:00Z", 'department': '内科', 'subject': f"記載{day}"}
+        for day in range(1, count + 1)
+    ]
+
+
+class TestPagedJsonViewer:
+    """ページ表示JSONビューアのテスト"""
+
+    def test_set_records_shows_first_page_only(self):
+        """先頭ページのみ描画されるテスト"""
+        mock_text = Mock()
+        viewer = PagedJsonViewer(mock_text, page_size=10)
+
+        viewer.set_records(make_records(25))
+
+        mock_text.delete.assert_called_with("1.0", "end")
+        rendered = json.loads(mock_text.insert.call_args[0][1])
+        assert len(rendered) == 10
+        assert rendered[0]['subject'] == "記載1"
+        assert viewer.page_count == 3
+
+    def test_next_and_prev_page(self):
+        """ページ送り・戻しのテスト"""
+        mock_text = Mock()
+        viewer = PagedJsonViewer(mock_text, page_size=10)
+        viewer.set_records(make_records(25))
+
+        viewer.next_page()
+        viewer.next_page()
+        rendered = json.loads(mock_text.insert.call_args[0][1])
+        assert viewer.page == 2
+        assert len(rendered) == 5
+
+        viewer.next_page()
+        assert viewer.page == 2
+
+        viewer.prev_page()
+        assert viewer.page == 1
+
+    def test_full_json_independent_of_page(self):
+        """全体JSONが表示ページに依存しないテスト"""
+        records = make_records(25)
+        viewer = PagedJsonViewer(Mock(), page_size=10)
+        viewer.set_records(records)
+        viewer.next_page()
+
+        assert json.loads(viewer.full_json()) == records
+
+    def test_full_json_reuses_given_json(self):
+        """変換済みJSON文字列が再利用されるテスト"""
+        viewer = PagedJsonViewer(Mock())
+        viewer.set_records(make_records(1), "変換済み")
+
+        assert viewer.full_json() == "変換済み"
+
+    @pytest.mark.parametrize("date_text", ["2024/05/15", "2024-05-15", "2024/5/15"])
+    def test_jump_to_date(self, date_text):
+        """日付ジャンプのテスト"""
+        viewer = PagedJsonViewer(Mock(), page_size=10)
+        viewer.set_records(make_records(25))
+
+        assert viewer.jump_to_date(date_text) is True
+        assert viewer.page == 1
+
+    def test_jump_to_date_after_last_record(self):
+        """最終レコード以降の日付で最終ページに移動するテスト"""
+        viewer = PagedJsonViewer(Mock(), page_size=10)
+        viewer.set_records(make_records(25))
+
+        viewer.jump_to_date("2025/01/01")
+
+        assert viewer.page == 2
+
+    def test_jump_to_date_invalid(self):
+        """不正な日付指定のテスト"""
+        viewer = PagedJsonViewer(Mock(), page_size=10)
+        viewer.set_records(make_records(25))
+
+        assert viewer.jump_to_date("不正") is False
+        assert viewer.page == 0
+
+    def test_clear(self):
+        """クリアのテスト"""
+        mock_text = Mock()
+        viewer = PagedJsonViewer(mock_text)
+        viewer.set_records(make_records(3))
+
+        viewer.clear()
+
+        assert viewer.records == []
+        assert viewer.status_text() == "0 / 0 ページ（0件）"
+        mock_text.delete.assert_called_with("1.0", "end")
+
+    def test_status_text(self):
+        """ページ状態表示のテスト"""
+        viewer = PagedJsonViewer(Mock(), page_size=10)
+        viewer.set_records(make_records(25))
+
+        assert viewer.status_text() == "1 / 3 ページ（25件）"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
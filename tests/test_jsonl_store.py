@@ -0,0 +1,125 @@
+import json
+import os
+
+import pytest
+
+from services.jsonl_store import INDEX_SUFFIX, JsonlStore, JsonlStoreError
+
+
+def make_record(day, department="内科", subject="頭痛"):
+    return {"timestamp": f"2024-05-{day:02d}T09:00:00Z", "department": department, "subject": subject}
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+class TestJsonlStore:
+    """JsonlStoreのテスト"""
+
+    def test_create(self, tmp_path):
+        """新しいファイルに書き出すテスト"""
+        path = str(tmp_path / "karte.jsonl")
+
+        assert JsonlStore(path).update([make_record(1), make_record(2)]) == (2, 0)
+
+        assert read_records(path) == [make_record(1), make_record(2)]
+        assert os.path.exists(path + INDEX_SUFFIX)
+
+    def test_append_only_new_groups(self, tmp_path):
+        """新しい記録だけを末尾に追記するテスト"""
+        path = str(tmp_path / "karte.jsonl")
+        JsonlStore(path).update([make_record(1), make_record(2)])
+        with open(path, "rb") as file:
+            before = file.read()
+
+        assert JsonlStore(path).update([make_record(1), make_record(2), make_record(3)]) == (1, 0)
+
+        with open(path, "rb") as file:
+            after = file.read()
+        assert after.startswith(before)
+        assert read_records(path)[-1] == make_record(3)
+
+    def test_update_changed_group(self, tmp_path):
+        """変更された記録をその位置で置き換えるテスト"""
+        path = str(tmp_path / "karte.jsonl")
+        JsonlStore(path).update([make_record(1), make_record(2)])
+
+        assert JsonlStore(path).update([make_record(1, subject="頭痛\n発熱"), make_record(3)]) == (1, 1)
+
+        assert read_records(path) == [make_record(1, subject="頭痛\n発熱"), make_record(2), make_record(3)]
+        assert JsonlStore(path).update([make_record(1, subject="頭痛\n発熱")]) == (0, 0)
+
+    def test_same_key_in_batch(self, tmp_path):
+        """同じ鍵の記録が続いた場合は後のものを書き出すテスト"""
+        path = str(tmp_path / "karte.jsonl")
+
+        assert JsonlStore(path).update([make_record(1), make_record(1, subject="発熱")]) == (1, 0)
+
+        assert read_records(path) == [make_record(1, subject="発熱")]
+
+    def test_update_duplicate_lines(self, tmp_path):
+        """同じ鍵の行が重なっている場合は1行だけに置き換えるテスト"""
+        path = tmp_path / "karte.jsonl"
+        path.write_text("".join(json.dumps(record, ensure_ascii=False) + "\n"
+                                for record in [make_record(1), make_record(2), make_record(1, subject="発熱")]),
+                        encoding="utf-8")
+
+        assert JsonlStore(str(path)).update([make_record(1, subject="頭痛\n発熱")]) == (0, 1)
+
+        assert read_records(path) == [make_record(1, subject="頭痛\n発熱"), make_record(2)]
+
+    def test_recover_partial_append(self, tmp_path):
+        """追記の途中で終了した行を切り捨てるテスト"""
+        path = str(tmp_path / "karte.jsonl")
+        JsonlStore(path).update([make_record(1)])
+        with open(path, "ab") as file:
+            file.write(b'{"timestamp": "2024-05-02T09:00:00Z", "depa')
+
+        store = JsonlStore(path)
+
+        assert read_records(path) == [make_record(1)]
+        assert store.size == os.path.getsize(path)
+        assert store.update([make_record(2)]) == (1, 0)
+        assert read_records(path) == [make_record(1), make_record(2)]
+
+    def test_recover_missing_index(self, tmp_path):
+        """索引の更新前に終了した場合は、書き込み済みの行から索引を作り直すテスト"""
+        path = str(tmp_path / "karte.jsonl")
+        JsonlStore(path).update([make_record(1)])
+        with open(path, "ab") as file:
+            file.write((json.dumps(make_record(2), ensure_ascii=False) + "\n").encode("utf-8"))
+
+        assert JsonlStore(path).update([make_record(1), make_record(2)]) == (0, 0)
+        assert len(read_records(path)) == 2
+
+    def test_external_file_without_newline(self, tmp_path):
+        """改行で終わらないファイルにも追記できるテスト"""
+        path = tmp_path / "karte.jsonl"
+        path.write_text(json.dumps(make_record(1), ensure_ascii=False), encoding="utf-8")
+
+        assert JsonlStore(str(path)).update([make_record(2)]) == (1, 0)
+
+        assert read_records(path) == [make_record(1), make_record(2)]
+
+    def test_corrupted_line(self, tmp_path):
+        """途中の行が壊れている場合はエラーにするテスト"""
+        path = tmp_path / "karte.jsonl"
+        path.write_text("壊れた行\n" + json.dumps(make_record(1)) + "\n", encoding="utf-8")
+
+        with pytest.raises(JsonlStoreError, match="1行目を読み込めません"):
+            JsonlStore(str(path))
+
+    def test_without_timestamp(self, tmp_path):
+        """日時のない記録は内容で区別するテスト"""
+        path = str(tmp_path / "karte.jsonl")
+        records = [{"timestamp": None, "department": "内科", "subject": "頭痛"},
+                   {"timestamp": None, "department": "内科", "subject": "発熱"}]
+
+        assert JsonlStore(path).update(records) == (2, 0)
+        assert JsonlStore(path).update(records) == (0, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
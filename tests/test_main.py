@@ -3,6 +3,8 @@ from unittest.mock import Mock, patch, MagicMock
 import json
 import tkinter as tk
 
+from tests.helpers.widgets import set_widget_text
+
 
 class TestMedicalTextConverter:
     """MedicalTextConverterクラスのテスト"""
@@ -15,9 +17,10 @@ class TestMedicalTextConverter:
                 patch('tkinter.scrolledtext.ScrolledText') as mock_scrolled_text, \
                 patch('tkinter.Label') as mock_label, \
                 patch('tkinter.Button') as mock_button, \
+                patch('tkinter.Entry'), \
                 patch('pyperclip.copy') as mock_copy, \
                 patch('main.parse_medical_text') as mock_parse, \
-                patch('main.TextEditor') as mock_text_editor:
+                patch('services.txt_editor.TextEditor') as mock_text_editor:
             from main import MedicalTextConverter
 
             # 設定モック
@@ -31,7 +34,8 @@ class TestMedicalTextConverter:
             }.get(key, fallback)
             mock_config.get.side_effect = lambda section, key, fallback=None: {
                 'main_window_position': '+10+10',
-                'text_area_font_name': 'Yu Gothic UI'
+                'text_area_font_name': 'Yu Gothic UI',
+                'backend': 'pyperclip'
             }.get(key, fallback)
             mock_load_config.return_value = mock_config
 
@@ -44,7 +48,7 @@ class TestMedicalTextConverter:
 
             mock_text_input.get.return_value = "\n"
             mock_scrolled_text.side_effect = [mock_text_input, mock_text_output]
-            mock_label.side_effect = [mock_stats_label, mock_monitor_status_label]
+            mock_label.side_effect = [Mock(), mock_stats_label, mock_monitor_status_label, Mock(), Mock()]
 
             # インスタンス作成
             converter = MedicalTextConverter(mock_root)
@@ -65,8 +69,9 @@ class TestMedicalTextConverter:
                 patch('tkinter.scrolledtext.ScrolledText'), \
                 patch('tkinter.Label'), \
                 patch('tkinter.Button'), \
+                patch('tkinter.Entry'), \
                 patch('main.parse_medical_text'), \
-                patch('main.TextEditor'):
+                patch('services.txt_editor.TextEditor'):
             from main import MedicalTextConverter
 
             mock_config = Mock()
@@ -87,7 +92,7 @@ class TestMedicalTextConverter:
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
 
         # テキスト入力のモック設定
-        mock_text_input.get.return_value = "行1\n行2\n行3\n"
+        set_widget_text(mock_text_input, "行1\n行2\n行3\n")
 
         # テスト実行
         converter.update_stats(None)
@@ -100,7 +105,7 @@ class TestMedicalTextConverter:
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
 
         # 空のテキスト入力
-        mock_text_input.get.return_value = "   \n  \n  "
+        set_widget_text(mock_text_input, "   \n  \n  ")
 
         # テスト実行
         converter.update_stats(None)
@@ -146,6 +151,151 @@ class TestMedicalTextConverter:
         assert converter.clipboard_content == ""
         assert converter.is_first_check is False
 
+    def test_live_preview_debounces_edits(self):
+        """ライブ変換で連続した編集がまとめられるテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_live_preview = True
+        converter.root.after.side_effect = ["after#1", "after#2"]
+
+        # テスト実行
+        converter.mark_input_changed()
+        converter.mark_input_changed()
+
+        # 検証
+        converter.root.after_cancel.assert_called_once_with("after#1")
+        converter.root.after.assert_called_with(converter.live_preview_delay, converter.start_live_parse)
+        assert converter.input_generation == 2
+
+    def test_input_unchanged_keeps_live_result(self):
+        """内容の変わらない操作ではライブ変換の結果を捨てないテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_live_preview = True
+        converter.on_live_parsed(converter.input_generation, ([{"subject": "頭痛"}], "変換済みJSON"))
+        mock_text_input.edit_modified.return_value = False
+
+        # テスト実行
+        converter.on_input_edited(None)
+
+        # 検証
+        assert converter.get_live_result() == ([{"subject": "頭痛"}], "変換済みJSON")
+
+    def test_input_modified_invalidates_live_result(self):
+        """内容が変わった場合はライブ変換の結果を捨て、変更フラグを戻すテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_live_preview = True
+        converter.on_live_parsed(converter.input_generation, ([{"subject": "頭痛"}], "変換済みJSON"))
+        mock_text_input.edit_modified.return_value = True
+
+        # テスト実行
+        converter.on_input_edited(None)
+
+        # 検証
+        assert converter.get_live_result() is None
+        mock_text_input.edit_modified.assert_called_with(False)
+
+    def test_close_window(self):
+        """閉じる際に変換用のスレッドを終了するテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.parse_executor = Mock()
+        converter.automation_runner = Mock()
+
+        # テスト実行
+        converter.close_window()
+
+        # 検証
+        converter.parse_executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        converter.automation_runner.shutdown.assert_called_once()
+        converter.root.destroy.assert_called_once()
+
+    def test_live_preview_coalesces_while_running(self):
+        """変換中の変更は完了後の1回の変換にまとめられるテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_live_preview = True
+        converter.dispatcher = Mock()
+        mock_text_input.get.return_value = "医療テキスト\n"
+
+        # テスト実行
+        converter.start_live_parse()
+        converter.start_live_parse()
+        converter.start_live_parse()
+
+        # 検証
+        assert converter.dispatcher.submit.call_count == 1
+        assert converter.live_parse_pending is True
+
+        converter.on_live_parsed(converter.input_generation, ([], "[]"))
+        assert converter.dispatcher.submit.call_count == 2
+
+    def test_live_preview_discards_stale_result(self):
+        """古い入力に対する変換結果を破棄するテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_live_preview = True
+        generation = converter.input_generation
+        converter.input_generation += 1
+
+        # テスト実行
+        converter.on_live_parsed(generation, ([{"timestamp": None}], "[古い結果]"))
+
+        # 検証
+        assert converter.live_result is None
+        assert converter.get_live_result() is None
+
+    @patch('pyperclip.copy')
+    @patch('main.parse_medical_text')
+    @patch('tkinter.messagebox.showinfo')
+    def test_convert_to_json_uses_live_result(self, mock_showinfo, mock_parse_method, mock_copy_method):
+        """ライブ変換済みの結果を再変換せずにコピーするテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_live_preview = True
+        set_widget_text(mock_text_input, "頭痛\n")
+        converter.on_live_parsed(converter.input_generation, ([{"subject": "頭痛"}], "変換済みJSON"))
+
+        # テスト実行
+        converter.convert_to_json()
+
+        # 検証
+        mock_parse_method.assert_not_called()
+        mock_text_input.get.assert_not_called()
+        mock_copy_method.assert_called_with("変換済みJSON")
+        mock_showinfo.assert_called_with("完了", "JSON形式に変換しコピーしました")
+        # 変換していないため所要時間は記録しない
+        assert converter.conversions.value == 1
+        assert converter.conversion_seconds.labels().count == 0
+
+    def test_apply_config(self):
+        """設定ファイルの変更が反映されるテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        new_config = Mock()
+        new_config.getint.side_effect = lambda section, key, fallback=None: {
+            'window_width': 1200,
+            'text_area_font_size': 14,
+            'json_page_size': 20,
+            'poll_min_interval_ms': 200
+        }.get(key, fallback)
+        new_config.get.side_effect = lambda section, key, fallback=None: {
+            'main_window_position': '+10+10',
+            'text_area_font_name': 'Yu Gothic UI',
+            'backend': 'pyperclip'
+        }.get(key, fallback)
+
+        # テスト実行
+        converter.apply_config(new_config)
+
+        # 検証
+        converter.root.geometry.assert_called_with("1200x800+10+10")
+        mock_text_input.config.assert_called_with(font=('Yu Gothic UI', 14))
+        mock_text_output.config.assert_called_with(font=('Yu Gothic UI', 14))
+        assert converter.json_viewer.page_size == 20
+        assert converter.clipboard_watcher.min_interval == 200
+
     def test_clear_text(self):
         """テキストクリアのテスト"""
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
@@ -233,38 +383,190 @@ class TestMedicalTextConverter:
             print_args = mock_print.call_args[0][0]
             assert "クリップボード監視エラー" in print_args
 
-    @patch('services.mouse_automation.main')
+    @patch('pyperclip.paste')
+    def test_check_clipboard_appends_without_reading_widget(self, mock_paste):
+        """追記時に入力欄全体を読み直さないテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_monitoring_clipboard = True
+        converter.is_first_check = False
+        converter.show_notification = Mock()
+        mock_text_input.get.reset_mock()
+
+        # テスト実行
+        mock_paste.return_value = "行1\n行2"
+        converter.check_clipboard()
+        mock_paste.return_value = "行3"
+        converter.check_clipboard()
+
+        # 検証
+        mock_text_input.get.assert_not_called()
+        mock_text_input.insert.assert_called_with("end", "\n行3")
+        mock_stats_label.config.assert_called_with(text="行数: 3  文字数: 6")
+
+    @patch('pyperclip.paste')
+    def test_check_clipboard_resyncs_after_manual_edit(self, mock_paste):
+        """手入力後の追記では入力欄から文書モデルを作り直すテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_monitoring_clipboard = True
+        converter.is_first_check = False
+        converter.show_notification = Mock()
+        mock_text_input.get.return_value = "手入力"
+        converter.on_input_edited(None)
+
+        # テスト実行
+        mock_paste.return_value = "追加"
+        converter.check_clipboard()
+
+        # 検証
+        mock_text_input.get.assert_called_with("1.0", "end-1c")
+        mock_text_input.insert.assert_called_with("end", "\n追加")
+        assert converter.input_document.text() == "手入力\n追加"
+        assert converter.input_document_dirty is False
+
+    @patch('pyperclip.paste')
+    def test_check_clipboard_drops_repeated_clip(self, mock_paste):
+        """同じ内容の再コピーが除外されるテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_monitoring_clipboard = True
+        converter.is_first_check = False
+        converter.show_notification = Mock()
+        converter.dedup_label = Mock()
+
+        # テスト実行
+        for clip in ["カルテ1", "カルテ2", "カルテ1"]:
+            mock_paste.return_value = clip
+            converter.check_clipboard()
+
+        # 検証
+        assert mock_text_input.insert.call_count == 2
+        assert converter.input_document.text() == "カルテ1\nカルテ2"
+        converter.dedup_label.config.assert_called_with(text="重複除外: 1（一部除外: 0）")
+        converter.show_notification.assert_called_with("重複のため除外しました")
+
+    @patch('pyperclip.paste')
+    def test_check_clipboard_skips_paste_when_unchanged(self, mock_paste):
+        """変更がなければクリップボードを読まないテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_monitoring_clipboard = True
+        converter.clipboard_watcher = Mock()
+        converter.clipboard_watcher.has_changed.return_value = False
+        converter.clipboard_watcher.next_interval.return_value = 100
+
+        # テスト実行
+        converter.check_clipboard()
+
+        # 検証
+        mock_paste.assert_not_called()
+        converter.clipboard_watcher.next_interval.assert_called_with(False)
+        converter.root.after.assert_called_with(100, converter.check_clipboard)
+
+    def test_monitoring_timer_stops_when_disabled(self):
+        """監視OFFでタイマーが停止するテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.root.after.return_value = "after#1"
+
+        # テスト実行
+        converter.set_monitoring_state(True)
+        converter.set_monitoring_state(False)
+
+        # 検証
+        converter.root.after.assert_called_with(converter.clipboard_watcher.min_interval, converter.check_clipboard)
+        converter.root.after_cancel.assert_called_once_with("after#1")
+        assert converter.clipboard_after_id is None
+
+    def test_monitoring_timer_not_scheduled_at_startup(self):
+        """起動時は監視タイマーを登録しないテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        # 検証
+        scheduled = [call.args[1] for call in converter.root.after.call_args_list]
+        assert converter.check_clipboard not in scheduled
+
+    @patch('services.mouse_automation.get_helper_command')
     @patch('tkinter.messagebox.showerror')
-    def test_soap_copy_success(self, mock_showerror, mock_mouse_main):
+    def test_soap_copy_success(self, mock_showerror, mock_get_command):
         """SOAPコピー成功のテスト"""
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
 
+        mock_get_command.return_value = [r'C:\test\soap_copy.exe']
+        converter.automation_runner = Mock()
+
         # テスト実行
         converter.soap_copy()
 
-        # 検証
+        # 検証 - 実行完了までは最小化したまま
         converter.root.iconify.assert_called_once()
-        mock_mouse_main.assert_called_with("soap_copy")
+        mock_get_command.assert_called_with("soap_copy")
+        args = converter.automation_runner.submit.call_args
+        assert args[0] == ("soap_copy", [r'C:\test\soap_copy.exe'])
+        converter.root.deiconify.assert_not_called()
+
+        # 完了通知
+        args[1]['on_done'](Mock(ok=True))
         converter.root.deiconify.assert_called_once()
+        mock_showerror.assert_not_called()
 
-    @patch('services.mouse_automation.main')
+    @patch('services.mouse_automation.get_helper_command')
     @patch('tkinter.messagebox.showerror')
-    def test_soap_copy_error(self, mock_showerror, mock_mouse_main):
+    def test_soap_copy_error(self, mock_showerror, mock_get_command):
         """SOAPコピーエラーのテスト"""
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
 
-        # 例外を発生させる
-        mock_mouse_main.side_effect = Exception("SOAPエラー")
+        mock_get_command.return_value = [r'C:\test\soap_copy.exe']
+        converter.automation_runner = Mock()
 
         # テスト実行
         converter.soap_copy()
+        converter.automation_runner.submit.call_args[1]['on_error'](Exception("SOAPエラー"))
 
         # 検証
+        converter.root.deiconify.assert_called_once()
         mock_showerror.assert_called()
         args = mock_showerror.call_args[0]
         assert args[0] == "エラー"
         assert "SOAPコピー中にエラーが発生しました" in args[1]
 
+    @patch('services.mouse_automation.get_helper_command')
+    @patch('tkinter.messagebox.showerror')
+    def test_soap_copy_timeout(self, mock_showerror, mock_get_command):
+        """SOAPコピーのタイムアウトのテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        mock_get_command.return_value = [r'C:\test\soap_copy.exe']
+        converter.automation_runner = Mock()
+        result = Mock(ok=False)
+        result.describe.return_value = "60秒以内に終了しなかったため強制終了しました"
+
+        # テスト実行
+        converter.soap_copy()
+        converter.automation_runner.submit.call_args[1]['on_done'](result)
+
+        # 検証
+        args = mock_showerror.call_args[0]
+        assert "強制終了しました" in args[1]
+
+    @patch('services.mouse_automation.get_helper_command')
+    @patch('tkinter.messagebox.showerror')
+    def test_soap_copy_file_not_found(self, mock_showerror, mock_get_command):
+        """SOAPコピー実行ファイル未発見のテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        mock_get_command.return_value = None
+        converter.automation_runner = Mock()
+
+        # テスト実行
+        converter.soap_copy()
+
+        # 検証
+        converter.automation_runner.submit.assert_not_called()
+        converter.root.iconify.assert_not_called()
+        mock_showerror.assert_called_with("エラー", "SOAPコピーの実行ファイルが見つかりません")
+
     @patch('pyperclip.copy')
     @patch('main.parse_medical_text')
     @patch('tkinter.messagebox.showinfo')
@@ -288,6 +590,125 @@ class TestMedicalTextConverter:
         mock_showinfo.assert_called_with("完了", "JSON形式に変換しコピーしました")
         assert converter.is_monitoring_clipboard is False
 
+    @patch('pyperclip.copy')
+    @patch('main.parse_medical_text')
+    @patch('tkinter.messagebox.showinfo')
+    def test_convert_to_json_hands_off_large_result(self, mock_showinfo, mock_parse_method, mock_copy_method):
+        """大きな変換結果はクリップボードに載せず、別スレッドでファイルに書き出すテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.handoff_threshold_kb = 1
+        converter.dispatcher = Mock()
+        converter.show_notification = Mock()
+        mock_text_input.get.return_value = "医療テキスト\n"
+        mock_parse_method.return_value = [{"subject": "あ" * 2000}]
+
+        # テスト実行
+        converter.convert_to_json()
+
+        # 検証
+        mock_copy_method.assert_not_called()
+        mock_showinfo.assert_not_called()
+        args = converter.dispatcher.submit.call_args[0]
+        assert args[0] is converter.parse_executor
+        assert args[2] == converter.handoff_dir
+        assert "あ" * 2000 in args[3]
+        assert args[4] == converter.handoff_keep
+        converter.show_notification.assert_called_with("ファイルに書き出しています")
+
+        # 書き出し完了後に場所をコピーする
+        converter.dispatcher.submit.call_args[1]["on_done"](("/tmp/txt2json/result.json", 6100))
+        mock_copy_method.assert_called_with("/tmp/txt2json/result.json")
+        assert "/tmp/txt2json/result.json" in mock_showinfo.call_args[0][1]
+
+    @patch('pyperclip.copy')
+    @patch('tkinter.messagebox.showinfo')
+    def test_on_result_written_summary(self, mock_showinfo, mock_copy_method):
+        """件数と大きさを添えて場所をコピーするテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.handoff_copy = "summary"
+
+        # テスト実行
+        converter.on_result_written(120, "/tmp/txt2json/result.json", 3 * 1024 * 1024)
+
+        # 検証
+        mock_copy_method.assert_called_with("変換結果 120件（3.0MB）: /tmp/txt2json/result.json")
+
+    @patch('tkinter.messagebox.showerror')
+    def test_on_result_write_failed(self, mock_showerror):
+        """書き出しエラーのテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        # テスト実行
+        converter.on_result_write_failed(OSError("ディスクがいっぱいです"))
+
+        # 検証
+        mock_showerror.assert_called_with("エラー", "変換結果の書き出し中にエラーが発生しました: ディスクがいっぱいです")
+
+    def test_should_hand_off(self):
+        """書き出しの閾値のテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.handoff_threshold_kb = 1
+        assert not converter.should_hand_off("a" * 1024)
+        assert converter.should_hand_off("a" * 1025)
+        # 文字数ではなくUTF-8のバイト数で比べる
+        assert not converter.should_hand_off("あ" * 341)
+        assert converter.should_hand_off("あ" * 342)
+
+        # 0の場合は常にクリップボードへコピーする
+        converter.handoff_threshold_kb = 0
+        assert not converter.should_hand_off("a" * 10 ** 6)
+
+    @patch('builtins.print')
+    @patch('main.parse_medical_lines')
+    @patch('tkinter.messagebox.showinfo')
+    def test_convert_to_json_memory_tracking(self, mock_showinfo, mock_parse_method, mock_print):
+        """メモリ計測を有効にしたJSON変換のテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.memory_tracking = 1
+        converter.memory_label = Mock()
+        converter.clipboard = Mock()
+        mock_text_input.get.return_value = "医療テキスト\n"
+        mock_parse_method.side_effect = lambda lines: [{"date": "2024/05/26", "content": "".join(lines)}]
+
+        # テスト実行
+        converter.convert_to_json()
+
+        # 検証
+        label_text = converter.memory_label.config.call_args[1]['text']
+        assert "変換: 最大" in label_text
+        assert "JSON化: 最大" in label_text
+        assert "多い箇所: " in label_text
+        assert "医療テキスト" in converter.clipboard.copy.call_args[0][0]
+        assert "メモリ 変換: 最大" in mock_print.call_args[0][0]
+        converter.clipboard.copy.assert_called_once()
+        mock_showinfo.assert_called_with("完了", "JSON形式に変換しコピーしました")
+
+    @patch('builtins.print')
+    @patch('main.parse_medical_lines')
+    @patch('tkinter.messagebox.showerror')
+    def test_convert_to_json_memory_budget_exceeded(self, mock_showerror, mock_parse_method, mock_print):
+        """メモリ使用量の上限を超えた場合のテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.memory_budget_mb = 1
+        converter.memory_label = Mock()
+        converter.clipboard = Mock()
+        mock_text_input.get.return_value = "医療テキスト\n"
+        mock_parse_method.side_effect = lambda lines: [bytearray(2 * 1024 * 1024)]
+
+        # テスト実行
+        converter.convert_to_json()
+
+        # 検証 - 上限を超えた時点で中止し、コピーしない
+        converter.clipboard.copy.assert_not_called()
+        args = mock_showerror.call_args[0]
+        assert "メモリ使用量が上限を超えたため中止しました" in args[1]
+        assert "変換: 最大" in converter.memory_label.config.call_args[1]['text']
+
     @patch('tkinter.messagebox.showwarning')
     def test_convert_to_json_empty_text(self, mock_showwarning):
         """空テキストでのJSON変換テスト"""
@@ -321,31 +742,37 @@ class TestMedicalTextConverter:
         assert args[0] == "エラー"
         assert "変換中にエラーが発生しました" in args[1]
 
-    @patch('services.mouse_automation.main')
+    @patch('services.mouse_automation.get_helper_command')
     @patch('tkinter.messagebox.showerror')
-    def test_run_mouse_automation_success(self, mock_showerror, mock_mouse_main):
+    def test_run_mouse_automation_success(self, mock_showerror, mock_get_command):
         """マウス自動化実行成功のテスト"""
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
 
+        mock_get_command.return_value = [r'C:\test\mouse_operation.exe']
+        converter.automation_runner = Mock()
+
         # show_notificationメソッドをモック
         converter.show_notification = Mock()
 
         # テスト実行
         converter.run_mouse_automation()
+        converter.automation_runner.submit.call_args[1]['on_done'](Mock(ok=True))
 
         # 検証
         converter.root.iconify.assert_called_once()
-        mock_mouse_main.assert_called_with()
+        mock_get_command.assert_called_with(None)
+        assert converter.automation_runner.submit.call_args[0] == ("mouse_operation", [r'C:\test\mouse_operation.exe'])
         converter.show_notification.assert_called_with("設定完了", timeout=2000)
 
-    @patch('services.mouse_automation.main')
+    @patch('services.mouse_automation.get_helper_command')
     @patch('tkinter.messagebox.showerror')
-    def test_run_mouse_automation_error(self, mock_showerror, mock_mouse_main):
+    def test_run_mouse_automation_error(self, mock_showerror, mock_get_command):
         """マウス自動化実行エラーのテスト"""
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
 
-        # エラーを発生させる
-        mock_mouse_main.side_effect = Exception("マウス操作エラー")
+        mock_get_command.return_value = [r'C:\test\mouse_operation.exe']
+        converter.automation_runner = Mock()
+        converter.automation_runner.submit.side_effect = Exception("マウス操作エラー")
 
         # テスト実行
         converter.run_mouse_automation()
@@ -356,7 +783,193 @@ class TestMedicalTextConverter:
         assert args[0] == "エラー"
         assert "マウス操作中にエラーが発生しました" in args[1]
 
-    @patch('main.TextEditor')
+    def test_run_capture_pipeline(self):
+        """一括変換開始のテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.capture_pipeline = Mock()
+        converter.is_monitoring_clipboard = True
+
+        # テスト実行
+        converter.run_capture_pipeline()
+
+        # 検証
+        assert converter.is_monitoring_clipboard is False
+        converter.root.iconify.assert_called_once()
+        converter.capture_pipeline.start.assert_called_once()
+
+    def test_on_pipeline_captured(self):
+        """一括変換の取り込み完了のテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.capture_pipeline.helper_job = None
+        job = Mock(job_id=3, text="カルテ本文")
+
+        # テスト実行
+        converter.on_pipeline_captured(job)
+
+        # 検証
+        converter.root.deiconify.assert_called_once()
+        assert converter.pipeline_display_id == 3
+        assert converter.input_document.text() == "カルテ本文"
+        mock_text_input.insert.assert_called_with(tk.END, "カルテ本文")
+
+    def test_on_pipeline_captured_keeps_window_minimized(self):
+        """次の患者の処理中は最小化したままにするテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.capture_pipeline.helper_job = Mock()
+
+        # テスト実行
+        converter.on_pipeline_captured(Mock(job_id=0, text="患者1"))
+
+        # 検証
+        converter.root.deiconify.assert_not_called()
+
+    @patch('builtins.print')
+    def test_on_pipeline_finished(self, mock_print):
+        """一括変換完了のテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.json_viewer = Mock()
+        converter.show_notification = Mock()
+        converter.pipeline_display_id = 1
+        job = Mock(job_id=1, parsed_data=[{"a": 1}], json_data='[{"a": 1}]', text="行1\n行2", timings={"parse": 0.1})
+        job.describe.return_value = "変換 0.10秒（合計 0.10秒）"
+
+        # テスト実行
+        converter.on_pipeline_finished(job)
+
+        # 検証
+        converter.json_viewer.set_records.assert_called_once_with([{"a": 1}], '[{"a": 1}]')
+        converter.show_notification.assert_called_once_with("コピーしました")
+        mock_print.assert_called_once_with("一括変換 #2: 変換 0.10秒（合計 0.10秒）")
+
+    @patch('builtins.print')
+    def test_on_pipeline_finished_stale_job(self, mock_print):
+        """古い結果で表示を上書きしないテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.json_viewer = Mock()
+        converter.show_notification = Mock()
+        converter.pipeline_display_id = 2
+
+        # テスト実行
+        converter.on_pipeline_finished(Mock(job_id=1, text="行1", timings={"parse": 0.1}))
+
+        # 検証
+        converter.json_viewer.set_records.assert_not_called()
+        converter.show_notification.assert_called_once_with("コピーしました")
+
+    @patch('tkinter.messagebox.showerror')
+    def test_on_pipeline_failed(self, mock_showerror):
+        """一括変換エラーのテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.capture_pipeline.helper_job = None
+
+        # テスト実行
+        converter.on_pipeline_failed(Mock(), "カルテコピー", "終了コード 1")
+
+        # 検証
+        converter.root.deiconify.assert_called_once()
+        mock_showerror.assert_called_once_with("エラー", "一括変換中にエラーが発生しました（カルテコピー）: 終了コード 1")
+
+    @patch('pyperclip.paste')
+    def test_check_clipboard_metrics(self, mock_paste):
+        """クリップボード確認の回数と追記数を数えるテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.is_monitoring_clipboard = True
+        converter.is_first_check = False
+        converter.clipboard_content = "古いコンテンツ"
+        converter.show_notification = Mock()
+        mock_paste.return_value = "新しいコンテンツ"
+
+        # テスト実行（2回目は内容が変わっていない）
+        converter.check_clipboard()
+        converter.check_clipboard()
+
+        # 検証
+        assert converter.clipboard_polls.value == 2
+        assert converter.clips_appended.value == 1
+        assert converter.clips_dropped.value == 0
+
+    @patch('pyperclip.copy')
+    @patch('main.parse_medical_text')
+    @patch('tkinter.messagebox.showinfo')
+    def test_convert_to_json_metrics(self, mock_showinfo, mock_parse_method, mock_copy_method):
+        """変換回数・行数・所要時間を記録するテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        mock_text_input.get.return_value = "行1\n行2\n行3\n"
+        mock_parse_method.return_value = []
+
+        # テスト実行
+        converter.convert_to_json()
+
+        # 検証
+        assert converter.conversions.value == 1
+        assert converter.converted_lines.value == 3
+        assert converter.conversion_seconds.labels().count == 1
+        assert converter.conversion_errors.value == 0
+
+    @patch('main.parse_medical_text')
+    @patch('tkinter.messagebox.showerror')
+    def test_convert_to_json_error_metrics(self, mock_showerror, mock_parse_method):
+        """変換エラーの回数を記録するテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        mock_text_input.get.return_value = "医療テキスト\n"
+        mock_parse_method.side_effect = ValueError("解析エラー")
+
+        # テスト実行
+        converter.convert_to_json()
+
+        # 検証
+        assert converter.conversion_errors.value == 1
+        assert converter.conversions.value == 0
+
+    def test_metrics_disabled_by_default(self):
+        """出力先が未設定の場合は書き出しを予約しないテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        assert converter.metrics_textfile_path == ''
+        assert converter.metrics_after_id is None
+
+    def test_write_metrics(self, tmp_path):
+        """メトリクスを書き出して次回を予約するテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        path = tmp_path / "txt2json.prom"
+        converter.metrics_textfile_path = str(path)
+        converter.metrics_write_interval = 15
+        converter.clipboard_polls.inc()
+
+        # テスト実行
+        converter.write_metrics()
+
+        # 検証
+        assert "txt2json_clipboard_polls_total 1\n" in path.read_text(encoding="utf-8")
+        assert "txt2json_helper_seconds" in path.read_text(encoding="utf-8")
+        converter.root.after.assert_called_with(15000, converter.write_metrics)
+
+    @patch('builtins.print')
+    def test_write_metrics_error(self, mock_print, tmp_path):
+        """書き出しに失敗しても監視を続けるテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        converter.metrics_textfile_path = str(tmp_path / "存在しないフォルダ" / "txt2json.prom")
+        converter.metrics_write_interval = 15
+
+        # テスト実行
+        converter.write_metrics()
+
+        # 検証
+        assert mock_print.call_args[0][0].startswith("メトリクス書き出しエラー: ")
+        converter.root.after.assert_called_with(15000, converter.write_metrics)
+
+    @patch('services.txt_editor.TextEditor')
     def test_open_text_editor(self, mock_text_editor_method):
         """テキストエディタ開くテスト"""
         converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
@@ -408,7 +1021,25 @@ class TestMedicalTextConverter:
             geometry_calls = mock_popup.geometry.call_args_list
             assert geometry_calls[0] == (("200x100",),)
             assert geometry_calls[1] == (("+100+100",),)
-            mock_popup.after.assert_called_with(1000, mock_popup.destroy)
+            mock_label_instance.config.assert_called_with(text="テストメッセージ")
+            mock_popup.after.assert_called_with(1000, converter.toast.expire)
+
+    def test_show_notification_coalesces(self):
+        """連続した通知でウィンドウを使い回し、回数をまとめるテスト"""
+        converter, mock_text_input, mock_text_output, mock_stats_label, mock_monitor_status_label, mock_copy, mock_parse, mock_text_editor = self.create_mock_converter()
+
+        with patch('tkinter.Toplevel') as mock_toplevel, \
+                patch('tkinter.Label') as mock_notification_label:
+            mock_label_instance = Mock()
+            mock_notification_label.return_value = mock_label_instance
+
+            # テスト実行
+            for _ in range(5):
+                converter.show_notification("コピーしました")
+
+            # 検証
+            mock_toplevel.assert_called_once_with(converter.root)
+            mock_label_instance.config.assert_called_with(text="コピーしました ×5")
 
 
 class TestMedicalTextConverterIntegration:
@@ -420,19 +1051,21 @@ class TestMedicalTextConverterIntegration:
     @patch('tkinter.scrolledtext.ScrolledText')
     @patch('tkinter.Label')
     @patch('tkinter.Button')
+    @patch('tkinter.Entry')
     @patch('main.parse_medical_text')
     @patch('pyperclip.copy')
     @patch('tkinter.messagebox.showinfo')
-    @patch('main.TextEditor')
+    @patch('services.txt_editor.TextEditor')
     def test_full_conversion_workflow(self, mock_text_editor, mock_showinfo, mock_copy, mock_parse_method,
-                                      mock_button, mock_label, mock_scrolled_text,
+                                      mock_entry, mock_button, mock_label, mock_scrolled_text,
                                       mock_labelframe, mock_frame, mock_load_config):
         """完全な変換ワークフローの統合テスト"""
         from main import MedicalTextConverter
 
         # 設定とモックの準備
         mock_config = Mock()
-        mock_config.getint.return_value = 11
+        # メモリ計測は既定どおり無効にする
+        mock_config.getint.side_effect = lambda section, key, fallback=None: 0 if key.startswith('memory_') else 11
         mock_config.get.return_value = 'Yu Gothic UI'
         mock_load_config.return_value = mock_config
 
@@ -465,7 +1098,7 @@ class TestMainFunction:
     @patch('main.MedicalTextConverter')
     @patch('tkinter.Tk')
     @patch('main.parse_medical_text')
-    @patch('main.TextEditor')
+    @patch('services.txt_editor.TextEditor')
     def test_main_execution(self, mock_text_editor, mock_parse, mock_tk, mock_converter_class):
         """メイン実行のテスト"""
         from main import MedicalTextConverter
@@ -0,0 +1,95 @@
+import tracemalloc
+
+import pytest
+
+from services.memory_tracker import MemoryBudgetExceeded, MemoryTracker, format_bytes
+
+
+class TestFormatBytes:
+    """format_bytes関数のテスト"""
+
+    def test_units(self):
+        """単位の切り替えテスト"""
+        assert format_bytes(512) == "512B"
+        assert format_bytes(1536) == "1.5KB"
+        assert format_bytes(3 * 1024 * 1024) == "3.0MB"
+        assert format_bytes(5 * 1024 ** 3) == "5120.0MB"
+
+
+class TestMemoryTracker:
+    """MemoryTrackerのテスト"""
+
+    def test_phase_stats(self):
+        """段階ごとの最大・保持メモリのテスト"""
+        with MemoryTracker() as tracker:
+            with tracker.phase("一時"):
+                temporary = bytearray(1024 * 1024)
+                del temporary
+            with tracker.phase("保持"):
+                kept = bytearray(512 * 1024)
+
+        temporary_phase, kept_phase = tracker.phases
+        assert temporary_phase.name == "一時"
+        assert temporary_phase.peak >= 1024 * 1024
+        assert temporary_phase.retained < 64 * 1024
+        assert kept_phase.retained >= 512 * 1024
+        assert len(kept) == 512 * 1024
+
+    def test_stops_tracing(self):
+        """計測を開始した場合は終了時に停止するテスト"""
+        was_tracing = tracemalloc.is_tracing()
+
+        with MemoryTracker():
+            assert tracemalloc.is_tracing()
+
+        assert tracemalloc.is_tracing() == was_tracing
+
+    def test_budget_exceeded_at_phase_end(self):
+        """段階の終了時に上限を確認するテスト"""
+        with MemoryTracker(budget=256 * 1024) as tracker:
+            with pytest.raises(MemoryBudgetExceeded) as error:
+                with tracker.phase("変換"):
+                    data = bytearray(1024 * 1024)
+
+        assert error.value.phase == "変換"
+        assert error.value.used >= 1024 * 1024
+        assert "上限 256.0KB" in str(error.value)
+        assert len(tracker.phases) == 1
+        del data
+
+    def test_guard_aborts_while_reading(self):
+        """入力を読み進める途中で中止するテスト"""
+        kept = []
+
+        def lines():
+            for _ in range(100):
+                kept.append(bytearray(64 * 1024))
+                yield "行\n"
+
+        with MemoryTracker(budget=1024 * 1024, check_every=1) as tracker:
+            with pytest.raises(MemoryBudgetExceeded):
+                with tracker.phase("変換"):
+                    for _ in tracker.guard(lines()):
+                        pass
+
+        assert len(kept) < 100
+
+    def test_top_sites_and_report(self):
+        """割り当て箇所の上位と表示のテスト"""
+        with MemoryTracker(top=2) as tracker:
+            with tracker.phase("変換"):
+                data = [bytearray(256 * 1024)]
+            sites = tracker.capture_top_sites()
+
+        assert 1 <= len(sites) <= 2
+        assert sites[0][0].startswith("test_memory_tracker.py:")
+        assert tracker.summary().startswith("変換: 最大")
+        assert "多い箇所: test_memory_tracker.py:" in tracker.summary()
+        report = tracker.report().splitlines()
+        assert report[0].startswith("メモリ 変換: 最大")
+        assert "test_memory_tracker.py" in report[1]
+        del data
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from services.automation_runner import LatencyHistogram
+from services.metrics import MetricsRegistry, count_lines, format_labels, format_value
+
+
+class TestFormatting:
+    """出力形式の補助関数のテスト"""
+
+    def test_format_value(self):
+        """数値の表記テスト"""
+        assert format_value(3) == "3"
+        assert format_value(2.0) == "2"
+        assert format_value(0.25) == "0.25"
+        assert format_value(float('inf')) == "+Inf"
+
+    def test_format_labels_escape(self):
+        """ラベル値のエスケープテスト"""
+        assert format_labels([]) == ""
+        assert format_labels([("helper", 'a"b\\c\nd')]) == '{helper="a\\"b\\\\c\\nd"}'
+
+    def test_count_lines(self):
+        """行数の数え方のテスト"""
+        assert count_lines("") == 0
+        assert count_lines("行1") == 1
+        assert count_lines("行1\n行2\n") == 2
+        assert count_lines("行1\n行2") == 2
+
+
+class TestMetricsRegistry:
+    """MetricsRegistryのテスト"""
+
+    def test_counter(self):
+        """カウンターの出力テスト"""
+        registry = MetricsRegistry()
+        counter = registry.counter("txt2json_polls_total", "確認回数")
+        counter.inc()
+        counter.inc(4)
+
+        text = registry.render()
+        assert "# HELP txt2json_polls_total 確認回数\n" in text
+        assert "# TYPE txt2json_polls_total counter\n" in text
+        assert "txt2json_polls_total 5\n" in text
+
+    def test_histogram_cumulative(self):
+        """ヒストグラムのバケットが累積で出力されるテスト"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("txt2json_seconds", "所要時間", (0.1, 1, float('inf')))
+        for seconds in (0.05, 0.5, 0.7, 3):
+            histogram.observe(seconds)
+
+        lines = registry.render().splitlines()
+        assert "# TYPE txt2json_seconds histogram" in lines
+        assert 'txt2json_seconds_bucket{le="0.1"} 1' in lines
+        assert 'txt2json_seconds_bucket{le="1"} 3' in lines
+        assert 'txt2json_seconds_bucket{le="+Inf"} 4' in lines
+        assert "txt2json_seconds_sum 4.25" in lines
+        assert "txt2json_seconds_count 4" in lines
+
+    def test_histogram_without_observations(self):
+        """未計測でも0件として出力されるテスト"""
+        registry = MetricsRegistry()
+        registry.histogram("txt2json_seconds", "所要時間", (1, float('inf')))
+
+        lines = registry.render().splitlines()
+        assert 'txt2json_seconds_bucket{le="+Inf"} 0' in lines
+        assert "txt2json_seconds_count 0" in lines
+
+    def test_histogram_family_shares_children(self):
+        """既存の集計辞書をラベル付きで出力するテスト"""
+        histograms = {}
+        registry = MetricsRegistry()
+        registry.histogram_family("txt2json_helper_seconds", "補助プログラム", "helper", histograms)
+        histograms["soap_copy"] = LatencyHistogram((1, 5))
+        histograms["soap_copy"].observe(2)
+
+        lines = registry.render().splitlines()
+        assert 'txt2json_helper_seconds_bucket{helper="soap_copy",le="1"} 0' in lines
+        assert 'txt2json_helper_seconds_bucket{helper="soap_copy",le="5"} 1' in lines
+        # 上限のないバケットを補う
+        assert 'txt2json_helper_seconds_bucket{helper="soap_copy",le="+Inf"} 1' in lines
+        assert 'txt2json_helper_seconds_count{helper="soap_copy"} 1' in lines
+
+    def test_histogram_family_labels(self):
+        """labelsで子のヒストグラムを作成するテスト"""
+        registry = MetricsRegistry()
+        family = registry.histogram_family("txt2json_stage_seconds", "段階", "stage", buckets=(1,))
+        family.labels("parse").observe(0.5)
+
+        assert family.labels("parse").count == 1
+        assert 'txt2json_stage_seconds_count{stage="parse"} 1' in registry.render()
+
+    def test_write_textfile(self, tmp_path):
+        """テキストファイルへの書き出しテスト"""
+        registry = MetricsRegistry()
+        registry.counter("txt2json_polls_total", "確認回数").inc()
+        path = tmp_path / "txt2json.prom"
+
+        registry.write_textfile(str(path))
+
+        assert path.read_text(encoding="utf-8") == registry.render()
+        assert os.listdir(tmp_path) == ["txt2json.prom"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
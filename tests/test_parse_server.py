@@ -0,0 +1,231 @@
+import http.client
+import json
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cli import main
+from services.parse_server import ServerMetrics, create_server
+
+SAMPLE_TEXT = """2024/05/26(日)
+内科 田中医師 外来 14:30
+S>
+頭痛があります
+"""
+
+
+@pytest.fixture
+def server():
+    server = create_server("127.0.0.1", 0, workers=4, max_body_bytes=1024)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read().decode("utf-8"))
+    finally:
+        connection.close()
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Unixソケット経由で接続するHTTPConnection"""
+
+    def __init__(self, path):
+        super().__init__("localhost", timeout=5)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class TestServerMetrics:
+    """ServerMetricsのテスト"""
+
+    def test_snapshot(self):
+        """集計値のテスト"""
+        metrics = ServerMetrics()
+        metrics.begin()
+        metrics.end(0.002)
+        metrics.begin()
+        metrics.end(0.5, ok=False)
+        metrics.begin()
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["requests"] == 3
+        assert snapshot["errors"] == 1
+        assert snapshot["in_flight"] == 1
+        assert snapshot["parse_count"] == 1
+        assert snapshot["parse_seconds_buckets"]["0.005"] == 1
+        assert snapshot["parse_seconds_buckets"]["+Inf"] == 0
+
+
+class TestParseServer:
+    """変換サーバーのテスト"""
+
+    def test_health(self, server):
+        """ヘルスチェックのテスト"""
+        status, data = request(server, "GET", "/health")
+
+        assert status == 200
+        assert data["status"] == "ok"
+
+    def test_parse(self, server):
+        """変換のテスト"""
+        status, data = request(server, "POST", "/parse", SAMPLE_TEXT.encode("utf-8"))
+
+        assert status == 200
+        assert data[0]["subject"] == "頭痛があります"
+        assert data[0]["timestamp"] == "2024-05-26T14:30:00Z"
+
+    def test_metrics(self, server):
+        """メトリクスのテスト"""
+        request(server, "POST", "/parse", SAMPLE_TEXT.encode("utf-8"))
+
+        status, data = request(server, "GET", "/metrics")
+
+        assert status == 200
+        assert data["requests"] == 1
+        assert data["parse_count"] == 1
+        assert data["in_flight"] == 0
+
+    def test_keep_alive(self, server):
+        """1つの接続で複数回変換できるテスト"""
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        try:
+            for _ in range(3):
+                connection.request("POST", "/parse", body=SAMPLE_TEXT.encode("utf-8"))
+                response = connection.getresponse()
+                assert response.status == 200
+                response.read()
+        finally:
+            connection.close()
+
+    def test_concurrent_clients(self, server):
+        """複数クライアントからの同時要求のテスト"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: request(server, "POST", "/parse", SAMPLE_TEXT.encode("utf-8")), range(16)))
+
+        assert all(status == 200 for status, _ in results)
+        assert request(server, "GET", "/metrics")[1]["requests"] == 16
+
+    def test_not_found(self, server):
+        """未定義のパスのテスト"""
+        assert request(server, "GET", "/unknown")[0] == 404
+        assert request(server, "POST", "/unknown", b"")[0] == 404
+
+    def test_body_too_large(self, server):
+        """本文サイズ上限のテスト"""
+        status, data = request(server, "POST", "/parse", b"a" * 2048)
+
+        assert status == 413
+        assert "本文が大きすぎます" in data["error"]
+
+    def test_negative_content_length(self, server):
+        """負のContent-Lengthのテスト"""
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        try:
+            connection.putrequest("POST", "/parse")
+            connection.putheader("Content-Length", "-1")
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == 400
+            assert "Content-Length" in json.loads(response.read())["error"]
+        finally:
+            connection.close()
+
+    def test_busy(self):
+        """処理待ちの上限を超えた接続に503を返すテスト"""
+        server = create_server("127.0.0.1", 0, workers=1, max_pending=0)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        idle = socket.create_connection(("127.0.0.1", server.server_address[1]), timeout=5)
+        try:
+            # 要求を送らない接続でワーカーを占有させる
+            status, data = request(server, "GET", "/health")
+            assert status == 503
+            assert "多すぎます" in data["error"]
+        finally:
+            idle.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_invalid_encoding(self, server):
+        """UTF-8以外の本文のテスト"""
+        status, data = request(server, "POST", "/parse", SAMPLE_TEXT.encode("cp932"))
+
+        assert status == 400
+        assert request(server, "GET", "/metrics")[1]["errors"] == 1
+
+    @patch('services.parse_server.parse_medical_text')
+    def test_parse_error(self, mock_parse, server):
+        """変換エラーのテスト"""
+        mock_parse.side_effect = Exception("解析エラー")
+
+        status, data = request(server, "POST", "/parse", b"text")
+
+        assert status == 500
+        assert "解析エラー" in data["error"]
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unixソケット非対応の環境")
+    def test_unix_socket(self, tmp_path):
+        """Unixソケットでの待ち受けのテスト"""
+        path = str(tmp_path / "txt2json.sock")
+        server = create_server(unix_path=path, workers=2)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        try:
+            connection = UnixHTTPConnection(path)
+            connection.request("POST", "/parse", body=SAMPLE_TEXT.encode("utf-8"))
+            response = connection.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read())[0]["subject"] == "頭痛があります"
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert not os.path.exists(path)
+
+
+class TestServeCommand:
+    """serveサブコマンドのテスト"""
+
+    @patch('services.parse_server.create_server')
+    def test_serve(self, mock_create_server):
+        """引数を渡してサーバーを起動するテスト"""
+        mock_server = Mock()
+        mock_server.server_address = ("127.0.0.1", 9000)
+        mock_create_server.return_value = mock_server
+
+        assert main(["serve", "--port", "9000", "--workers", "2", "--max-body-kb", "1", "--max-pending", "3"]) == 0
+
+        mock_create_server.assert_called_once_with("127.0.0.1", 9000, None, 2, 1024, 3)
+        mock_server.serve_forever.assert_called_once()
+        mock_server.server_close.assert_called_once()
+
+    @patch('services.parse_server.create_server')
+    def test_serve_bind_error(self, mock_create_server, capsys):
+        """待ち受けに失敗した場合のテスト"""
+        mock_create_server.side_effect = OSError("使用中のポート")
+
+        assert main(["serve"]) == 1
+        assert "待ち受けを開始できません" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
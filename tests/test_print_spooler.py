@@ -0,0 +1,149 @@
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.automation_runner import HelperResult
+from services.print_spooler import PrintSpooler, build_print_command, print_file
+from tests.test_automation_runner import ImmediateDispatcher
+
+PRINTER = os.path.join(os.path.dirname(__file__), "helpers", "stand_in_printer.py")
+
+
+class TestBuildPrintCommand:
+    """印刷コマンドの組み立てのテスト"""
+
+    def test_append_path(self):
+        """ファイルの位置を末尾に追加するテスト"""
+        assert build_print_command("notepad /p", "C:\\temp\\print 1.txt") == ["notepad", "/p", "C:\\temp\\print 1.txt"]
+
+    def test_file_placeholder(self):
+        """{file}の位置にファイルを渡すテスト"""
+        assert build_print_command("lpr {file} -P office", "/tmp/a.txt") == ["lpr", "/tmp/a.txt", "-P", "office"]
+
+    def test_quoted_program(self):
+        """引用符で囲んだ実行ファイルのテスト"""
+        assert build_print_command('"/opt/print tool/print" -q', "/tmp/a.txt") == ["/opt/print tool/print", "-q",
+                                                                                   "/tmp/a.txt"]
+
+    @pytest.mark.parametrize("platform, expected", [("win32", ["notepad", "/p"]), ("linux", ["lpr"])])
+    def test_default(self, platform, expected):
+        """未設定の場合は環境に応じた既定のコマンドを使うテスト"""
+        with patch("sys.platform", platform):
+            assert build_print_command("", "a.txt") == expected + ["a.txt"]
+
+
+class TestPrintFile:
+    """print_file関数のテスト"""
+
+    def test_removes_file(self, tmp_path):
+        """印刷が終わると一時ファイルを削除するテスト"""
+        path = tmp_path / "print_1.txt"
+        path.write_text("テキスト", encoding="utf-8")
+        output_path = tmp_path / "printed.txt"
+
+        result = print_file([sys.executable, PRINTER, str(output_path), str(path)], str(path), 10)
+
+        assert result.ok
+        assert output_path.read_text(encoding="utf-8") == "テキスト"
+        assert not path.exists()
+
+    def test_removes_file_on_error(self, tmp_path):
+        """印刷コマンドを起動できない場合も一時ファイルを削除するテスト"""
+        path = tmp_path / "print_1.txt"
+        path.write_text("テキスト", encoding="utf-8")
+
+        with pytest.raises(OSError):
+            print_file([str(tmp_path / "存在しないコマンド")], str(path), 10)
+
+        assert not path.exists()
+
+
+class TestPrintSpooler:
+    """PrintSpoolerのテスト"""
+
+    def test_print_with_stand_in(self, tmp_path):
+        """代わりのコマンドで印刷し、一時ファイルを削除するテスト"""
+        output_path = tmp_path / "printed.txt"
+        command = f'"{sys.executable}" "{PRINTER}" "{output_path}" {{file}}'
+        statuses = []
+        spooler = PrintSpooler(ImmediateDispatcher(), command, timeout=10,
+                               on_status=lambda job, message: statuses.append((job.job_id, message)))
+
+        job = spooler.submit("印刷するテキスト\n")
+        spooler.shutdown()
+
+        assert output_path.read_text(encoding="utf-8") == "印刷するテキスト\n"
+        assert not os.path.exists(job.path)
+        assert job.result.ok
+        assert statuses == [(1, "印刷待ち"), (1, "印刷しました")]
+        assert spooler.pending == 0
+
+    def test_failed_job(self):
+        """印刷コマンドが失敗した場合のテスト"""
+        dispatcher = Mock()
+        statuses = []
+        spooler = PrintSpooler(dispatcher, "lpr", on_status=lambda job, message: statuses.append(message))
+
+        job = spooler.submit("テキスト")
+        os.unlink(job.path)
+        dispatcher.submit.call_args[1]["on_done"](HelperResult("print", 1, 0.1))
+
+        assert statuses == ["印刷待ち", "印刷に失敗しました（終了コード 1）"]
+        assert spooler.pending == 0
+
+    def test_error(self):
+        """印刷コマンドを起動できない場合のテスト"""
+        dispatcher = Mock()
+        statuses = []
+        spooler = PrintSpooler(dispatcher, "lpr", on_status=lambda job, message: statuses.append(message))
+
+        job = spooler.submit("テキスト")
+        os.unlink(job.path)
+        dispatcher.submit.call_args[1]["on_error"](FileNotFoundError("lpr"))
+
+        assert statuses[-1] == "印刷に失敗しました: lpr"
+        assert spooler.pending == 0
+
+    def test_submit_failure_removes_file(self):
+        """キューに追加できない場合も一時ファイルを削除するテスト"""
+        spooler = PrintSpooler(ImmediateDispatcher(), "lpr")
+        spooler.shutdown()
+
+        with patch("services.print_spooler.build_print_command", wraps=build_print_command) as mock_build:
+            with pytest.raises(RuntimeError):
+                spooler.submit("テキスト")
+
+        assert not os.path.exists(mock_build.call_args[0][1])
+        assert spooler.pending == 0
+
+    def test_queued_jobs_finish_after_shutdown(self, tmp_path):
+        """画面を閉じた後も受け付け済みの印刷を終え、一時ファイルを削除するテスト"""
+        output_path = tmp_path / "printed.txt"
+        command = f'"{sys.executable}" "{PRINTER}" "{output_path}" {{file}}'
+        dispatcher = Mock()
+        dispatcher.submit.side_effect = lambda executor, func, *args, **kwargs: executor.submit(func, *args)
+        spooler = PrintSpooler(dispatcher, command, timeout=10)
+
+        job = spooler.submit("テキスト")
+        spooler.shutdown()
+        dispatcher.submit.call_args[0][0].shutdown(wait=True)
+
+        assert output_path.read_text(encoding="utf-8") == "テキスト"
+        assert not os.path.exists(job.path)
+
+    def test_job_ids(self):
+        """ジョブ番号を順に振るテスト"""
+        spooler = PrintSpooler(Mock(), "lpr")
+
+        jobs = [spooler.submit("テキスト") for _ in range(3)]
+
+        assert [job.job_id for job in jobs] == [1, 2, 3]
+        assert spooler.pending == 3
+        for job in jobs:
+            os.unlink(job.path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
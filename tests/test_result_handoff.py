@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from services.result_handoff import (
+    default_handoff_dir,
+    describe_handoff,
+    exceeds_encoded_size,
+    prune_result_files,
+    write_result_file,
+)
+
+
+class TestWriteResultFile:
+    """変換結果の書き出しのテスト"""
+
+    def test_write(self, tmp_path):
+        """指定したフォルダに書き出すテスト"""
+        json_data = json.dumps([{"subject": "頭痛"}], ensure_ascii=False)
+
+        path, size = write_result_file(str(tmp_path / "out"), json_data)
+
+        assert os.path.dirname(path) == str(tmp_path / "out")
+        assert os.path.basename(path).startswith("txt2json_")
+        assert path.endswith(".json")
+        with open(path, encoding="utf-8") as file:
+            assert json.load(file) == [{"subject": "頭痛"}]
+        assert size == len(json_data.encode("utf-8"))
+
+    def test_unique_names(self, tmp_path):
+        """続けて書き出しても上書きしないテスト"""
+        first, _ = write_result_file(str(tmp_path), "[]")
+        second, _ = write_result_file(str(tmp_path), "[]")
+
+        assert first != second
+
+    def test_default_dir(self):
+        """未指定の場合は一時フォルダ内に書き出すテスト"""
+        path, _ = write_result_file("", "[]")
+        try:
+            assert os.path.dirname(path) == default_handoff_dir()
+        finally:
+            os.unlink(path)
+
+
+    def test_keep_newest(self, tmp_path):
+        """指定した件数を超えた古いファイルを削除するテスト"""
+        paths = []
+        for index in range(4):
+            path, _ = write_result_file(str(tmp_path), "[]", keep=2)
+            os.utime(path, ns=(index * 10 ** 9, index * 10 ** 9))
+            paths.append(path)
+
+        assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths[-2:])
+
+    def test_prune_only_results(self, tmp_path):
+        """変換結果以外のファイルは削除しないテスト"""
+        (tmp_path / "memo.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "txt2json_old.json").write_text("[]", encoding="utf-8")
+
+        prune_result_files(str(tmp_path), 0)
+
+        assert os.listdir(tmp_path) == ["memo.json"]
+
+
+class TestExceedsEncodedSize:
+    """書き出しの閾値の判定のテスト"""
+
+    @pytest.mark.parametrize("text, limit, expected", [
+        ("a" * 10, 10, False),
+        ("a" * 11, 10, True),
+        ("あ" * 3, 9, False),
+        ("あ" * 4, 9, True),
+        ("a" * 2, 9, False),
+    ])
+    def test_utf8_bytes(self, text, limit, expected):
+        """UTF-8のバイト数で比べるテスト"""
+        assert exceeds_encoded_size(text, limit) is expected
+
+
+class TestDescribeHandoff:
+    """クリップボードに載せる内容のテスト"""
+
+    def test_path(self):
+        """場所のみをコピーするテスト"""
+        assert describe_handoff("/tmp/a.json", 3, 2048) == "/tmp/a.json"
+
+    def test_summary(self):
+        """件数と大きさを添えるテスト"""
+        assert describe_handoff("/tmp/a.json", 3, 2048, "summary") == "変換結果 3件（2.0KB）: /tmp/a.json"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from cli import main
+from services.sharded_writer import ShardedWriter, parse_shard_by, safe_name, shard_path
+
+
+def make_record(timestamp, department, subject="所見"):
+    return {"timestamp": timestamp, "department": department, "subject": subject}
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+class TestShardPath:
+    """分割先の決定のテスト"""
+
+    def test_parse_shard_by(self):
+        """分割方法の解析テスト"""
+        assert parse_shard_by("month,department") == ("month", "department")
+        assert parse_shard_by(" department ") == ("department",)
+
+    def test_parse_shard_by_invalid(self):
+        """不正な分割方法のテスト"""
+        with pytest.raises(ValueError):
+            parse_shard_by("year")
+        with pytest.raises(ValueError):
+            parse_shard_by("")
+
+    def test_shard_path(self):
+        """月・診療科による分割先のテスト"""
+        record = make_record("2024-05-26T14:30:00Z", "内科")
+
+        assert shard_path(record, ("month", "department")) == os.path.join("2024-05", "内科.jsonl")
+        assert shard_path(record, ("month",)) == "2024-05.jsonl"
+        assert shard_path(record, ("department",)) == "内科.jsonl"
+
+    def test_shard_path_missing_values(self):
+        """日付・診療科がない場合のテスト"""
+        record = make_record(None, "")
+
+        assert shard_path(record, ("month", "department")) == os.path.join("日付不明", "不明.jsonl")
+
+    def test_safe_name(self):
+        """ファイル名に使えない文字の置き換えテスト"""
+        assert safe_name("内科/外科") == "内科_外科"
+        assert safe_name("..") == "不明"
+        assert safe_name("内科. ") == "内科"
+
+
+class TestShardedWriter:
+    """ShardedWriterのテスト"""
+
+    def test_write_partitions(self, tmp_path):
+        """分割先ごとにJSONLを書き出すテスト"""
+        records = [
+            make_record("2024-05-26T14:30:00Z", "内科", "1"),
+            make_record("2024-05-27T09:00:00Z", "外科", "2"),
+            make_record("2024-06-01T10:00:00Z", "内科", "3"),
+            make_record("2024-05-28T11:00:00Z", "内科", "4"),
+        ]
+
+        with ShardedWriter(str(tmp_path), ("month", "department"), writers=3) as writer:
+            for record in records:
+                writer.write(record)
+
+        assert [r["subject"] for r in read_jsonl(tmp_path / "2024-05" / "内科.jsonl")] == ["1", "4"]
+        assert [r["subject"] for r in read_jsonl(tmp_path / "2024-05" / "外科.jsonl")] == ["2"]
+        assert [r["subject"] for r in read_jsonl(tmp_path / "2024-06" / "内科.jsonl")] == ["3"]
+        assert writer.counts[os.path.join("2024-05", "内科.jsonl")] == 2
+
+    def test_reopen_after_eviction(self, tmp_path):
+        """開いたファイル数の上限を超えても追記を続けるテスト"""
+        with ShardedWriter(str(tmp_path), ("department",), writers=1, max_open_files=1) as writer:
+            for index in range(6):
+                writer.write(make_record("2024-05-26T14:30:00Z", "内科" if index % 2 else "外科", str(index)))
+
+        assert [r["subject"] for r in read_jsonl(tmp_path / "内科.jsonl")] == ["1", "3", "5"]
+        assert [r["subject"] for r in read_jsonl(tmp_path / "外科.jsonl")] == ["0", "2", "4"]
+
+    def test_overwrite_previous_run(self, tmp_path):
+        """前回の出力を上書きするテスト"""
+        for subject in ("前回", "今回"):
+            with ShardedWriter(str(tmp_path), ("department",)) as writer:
+                writer.write(make_record("2024-05-26T14:30:00Z", "内科", subject))
+
+        assert [r["subject"] for r in read_jsonl(tmp_path / "内科.jsonl")] == ["今回"]
+
+    def test_back_pressure(self, tmp_path):
+        """書き込みが追いつかない場合に待つテスト"""
+        release = threading.Event()
+        writer = ShardedWriter(str(tmp_path), ("department",), writers=1, queue_size=1)
+        original = writer.threads[0].get_file
+        writer.threads[0].get_file = lambda path: release.wait(5) and original(path)
+
+        record = make_record("2024-05-26T14:30:00Z", "内科")
+        writer.write(record)
+        writer.write(record)
+        blocked = threading.Thread(target=writer.write, args=(record,))
+        blocked.start()
+        blocked.join(0.2)
+
+        assert blocked.is_alive()
+        release.set()
+        blocked.join(5)
+        writer.close()
+        assert len(read_jsonl(tmp_path / "内科.jsonl")) == 3
+
+    def test_write_error(self, tmp_path):
+        """書き込みエラーを閉じる時に通知するテスト"""
+        writer = ShardedWriter(str(tmp_path), ("department",), writers=1)
+
+        with patch("builtins.open", side_effect=OSError("書き込み不可")):
+            writer.write(make_record("2024-05-26T14:30:00Z", "内科"))
+            writer.write(make_record("2024-05-26T14:30:00Z", "内科"))
+            with pytest.raises(OSError):
+                writer.close()
+
+
+class TestShardCommand:
+    """--shard-byオプションのテスト"""
+
+    TEXT = """2024/05/26(日)
+内科 田中医師 外来 14:30
+S>
+頭痛があります
+2024/06/01(土)
+外科 佐藤医師 病棟 09:00
+P>
+経過観察
+"""
+
+    def test_shard_by_month_and_department(self, tmp_path, capsys):
+        """月・診療科ごとに分割して出力するテスト"""
+        input_path = tmp_path / "karte.txt"
+        input_path.write_text(self.TEXT, encoding="utf-8")
+        output_dir = tmp_path / "out"
+
+        assert main([str(input_path), "--shard-by", "month,department", "-o", str(output_dir)]) == 0
+
+        assert read_jsonl(output_dir / "2024-05" / "内科.jsonl")[0]["subject"] == "頭痛があります"
+        assert read_jsonl(output_dir / "2024-06" / "外科.jsonl")[0]["plan"] == "経過観察"
+        assert "2件を2ファイルに分割して出力しました" in capsys.readouterr().err
+
+    def test_shard_requires_output(self, tmp_path, capsys):
+        """出力先フォルダ未指定のテスト"""
+        assert main(["-", "--shard-by", "month"]) == 1
+        assert "出力先フォルダ" in capsys.readouterr().err
+
+    def test_invalid_shard_by(self, tmp_path, capsys):
+        """不正な分割方法のテスト"""
+        assert main(["-", "--shard-by", "year", "-o", str(tmp_path)]) == 1
+        assert "分割方法は" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,149 @@
+import codecs
+import io
+
+import pytest
+
+from services.text_decoding import (
+    SNIFF_BYTES,
+    decode_bytes,
+    iter_decoded_lines,
+    iter_file_lines,
+    sniff_encoding,
+)
+
+SAMPLE_TEXT = "2024/05/26(日)\r\n内科 田中医師 外来 14:30\r\nS>\r\n頭痛があります\r\n"
+
+
+class TrickleStream:
+    """指定したバイト数ずつしか返さないストリーム"""
+
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+        self.reads = 0
+
+    def read1(self, size):
+        self.reads += 1
+        chunk, self.data = self.data[:min(size, self.size)], self.data[min(size, self.size):]
+        return chunk
+
+
+class TestSniffEncoding:
+    """sniff_encoding関数のテスト"""
+
+    def test_utf8(self):
+        """UTF-8の判定テスト"""
+        assert sniff_encoding(SAMPLE_TEXT.encode("utf-8")) == "utf-8"
+
+    def test_cp932(self):
+        """CP932の判定テスト"""
+        assert sniff_encoding(SAMPLE_TEXT.encode("cp932")) == "cp932"
+
+    def test_ascii(self):
+        """ASCIIのみの場合のテスト"""
+        assert sniff_encoding(b"2024/05/26\n") == "utf-8"
+
+    def test_bom(self):
+        """BOM付きの判定テスト"""
+        assert sniff_encoding(codecs.BOM_UTF8 + b"abc") == "utf-8-sig"
+        assert sniff_encoding(SAMPLE_TEXT.encode("utf-16")) == "utf-16"
+
+    def test_truncated_multibyte(self):
+        """先頭部分の末尾で多バイト文字が途切れた場合のテスト"""
+        head = "頭痛".encode("utf-8")[:-1]
+
+        assert sniff_encoding(head) == "utf-8"
+        assert sniff_encoding(head, eof=True) == "cp932"
+
+    def test_invalid_falls_back_to_cp932(self):
+        """どちらとしても不正な場合のテスト"""
+        assert sniff_encoding(b"\xff\xff\xff") == "cp932"
+
+
+class TestIterDecodedLines:
+    """iter_decoded_lines関数のテスト"""
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "cp932", "utf-8-sig", "utf-16"])
+    def test_decode_lines(self, encoding):
+        """文字コードを判定して行ごとに返すテスト"""
+        lines = list(iter_decoded_lines(io.BytesIO(SAMPLE_TEXT.encode(encoding)), chunk_size=7))
+
+        assert "".join(lines) == SAMPLE_TEXT
+        assert lines[0] == "2024/05/26(日)\r\n"
+        assert len(lines) == 4
+
+    def test_multibyte_split_across_chunks(self):
+        """チャンク境界で分断された多バイト文字のテスト"""
+        data = ("あ" * 5000 + "\n" + "い" * 10).encode("cp932")
+
+        lines = list(iter_decoded_lines(io.BytesIO(data), chunk_size=3))
+
+        assert lines == ["あ" * 5000 + "\n", "い" * 10]
+
+    def test_ascii_head_then_cp932(self):
+        """先頭がASCIIのみの場合は非ASCIIが現れるまで読んで判定するテスト"""
+        text = "header\n" * 100 + "頭痛があります\n"
+
+        lines = list(iter_decoded_lines(io.BytesIO(text.encode("cp932")), chunk_size=16))
+
+        assert lines[-1] == "頭痛があります\n"
+
+    @pytest.mark.parametrize("chunk_size", [16, 1024, 64 * 1024])
+    def test_long_ascii_head_then_cp932(self, chunk_size):
+        """判定に使う先頭数KBを超えるASCIIの後にCP932が続くテスト"""
+        text = "header line\n" * (SNIFF_BYTES // 4) + "頭痛があります\n" + "あ" * 10
+
+        lines = list(iter_decoded_lines(io.BytesIO(text.encode("cp932")), chunk_size=chunk_size))
+
+        assert "".join(lines) == text
+
+    def test_reads_incrementally(self):
+        """全体を読み込む前に最初の行を返すテスト"""
+        stream = TrickleStream(("行\n" * 10000).encode("utf-8"), 64)
+
+        lines = iter_decoded_lines(stream, chunk_size=64)
+        assert next(lines) == "行\n"
+        assert stream.data
+
+    def test_explicit_encoding(self):
+        """文字コードを指定した場合のテスト"""
+        lines = list(iter_decoded_lines(io.BytesIO("あ\n".encode("euc-jp")), encoding="euc-jp"))
+
+        assert lines == ["あ\n"]
+
+    def test_empty(self):
+        """空の入力のテスト"""
+        assert list(iter_decoded_lines(io.BytesIO(b""))) == []
+
+    def test_decode_error(self):
+        """指定した文字コードで読めない場合のテスト"""
+        with pytest.raises(UnicodeDecodeError):
+            list(iter_decoded_lines(io.BytesIO(SAMPLE_TEXT.encode("cp932")), encoding="utf-8"))
+
+
+class TestFileHelpers:
+    """ファイル読み込み関連のテスト"""
+
+    def test_iter_file_lines(self, tmp_path):
+        """ファイルを行ごとに読むテスト"""
+        path = tmp_path / "karte.txt"
+        path.write_bytes(SAMPLE_TEXT.encode("cp932"))
+
+        assert list(iter_file_lines(str(path)))[3] == "頭痛があります\r\n"
+
+    def test_decode_bytes(self):
+        """バイト列をまとめて変換するテスト"""
+        data = ("あ" * SNIFF_BYTES).encode("cp932")
+
+        assert decode_bytes(data) == "あ" * SNIFF_BYTES
+        assert decode_bytes(b"abc", "ascii") == "abc"
+
+    def test_decode_bytes_long_ascii_head(self):
+        """長いASCIIの後にCP932が続くバイト列のテスト"""
+        text = "header line\n" * SNIFF_BYTES + "頭痛があります\n"
+
+        assert decode_bytes(text.encode("cp932")) == text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
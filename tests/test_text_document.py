@@ -0,0 +1,99 @@
+import pytest
+
+from services.text_document import TextDocument
+
+
+def widget_stats(text):
+    """ウィジェットのget("1.0", END)相当の文字列から統計を計算"""
+    text = text + "\n"
+    lines = text.count('\n')
+    chars = len(text) - lines
+    if text.strip() == "":
+        return 0, 0
+    return lines, chars
+
+
+class TestTextDocument:
+    """文書モデルのテスト"""
+
+    def test_append_first_chunk(self):
+        """最初のチャンク追加のテスト"""
+        document = TextDocument()
+
+        document.append("行1\n行2")
+
+        assert document.text() == "行1\n行2"
+        assert document.line_count == 2
+        assert document.has_content is True
+
+    def test_append_inserts_newline_between_chunks(self):
+        """チャンク間に改行が挿入されるテスト"""
+        document = TextDocument()
+
+        document.append("行1")
+        document.append("行2\n行3")
+
+        assert document.text() == "行1\n行2\n行3"
+        assert document.line_count == 3
+        assert document.length == len(document.text())
+
+    def test_append_after_blank_content(self):
+        """空白のみの内容の後は改行を挟まないテスト"""
+        document = TextDocument()
+
+        document.append("  ")
+        document.append("行1\n行2")
+
+        assert document.text() == "  行1\n行2"
+        assert document.line_count == 2
+        assert document.length == len(document.text())
+
+    def test_append_empty_text(self):
+        """空文字列は追加されないテスト"""
+        document = TextDocument()
+
+        document.append("")
+
+        assert document.chunks == []
+        assert document.stats() == (0, 0)
+
+    @pytest.mark.parametrize("chunks", [
+        ["行1\n行2\n行3"],
+        ["行1", "行2\n", "行3"],
+        ["   \n  ", "本文"],
+        ["\n\n", "  "],
+    ])
+    def test_stats_match_widget_counting(self, chunks):
+        """統計がウィジェットからの計算と一致するテスト"""
+        document = TextDocument()
+        for chunk in chunks:
+            document.append(chunk)
+
+        assert document.stats() == widget_stats(document.text())
+
+    def test_get_lines_across_chunks(self):
+        """チャンクをまたぐ行取得のテスト"""
+        document = TextDocument()
+        document.append("a\nb\nc")
+        document.append("d\ne")
+        document.append("f")
+
+        assert document.get_lines(0, 2) == ["a", "b"]
+        assert document.get_lines(2, 3) == ["c", "d", "e"]
+        assert document.get_lines(4, 10) == ["e", "f"]
+        assert document.get_lines(6, 10) == []
+
+    def test_clear(self):
+        """クリアのテスト"""
+        document = TextDocument()
+        document.append("行1\n行2")
+
+        document.clear()
+
+        assert document.text() == ""
+        assert document.line_count == 0
+        assert document.stats() == (0, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
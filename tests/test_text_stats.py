@@ -0,0 +1,91 @@
+from unittest.mock import Mock
+
+import pytest
+
+from services.text_stats import TextStats, count_widget_text, format_stats
+
+
+def make_widget(content):
+    """Tk側での集計結果を返すテキストウィジェットのモック"""
+    mock_widget = Mock()
+    mock_widget.search.return_value = "1.0" if content.strip() else ""
+    mock_widget.index.return_value = f"{content.count(chr(10)) + 1}.0"
+    mock_widget.count.return_value = (len(content),)
+    return mock_widget
+
+
+class TestCountWidgetText:
+    """ウィジェットの行数・文字数集計のテスト"""
+
+    def test_count_multiple_lines(self):
+        """複数行の集計テスト"""
+        assert count_widget_text(make_widget("行1\n行2\n行3")) == (3, 6)
+
+    def test_count_blank_text(self):
+        """空白のみの集計テスト"""
+        mock_widget = make_widget("  \n  ")
+
+        assert count_widget_text(mock_widget) == (0, 0)
+        mock_widget.count.assert_not_called()
+
+    def test_count_does_not_copy_text(self):
+        """全文を取得せずに集計するテスト"""
+        mock_widget = make_widget("本文")
+
+        count_widget_text(mock_widget)
+
+        mock_widget.get.assert_not_called()
+
+    @pytest.mark.parametrize("count_result, expected", [(5, (1, 5)), (None, (1, 0))])
+    def test_count_result_variants(self, count_result, expected):
+        """Text.countの戻り値の形式の違いに対応するテスト"""
+        mock_widget = make_widget("x")
+        mock_widget.count.return_value = count_result
+
+        assert count_widget_text(mock_widget) == expected
+
+
+class TestTextStats:
+    """統計表示コンポーネントのテスト"""
+
+    def test_schedule_debounces(self):
+        """連続入力で再計算がまとめられるテスト"""
+        mock_widget = make_widget("本文")
+        mock_widget.after.side_effect = ["after#1", "after#2"]
+        stats = TextStats(mock_widget, Mock(), delay=200)
+
+        stats.schedule()
+        stats.schedule()
+
+        mock_widget.after_cancel.assert_called_once_with("after#1")
+        mock_widget.after.assert_called_with(200, stats.refresh)
+        mock_widget.search.assert_not_called()
+
+    def test_refresh_updates_label(self):
+        """再計算でラベルが更新されるテスト"""
+        mock_label = Mock()
+        stats = TextStats(make_widget("行1\n行2"), mock_label)
+
+        stats.refresh()
+
+        mock_label.config.assert_called_with(text="行数: 2  文字数: 4")
+
+    def test_cancel_pending_refresh(self):
+        """予約済みの再計算を取り消すテスト"""
+        mock_widget = make_widget("")
+        mock_widget.after.return_value = "after#1"
+        stats = TextStats(mock_widget, Mock())
+        stats.schedule()
+
+        stats.cancel()
+        stats.cancel()
+
+        mock_widget.after_cancel.assert_called_once_with("after#1")
+
+    def test_format_stats(self):
+        """表示文字列のテスト"""
+        assert format_stats(3, 6) == "行数: 3  文字数: 6"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from services.tk_dispatch import TkDispatcher
+
+
+def wait_and_poll(dispatcher, future):
+    """ジョブ完了を待ってからメインスレッド側の処理を実行"""
+    try:
+        future.result(timeout=5)
+    except Exception:
+        pass
+    dispatcher.poll()
+
+
+class TestTkDispatcher:
+    """バックグラウンド処理結果をTkへ戻す仕組みのテスト"""
+
+    def test_on_done_called_on_poll(self):
+        """完了時コールバックがpollで呼ばれるテスト"""
+        mock_root = Mock()
+        dispatcher = TkDispatcher(mock_root, interval=30)
+        on_done = Mock()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = dispatcher.submit(executor, lambda x: x * 2, 21, on_done=on_done)
+            on_done.assert_not_called()
+            wait_and_poll(dispatcher, future)
+
+        mock_root.after.assert_called_with(30, dispatcher.poll)
+        on_done.assert_called_once_with(42)
+        assert dispatcher.pending == 0
+
+    def test_on_error_called(self):
+        """例外時コールバックのテスト"""
+        dispatcher = TkDispatcher(Mock())
+        on_done = Mock()
+        on_error = Mock()
+
+        def fail():
+            raise ValueError("失敗")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = dispatcher.submit(executor, fail, on_done=on_done, on_error=on_error)
+            wait_and_poll(dispatcher, future)
+
+        on_done.assert_not_called()
+        assert isinstance(on_error.call_args[0][0], ValueError)
+
+    def test_polling_stops_when_idle(self):
+        """処理中のジョブがなければポーリングを止めるテスト"""
+        mock_root = Mock()
+        dispatcher = TkDispatcher(mock_root)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = dispatcher.submit(executor, lambda: None)
+            wait_and_poll(dispatcher, future)
+
+        assert mock_root.after.call_count == 1
+
+    def test_polling_continues_while_pending(self):
+        """処理中のジョブがあればポーリングを続けるテスト"""
+        mock_root = Mock()
+        dispatcher = TkDispatcher(mock_root)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            dispatcher.submit(executor, lambda: None)
+            dispatcher.pending += 1  # 未完了のジョブを模擬
+            dispatcher.poll()
+            dispatcher.pending -= 1
+
+        assert mock_root.after.call_count >= 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.toast import Toast, format_toast
+
+
+@pytest.fixture
+def toast():
+    """Tkのウィンドウを作らずに通知を扱う"""
+    with patch('tkinter.Toplevel') as mock_toplevel, patch('tkinter.Label') as mock_label:
+        mock_toplevel.return_value = Mock()
+        mock_label.return_value = Mock()
+        yield Toast(Mock())
+
+
+def shown_text(toast):
+    return toast.label.config.call_args[1]["text"]
+
+
+class TestFormatToast:
+    """通知文の表示形式のテスト"""
+
+    def test_single(self):
+        """1回のみの場合は回数を表示しないテスト"""
+        assert format_toast("コピーしました", 1) == "コピーしました"
+
+    def test_multiple(self):
+        """複数回の場合は回数を表示するテスト"""
+        assert format_toast("コピーしました", 5) == "コピーしました ×5"
+
+
+class TestToast:
+    """Toastのテスト"""
+
+    def test_builds_window_once(self, toast):
+        """ウィンドウを一度だけ作成して使い回すテスト"""
+        toast.show("コピーしました", position="+10+10")
+        popup = toast.popup
+        toast.expire()
+        toast.show("コピーしました")
+
+        assert toast.popup is popup
+        popup.withdraw.assert_called_once()
+        popup.deiconify.assert_called()
+        assert shown_text(toast) == "コピーしました"
+
+    def test_coalesce_same_message(self, toast):
+        """表示中の同じ通知は回数をまとめ、表示時間を延長するテスト"""
+        toast.show("コピーしました", timeout=2000)
+        toast.show("コピーしました", timeout=2000)
+        toast.show("コピーしました", timeout=2000)
+
+        assert shown_text(toast) == "コピーしました ×3"
+        assert toast.popup.after_cancel.call_count == 2
+        toast.popup.after.assert_called_with(2000, toast.expire)
+
+    def test_queue_other_messages(self, toast):
+        """異なる通知は表示中の通知の後にまとめて表示するテスト"""
+        toast.show("コピーしました")
+        toast.show("重複のため除外しました")
+        toast.show("重複のため除外しました")
+        toast.show("設定完了", timeout=3000)
+
+        assert shown_text(toast) == "コピーしました"
+
+        toast.expire()
+        assert shown_text(toast) == "重複のため除外しました ×2"
+
+        toast.expire()
+        assert shown_text(toast) == "設定完了"
+        toast.popup.after.assert_called_with(3000, toast.expire)
+
+        toast.expire()
+        assert not toast.visible
+        toast.popup.withdraw.assert_called_once()
+
+    def test_no_extension_while_queued(self, toast):
+        """待っている通知がある間は同じ通知が続いても表示時間を延ばさないテスト"""
+        toast.show("コピーしました")
+        toast.show("設定完了")
+        after_count = toast.popup.after.call_count
+
+        toast.show("コピーしました")
+        toast.show("コピーしました")
+
+        assert shown_text(toast) == "コピーしました ×3"
+        assert toast.popup.after.call_count == after_count
+        toast.popup.after_cancel.assert_not_called()
+
+        toast.expire()
+        assert shown_text(toast) == "設定完了"
+
+    def test_queued_position(self, toast):
+        """待機中の通知をそれぞれの表示位置で表示するテスト"""
+        toast.show("コピーしました", position="+10+10")
+        toast.show("設定完了", position="+200+200")
+        toast.show("重複のため除外しました")
+
+        toast.popup.geometry.assert_called_with("+10+10")
+
+        toast.expire()
+        toast.popup.geometry.assert_called_with("+200+200")
+        geometry_calls = toast.popup.geometry.call_count
+
+        # 位置を指定していない通知はその時点の位置のまま表示する
+        toast.expire()
+        assert toast.popup.geometry.call_count == geometry_calls
+        assert shown_text(toast) == "重複のため除外しました"
+
+    def test_hide_clears_queue(self, toast):
+        """閉じた場合は待機中の通知も破棄するテスト"""
+        toast.show("コピーしました")
+        toast.show("設定完了")
+
+        toast.hide()
+
+        assert not toast.visible
+        assert not toast.pending
+        toast.popup.protocol.assert_called_with("WM_DELETE_WINDOW", toast.hide)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
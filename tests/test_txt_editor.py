@@ -4,6 +4,8 @@ import tempfile
 import os
 from datetime import datetime
 
+from tests.helpers.widgets import set_widget_text
+
 
 class TestTextEditor:
     """TextEditorクラスのテスト"""
@@ -39,6 +41,7 @@ class TestTextEditor:
         mock_toplevel.return_value = mock_window
         mock_text_area = Mock()
         mock_text_area.get.return_value = "初期テキスト"  # 修正：Mock戻り値を設定
+        set_widget_text(mock_text_area, "初期テキスト")
         mock_scrolled_text.return_value = mock_text_area
 
         # テスト実行
@@ -71,6 +74,7 @@ class TestTextEditor:
         mock_tk.return_value = mock_window
         mock_text_area = Mock()
         mock_text_area.get.return_value = ""  # 修正：Mock戻り値を設定
+        set_widget_text(mock_text_area, "")
         mock_scrolled_text.return_value = mock_text_area
 
         # テスト実行
@@ -98,6 +102,7 @@ class TestTextEditor:
 
             mock_text_area = Mock()
             mock_text_area.get.return_value = ""  # 修正：初期値を空文字列に設定
+            set_widget_text(mock_text_area, "")
             mock_scrolled_text.return_value = mock_text_area
             mock_stats_label = Mock()
             mock_label.return_value = mock_stats_label
@@ -115,7 +120,7 @@ class TestTextEditor:
         editor, mock_text_area, mock_stats_label = self.create_mock_editor()
 
         # テキストの内容を設定
-        mock_text_area.get.return_value = "行1\n行2\n行3\n"
+        set_widget_text(mock_text_area, "行1\n行2\n行3\n")
 
         # テスト実行
         editor.update_stats(None)
@@ -128,7 +133,7 @@ class TestTextEditor:
         editor, mock_text_area, mock_stats_label = self.create_mock_editor()
 
         # 空のテキストを設定
-        mock_text_area.get.return_value = "   \n\n  \n"
+        set_widget_text(mock_text_area, "   \n\n  \n")
 
         # テスト実行
         editor.update_stats(None)
@@ -141,13 +146,13 @@ class TestTextEditor:
         editor, mock_text_area, mock_stats_label = self.create_mock_editor()
 
         # 単一行のテキストを設定
-        mock_text_area.get.return_value = "これは1行のテキストです"
+        set_widget_text(mock_text_area, "これは1行のテキストです")
 
         # テスト実行
         editor.update_stats(None)
 
         # 検証
-        mock_stats_label.config.assert_called_with(text="行数: 0  文字数: 12")
+        mock_stats_label.config.assert_called_with(text="行数: 1  文字数: 12")
 
     @patch('pyperclip.paste')
     @patch('tkinter.messagebox.showinfo')
@@ -228,30 +233,38 @@ class TestTextEditor:
         mock_askyesno.assert_called_with("確認", "テキストをクリアしますか？")
         mock_text_area.delete.assert_not_called()
 
-    @patch('tempfile.gettempdir')
-    @patch('os.system')
-    @patch('tkinter.messagebox.showinfo')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('services.txt_editor.datetime')
-    def test_print_text_success(self, mock_datetime, mock_file, mock_showinfo,
-                                mock_system, mock_tempdir):
-        """印刷成功のテスト"""
+    def test_print_text_success(self, tmp_path):
+        """印刷を専用のワーカーのキューに追加するテスト"""
+        from services.automation_runner import HelperResult
+        from services.print_spooler import print_file
+
         editor, mock_text_area, mock_stats_label = self.create_mock_editor()
 
         # モック設定
         mock_text_area.get.return_value = "印刷するテキスト"
-        mock_tempdir.return_value = r"C:\temp"
-        mock_datetime.now.return_value.strftime.return_value = "20240526_143000"
+        mock_dispatcher = Mock()
+        editor.print_spooler.dispatcher = mock_dispatcher
+        editor.print_spooler.command = "notepad /p"
+        editor.print_status_label = Mock()
 
         # テスト実行
-        editor.print_text()
-
-        # 検証
-        mock_file.assert_called_once()
-        mock_system.assert_called_once()
-        system_call = mock_system.call_args[0][0]
-        assert 'notepad /p' in system_call
-        assert 'print_20240526_143000.txt' in system_call
+        with patch('tempfile.tempdir', str(tmp_path)):
+            editor.print_text()
+
+        # 検証 - シェルを通さず引数の一覧で実行する
+        executor, func, command, temp_file, timeout = mock_dispatcher.submit.call_args[0]
+        assert executor is editor.print_spooler.executor
+        assert func is print_file
+        assert command == ["notepad", "/p", temp_file]
+        assert os.path.basename(temp_file).startswith("print_")
+        with open(temp_file, encoding="utf-8") as f:
+            assert f.read() == "印刷するテキスト"
+        editor.print_status_label.config.assert_called_with(text="印刷 #1: 印刷待ち")
+
+        # 完了の通知
+        os.unlink(temp_file)
+        mock_dispatcher.submit.call_args[1]["on_done"](HelperResult("print", 0, 0.5))
+        editor.print_status_label.config.assert_called_with(text="印刷 #1: 印刷しました")
 
     @patch('tkinter.messagebox.showinfo')
     def test_print_text_empty_content(self, mock_showinfo):
@@ -267,16 +280,14 @@ class TestTextEditor:
         # 検証
         mock_showinfo.assert_called_with("情報", "印刷するテキストがありません。")
 
-    @patch('tempfile.gettempdir')
     @patch('tkinter.messagebox.showerror')
-    @patch('builtins.open', side_effect=Exception("ファイルエラー"))
-    def test_print_text_error(self, mock_file, mock_showerror, mock_tempdir):
+    @patch('tempfile.mkstemp', side_effect=OSError("ファイルエラー"))
+    def test_print_text_error(self, mock_mkstemp, mock_showerror):
         """印刷エラーのテスト"""
         editor, mock_text_area, mock_stats_label = self.create_mock_editor()
 
         # テキストを設定
         mock_text_area.get.return_value = "印刷するテキスト"
-        mock_tempdir.return_value = r"C:\temp"
 
         # テスト実行
         editor.print_text()
@@ -379,6 +390,7 @@ class TestTextEditorIntegration:
         mock_toplevel.return_value = mock_window
         mock_text_area = Mock()
         mock_text_area.get.return_value = ""  # 修正：初期値を設定
+        set_widget_text(mock_text_area, "")
         mock_scrolled_text.return_value = mock_text_area
         mock_stats_label = Mock()
         mock_label.return_value = mock_stats_label
@@ -390,8 +402,8 @@ class TestTextEditorIntegration:
         editor.text_area = mock_text_area
         editor.stats_label = mock_stats_label
 
-        # 貼り付け実行後にgetの戻り値を変更
-        mock_text_area.get.return_value = "テスト行1\nテスト行2\n"
+        # 貼り付け実行後に集計結果を変更
+        set_widget_text(mock_text_area, "テスト行1\nテスト行2\n")
 
         editor.paste_text()
         editor.update_stats(None)
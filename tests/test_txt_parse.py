@@ -5,7 +5,12 @@ from services.txt_parse import (
     process_record,
     group_records_by_datetime,
     remove_duplicates,
-    parse_medical_text
+    parse_medical_text,
+    iter_record_blocks,
+    iter_medical_records,
+    parse_medical_file,
+    parse_medical_lines,
+    merge_records
 )
 
 
@@ -279,5 +284,259 @@ S >
         # 入院日数は日付パースで処理されるが、現在の実装では特別な処理はなし
 
 
+class TestStreaming:
+    """日付ごとの逐次解析のテスト"""
+
+    TEXT = """2024/05/26(日)
+内科    担当医    外来    14:30
+S >
+頭痛があります
+2024/05/27(月)
+外科    担当医    外来    09:00
+P >
+経過観察
+"""
+
+    def test_iter_record_blocks(self):
+        """日付ごとにレコードをまとめるテスト"""
+        blocks = list(iter_record_blocks(self.TEXT.splitlines()))
+
+        assert len(blocks) == 2
+        assert blocks[0][0]['date'] == '2024/05/26(日)'
+        assert blocks[1][0]['content'] == '経過観察'
+
+    def test_iter_record_blocks_is_lazy(self):
+        """次の日付行を読んだ時点で前の日付のレコードを返すテスト"""
+        consumed = []
+
+        def lines():
+            for line in self.TEXT.splitlines():
+                consumed.append(line)
+                yield line
+
+        first_block = next(iter_record_blocks(lines()))
+
+        assert first_block[0]['content'] == '頭痛があります'
+        assert consumed[-1] == '2024/05/27(月)'
+
+    def test_iter_medical_records_matches_parse(self):
+        """全体解析と同じ結果になるテスト"""
+        assert list(iter_medical_records(self.TEXT.splitlines())) == parse_medical_text(self.TEXT)
+
+    def test_iter_medical_records_removes_duplicates(self):
+        """日付ブロックをまたいだ重複を除外するテスト"""
+        lines = (self.TEXT + self.TEXT).splitlines()
+
+        assert len(list(iter_medical_records(lines))) == 2
+
+    def test_iter_medical_records_bounded_history(self):
+        """重複判定の履歴が上限を超えると古い記録を忘れるテスト"""
+        lines = (self.TEXT + self.TEXT).splitlines()
+
+        assert len(list(iter_medical_records(lines, max_seen=1))) == 4
+
+
+class TestStreamingAcrossBlocks:
+    """日付ブロックをまたいだ同じ日時の記録のテスト"""
+
+    TEXT = """2024/05/27(月)
+外科    担当医    外来    09:00
+P >
+経過観察
+2024/05/26(日)
+内科    担当医    外来    14:30
+S >
+頭痛があります
+2024/05/27(月)
+外科    担当医    外来    09:00
+O >
+創部良好
+"""
+
+    def test_later_line_supersedes(self):
+        """記載が加わった記録は、まとめ直した記録を改めて返すテスト"""
+        records = list(iter_medical_records(self.TEXT.splitlines()))
+
+        assert [record['timestamp'] for record in records] == [
+            '2024-05-27T09:00:00Z', '2024-05-26T14:30:00Z', '2024-05-27T09:00:00Z']
+        assert records[0] == {'timestamp': '2024-05-27T09:00:00Z', 'department': '外科', 'plan': '経過観察'}
+        # 後の行が全体を変換した結果と一致する
+        assert records[2] == parse_medical_text(self.TEXT)[1]
+
+    def test_overlapping_copy_is_merged(self):
+        """出力済みの記載の再出現は除外するテスト"""
+        text = self.TEXT + "2024/05/27(月)\n外科    担当医    外来    09:00\nP >\n経過観察\n"
+
+        records = list(iter_medical_records(text.splitlines()))
+
+        assert len(records) == 3
+
+
+class TestCallbacks:
+    """解析中の通知のテスト"""
+
+    TEXT = """前置きの行
+2024/05/26(日)
+内科    担当医    外来    14:30
+S >
+頭痛があります
+S >
+頭痛があります
+2024/05/27(月)
+外科    担当医    外来    09:00
+P >
+経過観察
+"""
+
+    def test_on_record(self):
+        """重複を除いた記録を順に通知するテスト"""
+        records = []
+
+        parse_medical_text(self.TEXT, on_record=records.append)
+
+        assert [(record['date'], record['soap_section'], record['content']) for record in records] == [
+            ('2024/05/26(日)', 'S', '頭痛があります'),
+            ('2024/05/27(月)', 'P', '経過観察'),
+        ]
+
+    def test_on_record_streams_by_date(self):
+        """日付ごとに、後続の行を読む前に通知するテスト"""
+        events = []
+
+        def lines():
+            for line in self.TEXT.splitlines():
+                events.append(line)
+                yield line
+
+        parse_medical_lines(lines(), on_record=lambda record: events.append(record['content']))
+
+        assert events.index('頭痛があります', events.index('S >') + 1) < events.index('外科    担当医    外来    09:00')
+
+    def test_on_group(self):
+        """最終結果と同じ順でまとめた記録を通知するテスト"""
+        groups = []
+
+        result = parse_medical_text(self.TEXT, on_group=groups.append)
+
+        assert groups == result
+
+    def test_on_line_skipped(self):
+        """変換されない行を通知するテスト"""
+        skipped = []
+
+        parse_medical_text("内科    担当医    外来    10:00\nS >\n" + self.TEXT, on_line_skipped=skipped.append)
+
+        # 日付より前の行は記録に含まれない
+        assert skipped == ['内科    担当医    外来    10:00', 'S >', '前置きの行']
+
+    def test_without_callbacks(self):
+        """通知なしでも同じ結果になるテスト"""
+        calls = []
+
+        with_callbacks = parse_medical_text(self.TEXT, calls.append, calls.append, calls.append)
+
+        assert with_callbacks == parse_medical_text(self.TEXT)
+        assert calls
+
+    def test_parse_file_callbacks(self, tmp_path):
+        """ファイルからの解析でも通知するテスト"""
+        path = tmp_path / "karte.txt"
+        path.write_text(self.TEXT, encoding="utf-8")
+        groups = []
+
+        parse_medical_file(str(path), on_group=groups.append)
+
+        assert len(groups) == 2
+
+
+class TestMergeRecords:
+    """既存の変換結果への統合のテスト"""
+
+    EXISTING_TEXT = """2024/05/25(土)
+外科    担当医    外来    09:00
+P >
+経過観察
+2024/05/26(日)
+内科    担当医    外来    14:30
+S >
+頭痛があります
+"""
+
+    NEW_TEXT = """2024/05/26(日)
+内科    担当医    外来    14:30
+S >
+頭痛があります
+O >
+血圧 120/80
+2024/05/26(日)
+外科    担当医    外来    14:30
+P >
+再診
+2024/05/27(月)
+内科    担当医    外来    10:00
+S >
+改善
+"""
+
+    def test_matches_full_reparse(self):
+        """全体を変換し直した場合と同じ結果になるテスト"""
+        existing = parse_medical_text(self.EXISTING_TEXT)
+
+        added, updated = merge_records(existing, parse_medical_text(self.NEW_TEXT))
+
+        assert existing == parse_medical_text(self.EXISTING_TEXT + self.NEW_TEXT)
+        assert (added, updated) == (2, 1)
+
+    def test_merge_same_export(self):
+        """同じ内容の再統合で変化しないテスト"""
+        existing = parse_medical_text(self.NEW_TEXT)
+
+        assert merge_records(existing, parse_medical_text(self.NEW_TEXT)) == (0, 0)
+        assert existing == parse_medical_text(self.NEW_TEXT)
+
+    def test_replace_with_extended_section(self):
+        """追記された記載で置き換えるテスト"""
+        existing = [{"timestamp": "2024-05-26T14:30:00Z", "department": "内科", "subject": "頭痛"}]
+
+        merge_records(existing, [{"timestamp": "2024-05-26T14:30:00Z", "department": "内科",
+                                  "subject": "頭痛\n吐き気"}])
+
+        assert existing[0]["subject"] == "頭痛\n吐き気"
+
+    def test_insert_keeps_order(self):
+        """時刻順の位置に追加するテスト"""
+        existing = [{"timestamp": "2024-05-25T09:00:00Z", "department": "外科"},
+                    {"timestamp": "2024-05-27T09:00:00Z", "department": "外科"}]
+        record = {"timestamp": "2024-05-26T09:00:00Z", "department": "外科", "plan": "再診"}
+
+        merge_records(existing, [record])
+
+        assert [r["timestamp"][:10] for r in existing] == ["2024-05-25", "2024-05-26", "2024-05-27"]
+        # 追加した記録を後から更新しても、渡した記録は変わらない
+        merge_records(existing, [{"timestamp": "2024-05-26T09:00:00Z", "department": "外科", "plan": "入院"}])
+        assert record["plan"] == "再診"
+
+
+class TestParseMedicalFile:
+    """ファイルからの解析のテスト"""
+
+    TEXT = "2024/05/26(日)\r\n内科    担当医    外来    14:30\r\nS >\r\n頭痛があります\r\n"
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "cp932", "utf-8-sig"])
+    def test_parse_file(self, tmp_path, encoding):
+        """文字コードを自動判定して解析するテスト"""
+        path = tmp_path / "karte.txt"
+        path.write_bytes(self.TEXT.encode(encoding))
+
+        assert parse_medical_file(str(path)) == parse_medical_text(self.TEXT)
+
+    def test_parse_file_with_encoding(self, tmp_path):
+        """文字コードを指定して解析するテスト"""
+        path = tmp_path / "karte.txt"
+        path.write_bytes(self.TEXT.encode("euc-jp"))
+
+        assert parse_medical_file(str(path), "euc-jp")[0]['subject'] == '頭痛があります'
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,97 @@
+from unittest.mock import Mock
+
+import pytest
+
+from services.text_document import TextDocument
+from services.virtual_text_view import VirtualTextView
+
+
+def make_view(line_count, window_lines=10):
+    document = TextDocument()
+    document.append("\n".join(f"行{i}" for i in range(line_count)))
+    mock_text = Mock()
+    view = VirtualTextView(mock_text, document, window_lines)
+    return view, mock_text
+
+
+class TestVirtualTextView:
+    """仮想化入力ビューのテスト"""
+
+    def test_activate_renders_tail(self):
+        """有効化時に末尾の表示範囲が描画されるテスト"""
+        view, mock_text = make_view(100)
+
+        view.activate()
+
+        assert view.active is True
+        assert view.first_line == 90
+        inserted = mock_text.insert.call_args[0][1]
+        assert inserted.split("\n") == [f"行{i}" for i in range(90, 100)]
+        mock_text.vbar.set.assert_called_with(0.9, 1.0)
+
+    def test_refresh_follows_tail(self):
+        """末尾表示中は追記に追従するテスト"""
+        view, mock_text = make_view(100)
+        view.activate()
+
+        view.document.append("追加行")
+        view.refresh()
+
+        assert view.first_line == 91
+        assert mock_text.insert.call_args[0][1].endswith("追加行")
+
+    def test_refresh_keeps_position_when_scrolled(self):
+        """スクロール中は表示位置を維持するテスト"""
+        view, mock_text = make_view(100)
+        view.activate()
+        view.scroll_to(20)
+
+        view.document.append("追加行")
+        view.refresh()
+
+        assert view.first_line == 20
+
+    def test_on_scroll_moveto(self):
+        """スクロールバーのドラッグ操作のテスト"""
+        view, mock_text = make_view(100)
+        view.activate()
+
+        view.on_scroll("moveto", "0.5")
+
+        assert view.first_line == 50
+
+    def test_on_scroll_pages(self):
+        """ページ単位スクロールのテスト"""
+        view, mock_text = make_view(100)
+        view.activate()
+        view.scroll_to(0)
+
+        view.on_scroll("scroll", "2", "pages")
+
+        assert view.first_line == 20
+
+    def test_mouse_wheel_clamps_at_top(self):
+        """マウスホイールで先頭を越えないテスト"""
+        view, mock_text = make_view(100)
+        view.activate()
+        view.scroll_to(1)
+
+        result = view.on_mouse_wheel(Mock(num=None, delta=120))
+
+        assert result == "break"
+        assert view.first_line == 0
+
+    def test_deactivate_restores_widget_scrolling(self):
+        """無効化でウィジェットのスクロールが復元されるテスト"""
+        view, mock_text = make_view(10)
+        view.activate()
+
+        view.deactivate()
+
+        assert view.active is False
+        mock_text.vbar.config.assert_called_with(command=mock_text.yview)
+        mock_text.config.assert_called_with(yscrollcommand=mock_text.vbar.set, state="normal")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,7 +1,8 @@
 import configparser
 import os
 import sys
-from typing import Any
+import threading
+from typing import Any, Callable, List, Optional
 
 
 def get_config_path():
@@ -15,8 +16,95 @@ def get_config_path():
 
 CONFIG_PATH = get_config_path()
 
+_config_lock = threading.Lock()
+_cached_config: Optional[configparser.ConfigParser] = None
+_cached_mtime: Optional[tuple] = None
+# 読み込みに失敗した時点の状態。同じ状態のままなら読み直さず、エラーも繰り返し出さない
+_failed_mtime: Optional[tuple] = None
+_load_failed = False
+_config_listeners: List[Callable[[configparser.ConfigParser], Any]] = []
+
+
+def _get_config_mtime() -> Optional[tuple]:
+    try:
+        return CONFIG_PATH, os.stat(CONFIG_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _is_failed_state(mtime: Optional[tuple]) -> bool:
+    return _load_failed and mtime == _failed_mtime
+
 
 def load_config() -> configparser.ConfigParser:
+    # 設定ファイルが更新されていなければ前回読み込んだ内容をそのまま返す
+    global _cached_config, _cached_mtime, _failed_mtime, _load_failed
+    with _config_lock:
+        mtime = _get_config_mtime()
+        if _cached_config is None or mtime != _cached_mtime:
+            if _cached_config is not None and _is_failed_state(mtime):
+                return _cached_config
+            try:
+                config = _read_config()
+            except (OSError, configparser.Error):
+                if _cached_config is None:
+                    raise
+                # 削除や書きかけの途中でも、前回読み込めた設定で動き続ける
+                _failed_mtime = mtime
+                _load_failed = True
+                return _cached_config
+            if _load_failed:
+                print(f"設定ファイルを読み込み直しました: {CONFIG_PATH}")
+            _cached_config = config
+            _cached_mtime = mtime
+            _load_failed = False
+        return _cached_config
+
+
+def clear_config_cache():
+    global _cached_config, _cached_mtime, _load_failed
+    with _config_lock:
+        _cached_config = None
+        _cached_mtime = None
+        _load_failed = False
+
+
+def add_config_listener(listener: Callable[[configparser.ConfigParser], Any]):
+    if listener not in _config_listeners:
+        _config_listeners.append(listener)
+
+
+def remove_config_listener(listener: Callable[[configparser.ConfigParser], Any]):
+    if listener in _config_listeners:
+        _config_listeners.remove(listener)
+
+
+def _notify_config_listeners(config: configparser.ConfigParser):
+    for listener in list(_config_listeners):
+        try:
+            listener(config)
+        except Exception as e:
+            print(f"設定の再読み込み処理中にエラーが発生しました: {e}")
+
+
+def check_config_updates() -> bool:
+    # 更新日時が変わっていた場合のみ読み直し、登録済みのリスナーへ通知する
+    with _config_lock:
+        mtime = _get_config_mtime()
+        previous = _cached_config
+        changed = previous is not None and mtime != _cached_mtime and not _is_failed_state(mtime)
+    if not changed:
+        return False
+
+    config = load_config()
+    if config is previous:
+        # 読み込めなかった場合は前回の設定のまま通知しない
+        return False
+    _notify_config_listeners(config)
+    return True
+
+
+def _read_config() -> configparser.ConfigParser:
     config = configparser.ConfigParser()
     try:
         with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
@@ -34,6 +122,7 @@ def load_config() -> configparser.ConfigParser:
 
 
 def save_config(config: configparser.ConfigParser):
+    global _cached_config, _cached_mtime, _load_failed
     try:
         with open(CONFIG_PATH, 'w', encoding='utf-8') as configfile:
             config.write(configfile)
@@ -43,3 +132,9 @@ def save_config(config: configparser.ConfigParser):
     except IOError as e:
         print(f"設定ファイルの保存中にエラーが発生しました: {e}")
         raise
+
+    with _config_lock:
+        _cached_config = config
+        _cached_mtime = _get_config_mtime()
+        _load_failed = False
+    _notify_config_listeners(config)
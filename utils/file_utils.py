@@ -0,0 +1,31 @@
+import os
+import tempfile
+
+# umaskは取得するにも一度書き換える必要があるため、他のスレッドが動き出す前の読み込み時に確認しておく
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def get_file_mode(path):
+    # 既存のファイルは元の権限を引き継ぎ、新しいファイルはumaskに従う（mkstempの0600のままにしない）
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~UMASK
+
+
+def write_file_atomic(path, data):
+    # 書き込み途中のファイルを他のツールに読ませないよう、一時ファイルから置き換える
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".tmp")
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.chmod(temp_path, get_file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise